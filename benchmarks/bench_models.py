@@ -0,0 +1,113 @@
+"""
+Benchmarks of the analysis and synthesis of all the models.
+"""
+
+import numpy as np
+from scipy.signal import get_window
+
+from smst.models import dft, hpr, hps, sine, spr, sps, stft, stochastic
+from .common import DURATIONS, PARAM_SETS, SIGNALS, analyze, disable_caching, model_params, signal
+
+
+class Dft(object):
+    params = [[512, 2048, 8192]]
+    param_names = ['N']
+
+    def setup(self, N):
+        self.x = np.random.RandomState(0).randn(N - 1)
+        self.w = get_window('hamming', N - 1)
+        self.mX, self.pX = dft.from_audio(self.x, self.w, N)
+
+    def time_from_audio(self, N):
+        dft.from_audio(self.x, self.w, N)
+
+    def time_to_audio(self, N):
+        dft.to_audio(self.mX, self.pX, N - 1)
+
+
+class _ModelBenchmark(object):
+    """
+    Base of the benchmarks of the models which are analyzed with the default
+    parameters of `smst.ui.batch`.
+    """
+    model = None
+    params = [SIGNALS, DURATIONS, sorted(PARAM_SETS)]
+    param_names = ['signal', 'duration', 'param_set']
+
+    def setup(self, kind, duration, param_set):
+        disable_caching()
+        self.fs, self.x = signal(kind, duration)
+        self.p = model_params(self.model, param_set)
+        self.outputs = analyze(self.model, self.x, self.fs, self.p)
+
+    def time_from_audio(self, kind, duration, param_set):
+        analyze(self.model, self.x, self.fs, self.p)
+
+    def peakmem_from_audio(self, kind, duration, param_set):
+        analyze(self.model, self.x, self.fs, self.p)
+
+
+class Stft(_ModelBenchmark):
+    model = 'stft'
+
+    def time_to_audio(self, kind, duration, param_set):
+        stft.to_audio(self.outputs['mX'], self.outputs['pX'], self.p['M'], self.p['H'])
+
+
+class Sine(_ModelBenchmark):
+    model = 'sine'
+
+    def time_to_audio(self, kind, duration, param_set):
+        o = self.outputs
+        sine.to_audio(o['tfreq'], o['tmag'], o['tphase'], 512, self.p['H'], self.fs)
+
+    def time_to_audio_phase_propagation(self, kind, duration, param_set):
+        o = self.outputs
+        sine.to_audio(o['tfreq'], o['tmag'], np.array([]), 512, self.p['H'], self.fs)
+
+
+class Harmonic(_ModelBenchmark):
+    model = 'harmonic'
+
+    def time_to_audio(self, kind, duration, param_set):
+        o = self.outputs
+        sine.to_audio(o['hfreq'], o['hmag'], o['hphase'], 512, self.p['H'], self.fs)
+
+
+class Stochastic(_ModelBenchmark):
+    model = 'stochastic'
+
+    def time_to_audio(self, kind, duration, param_set):
+        stochastic.to_audio(self.outputs['stocEnv'], self.p['H'], self.p['N'])
+
+
+class Hps(_ModelBenchmark):
+    model = 'hps'
+
+    def time_to_audio(self, kind, duration, param_set):
+        o = self.outputs
+        hps.to_audio(o['hfreq'], o['hmag'], o['hphase'], o['stocEnv'], self.p['Ns'], self.p['H'], self.fs)
+
+
+class Hpr(_ModelBenchmark):
+    model = 'hpr'
+
+    def time_to_audio(self, kind, duration, param_set):
+        o = self.outputs
+        hpr.to_audio(o['hfreq'], o['hmag'], o['hphase'], o['xr'], 512, self.p['H'], self.fs)
+
+
+class Sps(_ModelBenchmark):
+    model = 'sps'
+
+    def time_to_audio(self, kind, duration, param_set):
+        o = self.outputs
+        sps.to_audio(o['tfreq'], o['tmag'], o['tphase'], o['stocEnv'], 512, self.p['H'], self.fs)
+
+
+class Spr(_ModelBenchmark):
+    model = 'spr'
+
+    def time_to_audio(self, kind, duration, param_set):
+        o = self.outputs
+        spr.to_audio(o['tfreq'], o['tmag'], o['tphase'], o['xr'], 512, self.p['H'], self.fs)
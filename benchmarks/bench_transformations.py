@@ -0,0 +1,70 @@
+"""
+Benchmarks of the transformations of all the models.
+
+The transformation parameters are the same as in the demo modules in
+`smst.ui.transformations`.
+"""
+
+import numpy as np
+from scipy.signal import get_window
+
+from smst.models import harmonic, hps, sine, stft, stochastic
+from .common import DURATIONS, SIGNALS, analyze, disable_caching, model_params, signal
+
+FREQ_SCALING = np.array([0, 2.0, 1, .3])
+FREQ_STRETCHING = np.array([0, 1, 1, 1.5])
+TIME_SCALING = np.array([0, .0, .671, .671, 1.978, 1.978 + 1.0])
+INTERPOLATION = np.array([0, 0, .1, 0, .9, 1, 1, 1])
+
+
+class StftTransformations(object):
+    params = [SIGNALS, DURATIONS]
+    param_names = ['signal', 'duration']
+
+    def setup(self, kind, duration):
+        self.fs, self.x = signal(kind, duration)
+        _, self.x2 = signal('synthetic', duration)
+        self.w = get_window('hamming', 1024)
+        self.filter = np.zeros(513)
+        self.filter[50:150] = -60
+
+    def time_filter(self, kind, duration):
+        stft.filter(self.x, self.fs, self.w, 1024, 512, self.filter)
+
+    def time_morph(self, kind, duration):
+        stft.morph(self.x, self.x2, self.fs, self.w, 1024, self.w, 1024, 512, .5, .2)
+
+
+class TrackTransformations(object):
+    """Transformations of sinusoidal, harmonic and stochastic representations."""
+    params = [SIGNALS, DURATIONS]
+    param_names = ['signal', 'duration']
+
+    def setup(self, kind, duration):
+        disable_caching()
+        fs, x = signal(kind, duration)
+        self.fs = fs
+        self.sine = analyze('sine', x, fs, model_params('sine'))
+        self.hps = analyze('hps', x, fs, model_params('hps'))
+        _, x2 = signal('synthetic', duration)
+        self.hps2 = analyze('hps', x2, fs, model_params('hps'))
+
+    def time_sine_scale_frequencies(self, kind, duration):
+        sine.scale_frequencies(self.sine['tfreq'], FREQ_SCALING)
+
+    def time_sine_scale_time(self, kind, duration):
+        sine.scale_time(self.sine['tfreq'], self.sine['tmag'], TIME_SCALING)
+
+    def time_harmonic_scale_frequencies(self, kind, duration):
+        harmonic.scale_frequencies(self.hps['hfreq'], self.hps['hmag'], FREQ_SCALING, FREQ_STRETCHING, 1, self.fs)
+
+    def time_stochastic_scale_time(self, kind, duration):
+        stochastic.scale_time(self.hps['stocEnv'], TIME_SCALING)
+
+    def time_hps_scale_time(self, kind, duration):
+        hps.scale_time(self.hps['hfreq'], self.hps['hmag'], self.hps['stocEnv'], TIME_SCALING)
+
+    def time_hps_morph(self, kind, duration):
+        a, b = self.hps, self.hps2
+        hps.morph(a['hfreq'], a['hmag'], a['stocEnv'], b['hfreq'], b['hmag'], b['stocEnv'],
+                  INTERPOLATION, INTERPOLATION, INTERPOLATION)
@@ -0,0 +1,73 @@
+"""
+Input signals and parameters shared by the benchmarks.
+
+The signals are either excerpts of the bundled sounds (looped to the requested
+duration) or synthetic signals, so that the benchmarks can be run on any
+length of audio.
+"""
+
+import os
+
+import numpy as np
+
+from smst.models import analysis_cache
+from smst.ui import batch
+from smst.utils import audio
+
+FS = 44100
+
+SOUND_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', 'sounds')
+
+# signal kinds and durations (in seconds) used by most of the benchmarks
+SIGNALS = ['sax', 'synthetic']
+DURATIONS = [1.0, 4.0]
+
+# parameter sets applied on top of the default parameters of each model
+PARAM_SETS = {
+    'default': {},
+    'small-hop': {'H': 64},
+}
+
+
+def sound(name, duration):
+    """Reads a bundled sound, loops or truncates it to the duration."""
+    fs, x = audio.read_wav(os.path.join(SOUND_DIR, name))
+    size = int(duration * fs)
+    return fs, np.resize(x, size).astype(np.float64)
+
+
+def synthetic(duration, fs=FS, f0=220.0, nH=20, noise=0.01, seed=0):
+    """Harmonic signal with vibrato and decaying harmonics plus white noise."""
+    t = np.arange(int(duration * fs)) / float(fs)
+    f0_track = f0 * (1 + 0.01 * np.sin(2 * np.pi * 5 * t))  # vibrato
+    phase = 2 * np.pi * np.cumsum(f0_track) / fs
+    x = sum(np.sin(h * phase) / h for h in range(1, nH + 1) if h * f0 < fs / 2)
+    x += noise * np.random.RandomState(seed).randn(t.size)
+    return fs, 0.5 * x / np.max(np.abs(x))
+
+
+def signal(kind, duration):
+    """
+    Creates an input signal of a kind (sax - the bundled saxophone phrase,
+    synthetic - a harmonic signal with noise) and duration in seconds.
+    """
+    if kind == 'sax':
+        return sound('sax-phrase-short.wav', duration)
+    elif kind == 'synthetic':
+        return synthetic(duration)
+    raise ValueError("Unknown signal kind: %s" % kind)
+
+
+def model_params(model, param_set='default'):
+    """Default analysis parameters of a model (from `smst.ui.batch`) updated by a parameter set."""
+    return batch.model_params(model, PARAM_SETS[param_set])
+
+
+def analyze(model, x, fs, params):
+    """Analyzes the signal with a model, returns the outputs as a dict."""
+    return batch.models[model][0](x, fs, params)
+
+
+def disable_caching():
+    """Makes sure that the analyses are not served by an active analysis cache."""
+    analysis_cache.set_cache(None)
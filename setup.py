@@ -154,6 +154,7 @@ setup(
             'smst-ui-transformations=smst.ui.transformations.transformations_GUI:main',
             'smst-model=smst.ui:main_model',
             'smst-transformation=smst.ui:main_transformation',
+            'smst-batch=smst.ui.batch:main',
         ],
     },
 
@@ -0,0 +1,235 @@
+"""
+Mini-batch k-means clustering of large descriptor sets.
+
+`MiniBatchKMeans` updates the cluster centers from small random batches of
+points (Sculley: Web-scale k-means clustering, 2010), so it never needs the
+whole data in memory. The points can be a memory-mapped array (eg. a column
+of a `corpus.table` or a .npy file of frame descriptors) sampled by `fit()`
+or an iterable of chunks read from disk passed to `fit_chunks()`.
+
+Example:
+
+>>> frames = np.load('frame-descriptors.npy', mmap_mode='r')
+>>> kmeans = clustering.MiniBatchKMeans(64, batch_size=4096, seed=0).fit(frames)
+>>> kmeans.inertia_history[-1]  # mean squared distance of the last batch
+>>> labels = kmeans.predict(frames)
+"""
+
+import numpy as np
+
+
+class MiniBatchKMeans(object):
+    """
+    K-means clustering with mini-batch updates of the centers.
+
+    :param n_clusters: number of clusters
+    :param batch_size: number of points in a mini-batch
+    :param max_iter: maximum number of mini-batches in fit()
+    :param init: 'k-means++', 'random' or an array of initial centers of shape (n_clusters, features)
+    :param init_size: number of points sampled for the initialization (default: 3 * batch_size)
+    :param tol: stop fit() when the centers move less than tol (in mean squared distance
+      relative to the variance of the data) in a mini-batch, 0 never stops early
+    :param warm_start: continue from the current centers and counts in fit() and fit_chunks()
+      instead of initializing them again
+    :param seed: seed of the random generator
+    """
+
+    def __init__(self, n_clusters, batch_size=1024, max_iter=100, init='k-means++', init_size=None, tol=0.0,
+                 warm_start=False, seed=None):
+        if n_clusters <= 0:
+            raise ValueError("Number of clusters smaller or equal to 0")
+        if batch_size <= 0:
+            raise ValueError("Batch size smaller or equal to 0")
+        if not isinstance(init, np.ndarray) and init not in ('k-means++', 'random'):
+            raise ValueError("Unknown initialization: %s" % init)
+        self.n_clusters = n_clusters
+        self.batch_size = batch_size
+        self.max_iter = max_iter
+        self.init = init
+        self.init_size = init_size or 3 * batch_size
+        self.tol = tol
+        self.warm_start = warm_start
+        self.random = np.random.RandomState(seed)
+        self.centers = None  # cluster centers of shape (n_clusters, features)
+        self.counts = None  # number of points assigned to each center so far
+        self.inertia_history = []  # mean squared distance of each mini-batch to the centers
+        self.n_iter = 0  # number of mini-batch updates so far
+
+    def fit(self, X):
+        """
+        Clusters points by random mini-batches.
+
+        :param X: points of shape (points, features), may be memory-mapped
+        :returns: self
+        """
+        n_points = len(X)
+        if not (self.warm_start and self.centers is not None):
+            self._initialize(X[self._sample(n_points, self.init_size)])
+        scale = max(_mean_variance(X[self._sample(n_points, self.init_size)]), np.finfo(float).tiny)
+        for _ in range(self.max_iter):
+            shift = self.partial_fit(X[self._sample(n_points, self.batch_size)])
+            if shift < self.tol * scale:
+                break
+        return self
+
+    def fit_chunks(self, chunks):
+        """
+        Clusters points streamed in chunks (eg. read from disk), in mini-batches of each chunk.
+
+        The centers are initialized from the first chunk (unless warm starting).
+        Iterate the chunks several times (eg. by itertools.chain) for more epochs.
+
+        :param chunks: iterable of arrays of shape (points, features)
+        :returns: self
+        """
+        initialize = not (self.warm_start and self.centers is not None)
+        for chunk in chunks:
+            if initialize:
+                self._initialize(chunk[self._sample(len(chunk), self.init_size)])
+                initialize = False
+            order = self.random.permutation(len(chunk))
+            for start in range(0, len(chunk), self.batch_size):
+                self.partial_fit(chunk[np.sort(order[start:start + self.batch_size])])
+        return self
+
+    def partial_fit(self, batch):
+        """
+        Updates the centers by one mini-batch.
+
+        Each center moves towards the mean of its points in the batch with a learning
+        rate decreasing with the number of points assigned to it so far.
+
+        :param batch: points of shape (points, features)
+        :returns: mean squared shift of the centers
+        """
+        batch = np.asarray(batch, dtype=np.float64)
+        if self.centers is None:
+            self._initialize(batch)
+        labels, distances = assign(batch, self.centers)
+        self.inertia_history.append(distances.mean())
+        self.n_iter += 1
+
+        batch_counts = np.bincount(labels, minlength=self.n_clusters)
+        sums = np.array([np.bincount(labels, batch[:, j], self.n_clusters) for j in range(batch.shape[1])]).T
+        updated = batch_counts > 0
+        old_centers = self.centers[updated]
+        self.counts[updated] += batch_counts[updated]
+        # c += (sum of the points - count * c) / total count, ie. the running mean of the assigned points
+        self.centers[updated] += (sums[updated] - batch_counts[updated, np.newaxis] * old_centers) \
+            / self.counts[updated, np.newaxis]
+        return np.sum((self.centers[updated] - old_centers) ** 2) / self.n_clusters
+
+    def predict(self, X, block_size=65536):
+        """
+        Assigns points to the nearest centers.
+
+        :param X: points of shape (points, features), may be memory-mapped
+        :param block_size: number of points processed at once
+        :returns: labels of the points
+        """
+        self._check_fitted()
+        return np.concatenate([assign(X[start:start + block_size], self.centers)[0]
+                               for start in range(0, len(X), block_size)] or [np.array([], dtype=int)])
+
+    def inertia(self, X, block_size=65536):
+        """Sum of squared distances of points to their nearest centers."""
+        self._check_fitted()
+        return sum(assign(X[start:start + block_size], self.centers)[1].sum()
+                   for start in range(0, len(X), block_size))
+
+    def _initialize(self, sample):
+        sample = np.asarray(sample, dtype=np.float64)
+        if isinstance(self.init, np.ndarray):
+            if self.init.shape[0] != self.n_clusters:
+                raise ValueError("Number of initial centers differs from the number of clusters")
+            self.centers = np.array(self.init, dtype=np.float64)
+        elif len(sample) < self.n_clusters:
+            raise ValueError("Less points (%d) than clusters (%d)" % (len(sample), self.n_clusters))
+        elif self.init == 'k-means++':
+            self.centers = kmeans_plusplus(sample, self.n_clusters, self.random)
+        else:
+            self.centers = sample[self.random.choice(len(sample), self.n_clusters, replace=False)].copy()
+        self.counts = np.zeros(self.n_clusters)
+        self.inertia_history = []
+        self.n_iter = 0
+
+    def _sample(self, n_points, size):
+        """
+        Sorted random indexes (sorted for a sequential access of memory-mapped data).
+
+        They are drawn with replacement and deduplicated, so the sampling costs O(size)
+        instead of O(n_points) and a sample can have slightly less than size points.
+        """
+        if size >= n_points:
+            return np.arange(n_points)
+        return np.unique(self.random.randint(n_points, size=size))
+
+    def _check_fitted(self):
+        if self.centers is None:
+            raise ValueError("The clustering has not been fitted yet")
+
+
+def assign(X, centers):
+    """
+    Finds the nearest center of each point.
+
+    :param X: points of shape (points, features)
+    :param centers: centers of shape (clusters, features)
+    :returns: labels, squared distances of the points to their nearest centers
+    """
+    X = np.asarray(X, dtype=np.float64)
+    # |x - c|^2 = |x|^2 - 2 x.c + |c|^2 for all pairs at once
+    squared = np.sum(centers ** 2, axis=1) - 2 * np.dot(X, centers.T)
+    labels = np.argmin(squared, axis=1)
+    distances = np.maximum(squared[np.arange(len(X)), labels] + np.sum(X ** 2, axis=1), 0)
+    return labels, distances
+
+
+def kmeans_plusplus(X, n_clusters, random=np.random, n_trials=None):
+    """
+    Chooses initial centers by the k-means++ seeding (each next center is a point
+    chosen with probability proportional to its squared distance to the chosen centers).
+
+    Of n_trials such candidates the one reducing the sum of the squared distances
+    the most is taken (the greedy variant), which avoids most bad seedings.
+
+    :param X: points of shape (points, features)
+    :param n_clusters: number of centers
+    :param random: random generator (np.random.RandomState)
+    :param n_trials: number of candidates for each center (default: 2 + log(n_clusters))
+    :returns: centers of shape (n_clusters, features)
+    """
+    X = np.asarray(X, dtype=np.float64)
+    n_trials = n_trials or 2 + int(np.log(n_clusters))
+    centers = np.empty((n_clusters, X.shape[1]))
+    centers[0] = X[random.randint(len(X))]
+    distances = np.sum((X - centers[0]) ** 2, axis=1)
+    for i in range(1, n_clusters):
+        total = distances.sum()
+        if total > 0:
+            candidates = np.searchsorted(np.cumsum(distances), random.rand(n_trials) * total).clip(0, len(X) - 1)
+        else:  # all the points coincide with the centers
+            candidates = random.randint(len(X), size=n_trials)
+        # squared distances to the nearest center with each candidate added
+        candidate_distances = np.minimum(distances, np.sum((X - X[candidates, np.newaxis]) ** 2, axis=2))
+        best = np.argmin(candidate_distances.sum(axis=1))
+        centers[i] = X[candidates[best]]
+        distances = candidate_distances[best]
+    return centers
+
+
+def iterate_chunks(X, chunk_size=65536):
+    """
+    Iterates over consecutive chunks of an array (eg. memory-mapped), reading each chunk into memory.
+
+    :param X: array of shape (points, features)
+    :param chunk_size: number of points in a chunk
+    :return: generator of arrays of shape (points in chunk, features)
+    """
+    for start in range(0, len(X), chunk_size):
+        yield np.array(X[start:start + chunk_size], dtype=np.float64)
+
+
+def _mean_variance(X):
+    X = np.asarray(X, dtype=np.float64)
+    return np.mean(np.var(X, axis=0)) if len(X) > 0 else 0.0
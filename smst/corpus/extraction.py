@@ -0,0 +1,157 @@
+"""
+Extraction of descriptors of a corpus of sounds into a columnar table.
+
+Each sound is analyzed by the STFT and the frame-wise descriptors
+(spectral centroid, flux, high frequency content, loudness, MFCC and pitch)
+are computed from its spectrogram at once and summarized by their mean and
+standard deviation. The sounds are processed in a pool of worker processes
+and the summaries are written into a `corpus.table` as they come.
+
+Example:
+
+>>> extraction.extract(['sounds/'], 'descriptors/', workers=4)
+>>> table = corpus_table.load('descriptors/')
+"""
+
+from __future__ import print_function
+from collections import OrderedDict
+import multiprocessing
+import sys
+
+import numpy as np
+
+from . import table as corpus_table
+from ..models import stft
+from ..utils import audio, descriptors
+from ..utils.files import find_sound_files
+from ..utils.window import get_window
+
+DEFAULT_PARAMS = dict(window='blackman', M=2048, N=2048, H=1024, n_bands=40, n_coeffs=13,
+                      t=-80, minf0=50, maxf0=1000, f0et=5, silence_db=-80)
+
+
+def extraction_params(params=None):
+    """
+    Returns the default extraction parameters updated with the given ones.
+
+    :param params: dict of parameters overriding DEFAULT_PARAMS
+    :returns: dict of all parameters
+    """
+    params = params or {}
+    unknown = set(params) - set(DEFAULT_PARAMS)
+    if unknown:
+        raise ValueError("Unknown extraction parameters: %s" % ', '.join(sorted(unknown)))
+    all_params = dict(DEFAULT_PARAMS)
+    all_params.update(params)
+    return all_params
+
+
+def frame_descriptors(x, fs, params=None):
+    """
+    Computes the frame-wise descriptors of a sound.
+
+    :param x: input sound (mono)
+    :param fs: sampling rate
+    :param params: extraction parameters (see DEFAULT_PARAMS)
+    :returns: OrderedDict of descriptor name -> array with one value (or vector) per frame
+    """
+    p = extraction_params(params)
+    N = p['N']
+    w = get_window(p['window'], p['M'])
+    mX, pX = stft.from_audio(x, w, N, p['H'])
+    return OrderedDict([
+        ('centroid', descriptors.spectral_centroid(mX, fs, N)),
+        ('flux', descriptors.spectral_flux(mX)),
+        ('hfc', descriptors.high_frequency_content(mX)),
+        ('loudness', descriptors.loudness(mX)),
+        ('mfcc', descriptors.mfcc(mX, fs, N, p['n_bands'], p['n_coeffs'])),
+        ('pitch', descriptors.pitch(mX, pX, fs, N, p['t'], p['minf0'], p['maxf0'], p['f0et'])),
+    ])
+
+
+def sound_descriptors(x, fs, params=None):
+    """
+    Summarizes the frame-wise descriptors of a sound.
+
+    The frames quieter than silence_db (in energy) are left out. The pitch is
+    summarized over the pitched frames only and pitch.ratio is the ratio of the
+    pitched frames.
+
+    :param x: input sound (mono)
+    :param fs: sampling rate
+    :param params: extraction parameters (see DEFAULT_PARAMS)
+    :returns: OrderedDict of column name (eg. centroid.mean, mfcc.std) -> value
+    """
+    p = extraction_params(params)
+    frames = frame_descriptors(x, fs, p)
+    energy_db = 10 / 0.67 * np.log10(np.maximum(frames['loudness'], np.finfo(float).tiny))  # loudness = energy ** 0.67
+    active = energy_db > p['silence_db']
+    if not np.any(active):  # describe a silent sound by all its frames
+        active[:] = True
+    summary = OrderedDict()
+    for name, values in frames.items():
+        values = values[active]
+        if name == 'pitch':
+            summary['pitch.ratio'] = np.mean(values > 0)
+            values = values[values > 0]
+        summary[name + '.mean'] = np.mean(values, axis=0) if len(values) > 0 else 0.0
+        summary[name + '.std'] = np.std(values, axis=0) if len(values) > 0 else 0.0
+    return summary
+
+
+def extract_file(task):
+    """
+    Extracts the descriptors of a single file, to be run in a worker process.
+
+    :param task: tuple (row, input file, extraction parameters)
+    :returns: tuple (row, input file, descriptors or None, error message or None)
+    """
+    row, input_file, params = task
+    try:
+        fs, x = audio.read_wav(input_file)
+        if x.ndim > 1:  # describe the mix of the channels
+            x = np.mean(x, axis=0)
+        return row, input_file, sound_descriptors(x, fs, params), None
+    except Exception as e:
+        return row, input_file, None, '%s: %s' % (type(e).__name__, e)
+
+
+def extract(inputs, table_path, params=None, workers=None, dtype=np.float32, verbose=False):
+    """
+    Extracts descriptors of sound files into a table.
+
+    :param inputs: paths to sound files or directories (searched recursively)
+    :param table_path: directory of the output table (see corpus.table)
+    :param params: extraction parameters overriding DEFAULT_PARAMS
+    :param workers: number of worker processes (default: number of CPUs, 1 = no processes)
+    :param dtype: dtype of the stored descriptors
+    :param verbose: print a line for each extracted file
+    :returns: list of (input file, error message) of the files which failed, their rows contain NaN
+    """
+    params = extraction_params(params)
+    files = find_sound_files(inputs)
+    writer = corpus_table.TableWriter(table_path, [name for _, name in files], dtype, dict(params=params))
+    tasks = [(row, input_file, params) for row, (input_file, _) in enumerate(files)]
+
+    workers = workers or multiprocessing.cpu_count()
+    if workers == 1:
+        result_iter = (extract_file(task) for task in tasks)
+    else:
+        pool = multiprocessing.Pool(workers)
+        result_iter = pool.imap_unordered(extract_file, tasks, chunksize=16)
+    failed = []
+    try:
+        for row, input_file, sound_desc, error in result_iter:
+            if error is not None:
+                print('FAILED %s - %s' % (input_file, error), file=sys.stderr)
+                failed.append((input_file, error))
+                continue
+            writer.write(row, sound_desc)
+            if verbose:
+                print(input_file)
+    finally:
+        if workers != 1:
+            pool.close()
+            pool.join()
+    writer.close()
+    return failed
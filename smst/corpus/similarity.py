@@ -0,0 +1,160 @@
+"""
+Nearest-neighbour similarity search over descriptor vectors.
+
+`SimilarityIndex` finds the sounds closest (by the Euclidean distance of
+their descriptors) to query vectors. It has two backends:
+
+- brute - vectorized distances of blocks of queries to all the points
+  (by matrix products), best for many dimensions
+- kdtree - `scipy.spatial.cKDTree`, sublinear queries for few dimensions
+
+The descriptors are standardized by default (to zero mean and unit variance
+of each feature), so that the features of different units and ranges
+(eg. centroid in Hz and MFCC) contribute comparably to the distance.
+
+Example:
+
+>>> index = similarity.SimilarityIndex.from_table(table, ['mfcc.mean', 'centroid.mean'])
+>>> index.similar('sax-phrase.wav', k=5)
+[('sax-phrase-short.wav', 0.41), ...]
+>>> distances, rows = index.query(features[:100], k=10)  # a batch of queries
+"""
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+BACKENDS = ('auto', 'brute', 'kdtree')
+
+# the kd-tree is used by the auto backend up to this number of dimensions
+KDTREE_MAX_DIMENSIONS = 16
+
+
+class SimilarityIndex(object):
+    """
+    Index of descriptor vectors for nearest-neighbour queries.
+
+    :param features: matrix of shape (points, features), the rows containing NaN
+      (eg. of failed extractions) are left out of the index
+    :param names: names of the points (default: row numbers)
+    :param backend: 'brute', 'kdtree' or 'auto' (kdtree for at most KDTREE_MAX_DIMENSIONS features)
+    :param normalize: standardize each feature to zero mean and unit variance
+    :param block_size: number of queries whose distances are computed at once by the brute backend
+    :param leafsize: leaf size of the kd-tree
+    """
+
+    def __init__(self, features, names=None, backend='auto', normalize=True, block_size=256, leafsize=16):
+        if backend not in BACKENDS:
+            raise ValueError("Unknown backend: %s (available: %s)" % (backend, ', '.join(BACKENDS)))
+        features = np.asarray(features, dtype=np.float64)
+        if features.ndim != 2:
+            raise ValueError("Features must be a matrix of shape (points, features)")
+        self.names = list(names) if names is not None else list(range(len(features)))
+        if len(self.names) != len(features):
+            raise ValueError("Number of names differs from the number of points")
+
+        self.rows = np.flatnonzero(~np.any(np.isnan(features), axis=1))  # rows of the indexed points
+        points = features[self.rows]
+        if normalize and len(points) > 0:
+            self.mean = points.mean(axis=0)
+            std = points.std(axis=0)
+            self.scale = np.where(std > 0, 1 / np.where(std > 0, std, 1), 1.0)
+        else:
+            self.mean = np.zeros(features.shape[1])
+            self.scale = np.ones(features.shape[1])
+        self.points = self.transform(points)
+
+        if backend == 'auto':
+            backend = 'kdtree' if features.shape[1] <= KDTREE_MAX_DIMENSIONS else 'brute'
+        self.backend = backend
+        self.block_size = block_size
+        self.tree = cKDTree(self.points, leafsize=leafsize) if backend == 'kdtree' else None
+        self.squared_norms = np.sum(self.points ** 2, axis=1) if backend == 'brute' else None
+
+    @classmethod
+    def from_table(cls, table, columns=None, **kwargs):
+        """
+        Builds an index over columns of a corpus.table.DescriptorTable.
+
+        :param table: descriptor table
+        :param columns: names of the columns (default: all columns)
+        :param kwargs: other parameters of SimilarityIndex
+        :returns: SimilarityIndex with the sound names of the table
+        """
+        features, _ = table.features(columns)
+        return cls(features, table.names, **kwargs)
+
+    def transform(self, features):
+        """Standardizes feature vectors as the indexed points."""
+        return (np.asarray(features, dtype=np.float64) - self.mean) * self.scale
+
+    def query(self, queries, k=10):
+        """
+        Finds the nearest indexed points to query vectors.
+
+        :param queries: a feature vector or a matrix of shape (queries, features)
+        :param k: number of neighbours
+        :returns: distances, rows - arrays of shape (queries, k) ordered by distance, the rows
+          are indexes into the features the index was built from (1-D arrays for a single vector);
+          if there are less than k points the missing neighbours have infinite distance and row -1
+        """
+        queries = np.asarray(queries, dtype=np.float64)
+        single = queries.ndim == 1
+        queries = self.transform(np.atleast_2d(queries))
+        if queries.shape[1] != self.points.shape[1]:
+            raise ValueError("Queries have %d features instead of %d" % (queries.shape[1], self.points.shape[1]))
+        if k <= 0:
+            raise ValueError("Number of neighbours (k) smaller or equal to 0")
+        distances, rows = self._query(queries, k)
+        if single:
+            return distances[0], rows[0]
+        return distances, rows
+
+    def similar(self, name, k=10):
+        """
+        Finds the points most similar to an indexed point (leaving the point itself out).
+
+        :param name: name of the point
+        :param k: number of neighbours
+        :returns: list of (name, distance) ordered by distance
+        """
+        row = self.names.index(name)
+        position = np.searchsorted(self.rows, row)
+        if position == len(self.rows) or self.rows[position] != row:
+            raise ValueError("Point %s is not indexed (its features contain NaN)" % name)
+        distances, rows = self._query(self.points[position:position + 1], k + 1)
+        # the point itself is among its nearest neighbours
+        neighbours = [(self.names[r], d) for d, r in zip(distances[0], rows[0]) if r != row and r >= 0]
+        return neighbours[:k]
+
+    def _query(self, queries, k):
+        kk = min(k, len(self.points))
+        if kk == 0:
+            distances, positions = np.empty((len(queries), 0)), np.empty((len(queries), 0), dtype=int)
+        elif self.backend == 'kdtree':
+            distances, positions = self.tree.query(queries, kk)
+            distances, positions = distances.reshape(len(queries), kk), positions.reshape(len(queries), kk)
+        else:
+            distances, positions = self._brute_query(queries, kk)
+
+        rows = self.rows[positions]
+        if kk < k:  # pad the missing neighbours
+            distances = np.hstack([distances, np.inf * np.ones((len(queries), k - kk))])
+            rows = np.hstack([rows, -np.ones((len(queries), k - kk), dtype=rows.dtype)])
+        return distances, rows
+
+    def _brute_query(self, queries, k):
+        distances = np.empty((len(queries), k))
+        positions = np.empty((len(queries), k), dtype=int)
+        for start in range(0, len(queries), self.block_size):
+            block = queries[start:start + self.block_size]
+            # |q - p|^2 = |q|^2 - 2 q.p + |p|^2 for all pairs at once
+            squared = np.sum(block ** 2, axis=1)[:, np.newaxis] - 2 * np.dot(block, self.points.T) \
+                + self.squared_norms
+            nearest = np.argpartition(squared, k - 1, axis=1)[:, :k] if k < len(self.points) \
+                else np.tile(np.arange(len(self.points)), (len(block), 1))
+            block_rows = np.arange(len(block))[:, np.newaxis]
+            order = np.argsort(squared[block_rows, nearest], axis=1, kind='mergesort')  # sort the k nearest
+            nearest = nearest[block_rows, order]
+            positions[start:start + len(block)] = nearest
+            distances[start:start + len(block)] = np.sqrt(np.maximum(squared[block_rows, nearest], 0))
+        return distances, positions
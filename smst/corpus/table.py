@@ -0,0 +1,180 @@
+"""
+Columnar storage of descriptors of a corpus of sounds.
+
+A table is a directory with `table.json` (the sound names and the layout of
+the columns) and one .npy file per column. The row i of each column belongs
+to the sound i. The columns can be memory-mapped, so loading the
+descriptors of a big corpus is nearly free and a single column can be read
+without touching the others.
+
+Example:
+
+>>> table = corpus_table.load('descriptors/')
+>>> table['centroid.mean'][:10]
+>>> features, labels = table.features(['centroid.mean', 'mfcc.mean'])
+"""
+
+from collections import OrderedDict
+import json
+import os
+
+import numpy as np
+
+from .. import __version__
+from ..utils.files import ensure_directory
+
+FORMAT_VERSION = 1
+
+TABLE_FILE = 'table.json'
+
+
+class DescriptorTable(object):
+    """
+    Descriptors of sounds stored by columns.
+
+    :param names: names of the sounds (rows)
+    :param columns: OrderedDict of column name -> array of shape (sounds,) or (sounds, size)
+    :param metadata: dict of extraction parameters etc.
+    """
+
+    def __init__(self, names, columns, metadata=None):
+        self.names = list(names)
+        self.columns = columns
+        self.metadata = metadata or {}
+        for name, column in columns.items():
+            if len(column) != len(self.names):
+                raise ValueError("Column %s has %d rows instead of %d" % (name, len(column), len(self.names)))
+
+    def __getitem__(self, column):
+        return self.columns[column]
+
+    def __len__(self):
+        return len(self.names)
+
+    def index(self, name):
+        """Row of a sound by its name."""
+        return self.names.index(name)
+
+    def features(self, columns=None, dtype=np.float64):
+        """
+        Stacks columns into a feature matrix, one row per sound.
+
+        :param columns: names of the columns (default: all columns)
+        :param dtype: dtype of the matrix
+        :returns: features, labels - matrix of shape (sounds, features) and the label of each feature
+          (the column name, with the index for vector columns, eg. mfcc.mean.3)
+        """
+        columns = list(self.columns) if columns is None else columns
+        blocks = []
+        labels = []
+        for name in columns:
+            column = np.asarray(self.columns[name])
+            if column.ndim == 1:
+                blocks.append(column[:, np.newaxis])
+                labels.append(name)
+            else:
+                blocks.append(column.reshape(len(column), -1))
+                labels.extend('%s.%d' % (name, i) for i in range(blocks[-1].shape[1]))
+        if not blocks:
+            return np.zeros((len(self), 0), dtype=dtype), labels
+        return np.hstack(blocks).astype(dtype), labels
+
+    def __repr__(self):
+        return 'DescriptorTable(sounds=%d, columns=%s)' % (len(self), list(self.columns))
+
+
+class TableWriter(object):
+    """
+    Writes the rows of a table of a known number of sounds one by one.
+
+    The column files are allocated on the first written row (by its shapes)
+    and filled through memory maps, so the whole table never needs to be in memory.
+    The rows which are not written contain NaN.
+
+    :param path: table directory (created if necessary)
+    :param names: names of the sounds (rows)
+    :param dtype: dtype of the stored values
+    :param metadata: dict of extraction parameters (must be JSON-serializable)
+    """
+
+    def __init__(self, path, names, dtype=np.float32, metadata=None):
+        ensure_directory(path)
+        self.path = path
+        self.names = list(names)
+        self.dtype = np.dtype(dtype)
+        self.metadata = metadata or {}
+        self.columns = OrderedDict()
+
+    def write(self, row, descriptors):
+        """
+        Writes the descriptors of one sound.
+
+        :param row: index of the sound
+        :param descriptors: dict of column name -> value (scalar or vector)
+        """
+        if not self.columns:
+            for name in sorted(descriptors):
+                shape = (len(self.names),) + np.shape(descriptors[name])
+                column = np.lib.format.open_memmap(self._column_path(name), mode='w+', dtype=self.dtype,
+                                                   shape=shape)
+                column[:] = np.nan
+                self.columns[name] = column
+        if set(descriptors) != set(self.columns):
+            raise ValueError("Descriptors differ from the columns of the table")
+        for name, value in descriptors.items():
+            self.columns[name][row] = value
+
+    def close(self):
+        """Flushes the columns and writes the table metadata."""
+        for column in self.columns.values():
+            column.flush()
+        layout = OrderedDict((name, OrderedDict([('file', os.path.basename(self._column_path(name))),
+                                                 ('shape', list(column.shape)),
+                                                 ('dtype', str(column.dtype))]))
+                             for name, column in self.columns.items())
+        table_meta = OrderedDict([
+            ('format_version', FORMAT_VERSION),
+            ('library_version', __version__),
+            ('names', self.names),
+            ('columns', layout),
+            ('metadata', self.metadata),
+        ])
+        with open(os.path.join(self.path, TABLE_FILE), 'w') as f:
+            json.dump(table_meta, f, indent=2)
+        self.columns = OrderedDict()
+
+    def _column_path(self, name):
+        return os.path.join(self.path, '%s.npy' % name)
+
+
+def save(path, names, columns, dtype=np.float32, metadata=None):
+    """
+    Saves a whole table.
+
+    :param path: table directory (created if necessary)
+    :param names: names of the sounds (rows)
+    :param columns: dict of column name -> array with one row per sound
+    :param dtype: dtype of the stored values
+    :param metadata: dict of extraction parameters (must be JSON-serializable)
+    """
+    writer = TableWriter(path, names, dtype, metadata)
+    for row in range(len(writer.names)):
+        writer.write(row, dict((name, column[row]) for name, column in columns.items()))
+    writer.close()
+
+
+def load(path, mmap=True):
+    """
+    Loads a table.
+
+    :param path: table directory
+    :param mmap: memory-map the columns (read-only) instead of reading them
+    :returns: DescriptorTable
+    """
+    with open(os.path.join(path, TABLE_FILE), 'r') as f:
+        table_meta = json.load(f, object_pairs_hook=OrderedDict)
+    if table_meta['format_version'] > FORMAT_VERSION:
+        raise ValueError("Unsupported table format version: %s" % table_meta['format_version'])
+    columns = OrderedDict((name, np.load(os.path.join(path, layout['file']), mmap_mode='r' if mmap else None))
+                          for name, layout in table_meta['columns'].items())
+    return DescriptorTable(table_meta['names'], columns, table_meta['metadata'])
@@ -0,0 +1,211 @@
+"""
+Content-addressed on-disk cache of model analysis results.
+
+The analysis functions of the models (eg. `sine.from_audio()`,
+`harmonic.from_audio()`, `hps.from_audio()`) are decorated with `cached()`.
+When a cache is active, their outputs are stored on disk under a key made
+from a hash of the input audio, the model name, all the analysis parameters,
+the library version and the selected native/Python implementation and FFT backend. Calling the analysis again with the same inputs
+loads the stored outputs instead of recomputing them. The total size of the
+cache is bounded, the least recently used entries are evicted. The analyses
+called by a cached analysis (eg. the harmonic analysis of hps) are not
+stored separately.
+
+Example:
+
+>>> with analysis_cache.use_cache('/tmp/smst-cache', max_bytes=2 ** 30):
+...     hfreq, hmag, hphase, stocEnv = hps.from_audio(x, fs, w, N, H, ...)
+
+The cache can also be activated for the whole process by setting the
+SMST_ANALYSIS_CACHE environment variable to a directory.
+"""
+
+from collections import OrderedDict
+from contextlib import contextmanager
+import functools
+import hashlib
+import inspect
+import os
+import shutil
+import tempfile
+import threading
+
+import numpy as np
+
+from .. import __version__
+from . import storage
+from ..utils import fft, native
+
+
+class AnalysisCache(object):
+    """
+    Directory of stored analysis results with size-bounded LRU eviction.
+
+    :param directory: cache directory (created if necessary)
+    :param max_bytes: maximum total size of the stored results
+    """
+
+    def __init__(self, directory, max_bytes=1 << 30):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    def key(self, model, params):
+        """
+        Computes the key of an analysis.
+
+        :param model: model name
+        :param params: dict of all arguments of the analysis function (including the audio)
+        :returns: hexadecimal digest
+        """
+        digest = hashlib.sha1()
+        # the implementations give slightly different results
+        digest.update(('smst %s %s %s %s' % (__version__, model, native.get_implementation(),
+                                             fft.get_backend().name)).encode('utf-8'))
+        for name in sorted(params):
+            digest.update(name.encode('utf-8'))
+            _update_digest(digest, params[name])
+        return digest.hexdigest()
+
+    def get(self, key):
+        """Returns the stored outputs for the key, or None if they are not in the cache."""
+        path = self._path(key)
+        try:
+            outputs, metadata = storage.load(path)
+        except (IOError, OSError, ValueError):
+            self.misses += 1
+            return None
+        _touch(path)
+        self.hits += 1
+        values = tuple(outputs.values())
+        return values if metadata['params']['tuple'] else values[0]
+
+    def put(self, key, model, outputs):
+        """Stores the outputs (an array or a tuple of arrays) of an analysis."""
+        is_tuple = isinstance(outputs, tuple)
+        arrays = OrderedDict(('out%d' % i, value) for i, value in enumerate(outputs if is_tuple else (outputs,)))
+        # write into a temporary directory and rename it so that readers never see partial results
+        tmp_path = tempfile.mkdtemp(dir=self.directory, prefix='.tmp-')
+        try:
+            storage.save(tmp_path, model, arrays, params=dict(tuple=is_tuple), dtype=None)
+            os.rename(tmp_path, self._path(key))
+        except OSError:
+            shutil.rmtree(tmp_path, ignore_errors=True)  # stored concurrently by another process
+        self.evict()
+
+    def evict(self):
+        """Removes the least recently used entries until the cache fits into max_bytes."""
+        entries = []
+        for key in os.listdir(self.directory):
+            path = os.path.join(self.directory, key)
+            if key.startswith('.') or not os.path.isdir(path):
+                continue
+            try:
+                entries.append((os.path.getmtime(path), storage.stored_size(path), path))
+            except OSError:
+                continue  # evicted concurrently
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total_size -= size
+
+    def clear(self):
+        """Removes all stored results."""
+        for key in os.listdir(self.directory):
+            shutil.rmtree(os.path.join(self.directory, key), ignore_errors=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key)
+
+
+_cache = None
+_running = threading.local()  # whether a cached analysis is being computed in the thread
+
+
+def set_cache(cache):
+    """
+    Activates an analysis cache for all the models.
+
+    :param cache: AnalysisCache instance, cache directory or None to deactivate caching
+    """
+    global _cache
+    if cache is not None and not isinstance(cache, AnalysisCache):
+        cache = AnalysisCache(cache)
+    _cache = cache
+    return cache
+
+
+def get_cache():
+    """Returns the active analysis cache or None."""
+    return _cache
+
+
+@contextmanager
+def use_cache(directory, max_bytes=1 << 30):
+    """Context manager activating an analysis cache temporarily."""
+    global _cache
+    previous = _cache
+    try:
+        yield set_cache(AnalysisCache(directory, max_bytes))
+    finally:
+        _cache = previous
+
+
+def cached(model):
+    """
+    Decorator of model analysis functions making them use the active cache.
+
+    :param model: model name used in the cache key
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            cache = _cache
+            if cache is None or getattr(_running, 'active', False):  # only the outermost analysis is stored
+                return func(*args, **kwargs)
+            key = cache.key(model, inspect.getcallargs(func, *args, **kwargs))
+            outputs = cache.get(key)
+            if outputs is None:
+                _running.active = True
+                try:
+                    outputs = func(*args, **kwargs)
+                finally:
+                    _running.active = False
+                cache.put(key, model, outputs)
+            return outputs
+
+        return wrapper
+
+    return decorator
+
+# -- support functions --
+
+
+def _update_digest(digest, value):
+    if isinstance(value, np.ndarray):
+        value = np.ascontiguousarray(value)
+        digest.update(('array %s %s' % (value.dtype.str, value.shape)).encode('utf-8'))
+        digest.update(value.data)
+    elif isinstance(value, (list, tuple)):
+        digest.update(('seq %d' % len(value)).encode('utf-8'))
+        for item in value:
+            _update_digest(digest, item)
+    else:
+        digest.update(('value %r' % (value,)).encode('utf-8'))
+
+
+def _touch(path):
+    try:
+        os.utime(path, None)
+    except OSError:
+        pass
+
+
+if os.environ.get('SMST_ANALYSIS_CACHE'):
+    set_cache(os.environ['SMST_ANALYSIS_CACHE'])
@@ -7,9 +7,10 @@ For example usage check the `smst.ui.models.dftModel_function` module.
 import math
 
 import numpy as np
-from scipy.fftpack import fft, ifft
 
-from ..utils.math import is_power_of_two, from_db_magnitudes, to_db_magnitudes
+from ..utils.fft import fft, ifft
+from ..utils.math import is_fast_fft_size, from_db_magnitudes, to_db_magnitudes
+from ..utils.window import normalize_window
 
 
 def from_audio(samples, window, fft_size):
@@ -18,17 +19,20 @@ def from_audio(samples, window, fft_size):
     Discrete Fourier Transform (DFT) into magnitude and phase spectrum
     of positive frequencies.
 
-    :param samples: samples of the input signal
+    The samples can also be a batch of frames (eg. of shape (frames, window size)
+    or (channels, frames, window size)), which are all transformed at once.
+
+    :param samples: samples of the input signal (along the last axis)
     :param window: samples of the analysis window
-    :param fft_size: size of the spectrum (power of two)
+    :param fft_size: size of the spectrum (even with prime factors 2, 3, 5, see `utils.math.next_fast_size()`)
 
     :returns:
         - magnitude_db_spectrum: magnitude spectrum (in decibels) of positive frequencies
         - phase_spectrum: unwrapped phase spectrum of positive frequencies
     """
 
-    if not (is_power_of_two(fft_size)):
-        raise ValueError("FFT size must be a power of 2")
+    if not (is_fast_fft_size(fft_size)):
+        raise ValueError("FFT size must be an even product of powers of 2, 3 and 5")
 
     if window.size > fft_size:
         raise ValueError("Window size must not be greater than FFT size")
@@ -51,15 +55,16 @@ def to_audio(magnitude_db_spectrum, phase_spectrum, window_size):
     Discrete Fourier Transform (IDFT).
 
     :param magnitude_db_spectrum: positive magnitude spectrum in decibels
+      (along the last axis, possibly a batch of spectra)
     :param phase_spectrum: positive phase spectrum
     :param window_size: window size (also size of the output signal)
 
     :returns: samples: reconstructed samples of the windowed signal
     """
 
-    fft_size = (magnitude_db_spectrum.size - 1) * 2  # FFT size
-    if not is_power_of_two(fft_size):
-        raise ValueError("Full spectrum size must be power of two")
+    fft_size = (magnitude_db_spectrum.shape[-1] - 1) * 2  # FFT size
+    if not is_fast_fft_size(fft_size):
+        raise ValueError("Full spectrum size must be an even product of powers of 2, 3 and 5")
 
     spectrum = spectrum_from_phase_and_magnitude(magnitude_db_spectrum, phase_spectrum, fft_size)
     fft_buffer = np.real(ifft(spectrum))  # compute inverse FFT
@@ -71,10 +76,10 @@ def to_audio(magnitude_db_spectrum, phase_spectrum, window_size):
 
 def select_positive_spectrum(spectrum):
     """Selects positive frequencies from a full spectrum."""
-    fft_size = len(spectrum)
+    fft_size = spectrum.shape[-1]
     # size of positive spectrum, it includes sample 0
     size = (fft_size / 2) + 1
-    return spectrum[:size]
+    return spectrum[..., :size]
 
 
 def select_phase_spectrum(spectrum, phase_eps=1e-14):
@@ -98,37 +103,38 @@ def select_magnitude_db_spectrum(spectrum):
 
 def spectrum_from_phase_and_magnitude(pos_magnitude_db_spectrum, pos_phase_spectrum, fft_size):
     # size of positive spectrum, it includes sample 0
-    half_fft_size = pos_magnitude_db_spectrum.size
-    spectrum = np.zeros(fft_size, dtype=complex)
+    half_fft_size = pos_magnitude_db_spectrum.shape[-1]
+    spectrum = np.zeros(pos_magnitude_db_spectrum.shape[:-1] + (fft_size,), dtype=complex)
     pos_magnitude_spectrum = from_db_magnitudes(pos_magnitude_db_spectrum)
     # generate positive frequencies
-    spectrum[:half_fft_size] = pos_magnitude_spectrum * np.exp(1j * pos_phase_spectrum)
+    spectrum[..., :half_fft_size] = pos_magnitude_spectrum * np.exp(1j * pos_phase_spectrum)
     # generate negative frequencies
-    spectrum[half_fft_size:] = pos_magnitude_spectrum[-2:0:-1] * np.exp(-1j * pos_phase_spectrum[-2:0:-1])
+    spectrum[..., half_fft_size:] = (pos_magnitude_spectrum[..., -2:0:-1] *
+                                     np.exp(-1j * pos_phase_spectrum[..., -2:0:-1]))
     return spectrum
 
 
 def apply_zero_phase_window(samples, window, fft_size):
     windowed_samples = apply_normalized_window(samples, window)
     half_win_round, half_win_floor = half_window_sizes(window.size)
-    fft_buffer = np.zeros(fft_size)  # initialize buffer for FFT
+    fft_buffer = np.zeros(windowed_samples.shape[:-1] + (fft_size,))  # initialize buffer for FFT
     # zero-phase window in fftbuffer
-    fft_buffer[:half_win_round] = windowed_samples[half_win_floor:]
-    fft_buffer[-half_win_floor:] = windowed_samples[:half_win_floor]
+    fft_buffer[..., :half_win_round] = windowed_samples[..., half_win_floor:]
+    fft_buffer[..., -half_win_floor:] = windowed_samples[..., :half_win_floor]
     return fft_buffer
 
 
 def apply_normalized_window(samples, window):
-    normalized_window = window / sum(window)
+    normalized_window = normalize_window(window)
     windowed_samples = samples * normalized_window
     return windowed_samples
 
 
 def unapply_zero_phase_window(fft_buffer, window_size):
-    samples = np.zeros(window_size)
+    samples = np.zeros(fft_buffer.shape[:-1] + (window_size,))
     half_win_round, half_win_floor = half_window_sizes(window_size)
-    samples[:half_win_floor] = fft_buffer[-half_win_floor:]
-    samples[half_win_floor:] = fft_buffer[:half_win_round]
+    samples[..., :half_win_floor] = fft_buffer[..., -half_win_floor:]
+    samples[..., half_win_floor:] = fft_buffer[..., :half_win_round]
     return samples
 
 
@@ -5,14 +5,24 @@ Functions that implement analysis and synthesis of sounds using the Harmonic Mod
 import numpy as np
 from scipy.interpolate import interp1d
 
-from . import dft, sine, stft
-from ..utils import peaks
+from . import dft, sine, stft, tracks
+from .analysis_cache import cached
+from ..utils import peaks, profiling
+from ..utils.window import normalize_window
 
 
-def from_audio(x, fs, w, N, H, t, nH, minf0, maxf0, f0et, harmDevSlope=0.01, minSineDur=.02):
+@profiling.profiled('harmonic.from_audio')
+@tracks.sparse_option
+@cached('harmonic')
+def from_audio(x, fs, w, N, H, t, nH, minf0, maxf0, f0et, harmDevSlope=0.01, minSineDur=.02,
+               fastF0Search=False):
     """
     Analyzes a sound using the sinusoidal harmonic model.
 
+    A multichannel sound of shape (channels, samples) is analyzed channel by
+    channel, with the spectra computed in batches of frames and the f0 and
+    harmonics found as the peaks come. The harmonics then have shape (channels, frames, nH).
+
     :param x: input sound
     :param fs: sampling rate
     :param w: analysis window
@@ -24,40 +34,94 @@ def from_audio(x, fs, w, N, H, t, nH, minf0, maxf0, f0et, harmDevSlope=0.01, min
     :param f0et: error threshold in the f0 detection (ex: 5)
     :param harmDevSlope: slope of harmonic deviation
     :param minSineDur: minimum length of harmonics
+    :param fastF0Search: use the pruned f0 search (peaks.find_fundamental_pruned()), much faster
+      for steady sounds, the f0 can differ slightly from the full search
+    :param sparse: (keyword only) return the harmonics as tracks.SparseTracks
     :returns: xhfreq, xhmag, xhphase: harmonic frequencies, magnitudes and phases
     """
 
     if minSineDur < 0:  # raise exception if minSineDur is smaller than 0
         raise ValueError("Minimum duration of sine tracks smaller than 0")
 
-    hM1, hM2 = dft.half_window_sizes(w.size)
-    x_padded = stft.pad_signal(x, hM2)
-    w = w / sum(w)  # normalize analysis window
-    hfreq_prev = []  # initialize harmonic frequencies of previous frame
-    f0_prev = 0  # initialize f0 stable
-    xhfreq, xhmag, xhphase = [], [], []
-    for x_frame in stft.iterate_analysis_frames(x_padded, H, hM1, hM2):
-        # find peaks
-        ipfreq, ipmag, ipphase = find_peaks(N, fs, t, w, x_frame)
+    x_channels = np.atleast_2d(x)  # a mono sound is analyzed as a single channel
+    # find the f0 and harmonics in each channel, the peaks are streamed from the spectra
+    xhfreq, xhmag, xhphase = [np.array(harmonics_c) for harmonics_c in zip(*[
+        track_harmonics(sine.iterate_sound_peaks(x_c, fs, w, N, H, t, 'harmonic'), fs, H, nH, minf0, maxf0, f0et,
+                        harmDevSlope, minSineDur, fastF0Search)
+        for x_c in x_channels])]
+
+    if np.ndim(x) == 1:
+        return xhfreq[0], xhmag[0], xhphase[0]
+    return xhfreq, xhmag, xhphase
+
+
+
+def from_spectrogram(mX, pX, fs, N, H, t, nH, minf0, maxf0, f0et, harmDevSlope=0.01, minSineDur=.02,
+                     fastF0Search=False, activeFrames=None):
+    """
+    Analyzes a precomputed spectrogram (of a mono sound) using the sinusoidal harmonic model.
+
+    It gives the same harmonics as from_audio() with a spectrogram from stft.from_audio(),
+    so the spectrogram can be shared by analyses with different f0 detection and harmonic parameters.
+
+    :param mX: magnitude spectrogram
+    :param pX: phase spectrogram
+    :param fs: sampling rate
+    :param N: FFT size of the spectrogram
+    :param H: hop size of the spectrogram
+    :param activeFrames: boolean mask of the frames to analyze (eg. from onsets.active_frames()),
+      the other frames are skipped as if they had no harmonics
+    :returns: xhfreq, xhmag, xhphase: harmonic frequencies, magnitudes and phases
+
+    The other parameters are the same as of from_audio().
+    """
+    # a frame without peaks has no f0 and no harmonics, so the f0 of the next frame is not stable
+    frame_peaks = sine.iterate_spectrogram_peaks(mX, pX, fs, N, t, activeFrames)
+    return track_harmonics(frame_peaks, fs, H, nH, minf0, maxf0, f0et, harmDevSlope, minSineDur, fastF0Search)
+
 
+def track_harmonics(frame_peaks, fs, H, nH, minf0, maxf0, f0et, harmDevSlope=0.01, minSineDur=.02,
+                    fastF0Search=False):
+    """
+    Finds the f0 and harmonics over the spectral peaks of the frames of a mono sound.
+
+    It is the tracking shared by from_audio(), from_spectrogram() and the analyses
+    computing the peaks otherwise (eg. in parallel.harmonic_from_audio()).
+
+    :param frame_peaks: iterable of (ipfreq, ipmag, ipphase) - peak frequencies, magnitudes and phases of each frame
+    :param fs: sampling rate
+    :param H: hop size
+    :returns: xhfreq, xhmag, xhphase: harmonic frequencies, magnitudes and phases
+
+    The other parameters are the same as of from_audio().
+    """
+
+    if minSineDur < 0:  # raise exception if minSineDur is smaller than 0
+        raise ValueError("Minimum duration of sine tracks smaller than 0")
+
+    find_fundamental = peaks.find_fundamental_pruned if fastF0Search else peaks.find_fundamental_twm
+    hfreq_prev = []  # harmonic frequencies of previous frame
+    f0_prev = 0  # f0 stable
+    xh = ([], [], [])  # xhfreq, xhmag, xhphase
+    for ipfreq, ipmag, ipphase in frame_peaks:
         # find fundamental frequency (f0)
-        f0_this = peaks.find_fundamental_twm(ipfreq, ipmag, f0et, minf0, maxf0, f0_prev)
-        f0_prev = f0_this if is_f0_stable(f0_this, f0_prev) else 0
+        with profiling.stage('harmonic.f0', 1):
+            f0_this = find_fundamental(ipfreq, ipmag, f0et, minf0, maxf0, f0_prev)
+            f0_prev = f0_this if is_f0_stable(f0_this, f0_prev) else 0
 
         # find harmonics
-        hfreq, hmag, hphase = find_harmonics(ipfreq, ipmag, ipphase, f0_this, nH, hfreq_prev, fs, harmDevSlope)
-        hfreq_prev = hfreq
+        with profiling.stage('harmonic.harmonics', 1):
+            hfreq, hmag, hphase = find_harmonics(ipfreq, ipmag, ipphase, f0_this, nH, hfreq_prev, fs, harmDevSlope)
+            hfreq_prev = hfreq
 
         # store the harmonics
-        xhfreq.append(hfreq)
-        xhmag.append(hmag)
-        xhphase.append(hphase)
-
-    xhfreq, xhmag, xhphase = [np.vstack(xh) for xh in (xhfreq, xhmag, xhphase)]
+        for h_comp, harmonics in zip((hfreq, hmag, hphase), xh):
+            harmonics.append(h_comp)
 
+    xhfreq, xhmag, xhphase = [np.vstack(harmonics) for harmonics in xh]
     # delete tracks shorter than minSineDur
-    xhfreq = sine.clean_sinusoid_tracks(xhfreq, round(fs * minSineDur / H))
-
+    with profiling.stage('harmonic.cleaning', xhfreq.shape[0]):
+        sine.clean_sinusoid_tracks(xhfreq, round(fs * minSineDur / H))
     return xhfreq, xhmag, xhphase
 
 
@@ -69,14 +133,20 @@ def scale_frequencies(hfreq, hmag, freqScaling, freqStretching, timbrePreservati
     """
     Scales the frequencies of the harmonics of a sound.
 
-    :param hfreq: frequencies of input harmonics
+    :param hfreq: frequencies of input harmonics or tracks.SparseTracks (hmag is ignored then)
     :param hmag: magnitudes of input harmonics
     :param freqScaling: scaling factors, in time-value pairs (value of 1 no scaling)
     :param freqStretching: stretching factors, in time-value pairs (value of 1 no stretching)
     :param timbrePreservation: 0  no timbre preservation, 1 timbre preservation
     :param fs: sampling rate of input sound
     :returns: yhfreq, yhmag: frequencies and magnitudes of output harmonics
+      (tracks.SparseTracks without phases for sparse input)
     """
+    if isinstance(hfreq, tracks.SparseTracks):
+        hfreq, hmag, _ = hfreq.to_dense(empty_mag=-100)  # -100 dB as the missing harmonics of find_harmonics()
+        return tracks.SparseTracks.from_dense(*scale_frequencies(
+            hfreq, hmag, freqScaling, freqStretching, timbrePreservation, fs))
+
     if freqScaling.size % 2 != 0:  # raise exception if array not even length
         raise ValueError("Frequency scaling array does not have an even size")
 
@@ -141,7 +211,7 @@ def find_fundamental_freq(x, fs, w, N, H, t, minf0, maxf0, f0et):
     hM1, hM2 = dft.half_window_sizes(w.size)
     x = np.append(np.zeros(hM2), x)  # add zeros at beginning to center first window at sample 0
     x = np.append(x, np.zeros(hM1))  # add zeros at the end to analyze last sample
-    w = w / sum(w)  # normalize analysis window
+    w = normalize_window(w)  # normalize analysis window
     fundamental_freqs = []  # initialize f0 output
     f0_prev = 0  # initialize f0 stable
     for x_frame in stft.iterate_analysis_frames(x, H, hM1, hM2):
@@ -176,30 +246,37 @@ def find_harmonics(pfreq, pmag, pphase, f0, nH, hfreqp, fs, harmDevSlope=0.01):
     hmag = np.zeros(nH) - 100  # initialize harmonic magnitudes
     hphase = np.zeros(nH)  # initialize harmonic phases
     hf = f0 * np.arange(1, nH + 1)  # initialize harmonic frequencies
-    hi = 0  # initialize harmonic index
-    if hfreqp == []:  # if no incoming harmonic tracks initialize to harmonic series
+    if len(hfreqp) == 0:  # if no incoming harmonic tracks initialize to harmonic series
         hfreqp = hf
-    while (f0 > 0) and (hi < nH) and (hf[hi] < fs / 2):  # find harmonic peaks
-        pei = np.argmin(abs(pfreq - hf[hi]))  # closest peak
-        dev1 = abs(pfreq[pei] - hf[hi])  # deviation from perfect harmonic
-        dev2 = (abs(pfreq[pei] - hfreqp[hi]) if hfreqp[hi] > 0 else fs)  # deviation from previous frame
-        threshold = f0 / 3 + harmDevSlope * pfreq[pei]
-        if (dev1 < threshold) or (dev2 < threshold):  # accept peak if deviation is small
-            hfreq[hi] = pfreq[pei]  # harmonic frequencies
-            hmag[hi] = pmag[pei]  # harmonic magnitudes
-            hphase[hi] = pphase[pei]  # harmonic phases
-        hi += 1  # increase harmonic index
+    hfreqp = np.asarray(hfreqp)
+    hi = np.flatnonzero(hf < fs / 2)  # harmonics below the Nyquist frequency
+    if hi.size == 0 or pfreq.size == 0:
+        return hfreq, hmag, hphase
+    # closest peak of each harmonic (the peak frequencies are sorted, ties go to the lower peak)
+    right = np.searchsorted(pfreq, hf[hi])
+    left = np.searchsorted(pfreq, pfreq[(right - 1).clip(0)])  # first of equal peak frequencies
+    right = right.clip(0, pfreq.size - 1)
+    pei = np.where(abs(pfreq[left] - hf[hi]) <= abs(pfreq[right] - hf[hi]), left, right)
+    dev1 = abs(pfreq[pei] - hf[hi])  # deviation from perfect harmonic
+    dev2 = np.where(hfreqp[hi] > 0, abs(pfreq[pei] - hfreqp[hi]), fs)  # deviation from previous frame
+    threshold = f0 / 3 + harmDevSlope * pfreq[pei]
+    accepted = (dev1 < threshold) | (dev2 < threshold)  # accept peak if deviation is small
+    hi, pei = hi[accepted], pei[accepted]
+    hfreq[hi] = pfreq[pei]  # harmonic frequencies
+    hmag[hi] = pmag[pei]  # harmonic magnitudes
+    hphase[hi] = pphase[pei]  # harmonic phases
     return hfreq, hmag, hphase
 
 
 def find_peaks(N, fs, t, w, x_frame):
     # compute dft
     mX, pX = dft.from_audio(x_frame, w, N)
-    # detect peak locations
-    ploc = peaks.find_peaks(mX, t)
-    iploc, ipmag, ipphase = peaks.interpolate_peaks(mX, pX, ploc)  # refine peak values
-    ipfreq = fs * iploc / N  # convert locations to Hz
-    return ipfreq, ipmag, ipphase
+    return find_spectrum_peaks(N, fs, t, mX, pX)
+
+
+def find_spectrum_peaks(N, fs, t, mX, pX):
+    # detect peak locations refined by interpolation, in Hz
+    return sine.spectrum_peaks(mX, pX, fs, N, t)
 
 
 def is_f0_stable(f0, f0_prev):
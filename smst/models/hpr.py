@@ -2,15 +2,20 @@
 Functions that implement analysis and synthesis of sounds using the Harmonic plus Residual Model.
 """
 
+import numpy as np
+
 from . import harmonic, sine
-from ..utils import residual
+from .analysis_cache import cached
+from ..utils import profiling, residual
 
 
-def from_audio(x, fs, w, N, H, t, minSineDur, nH, minf0, maxf0, f0et, harmDevSlope):
+@profiling.profiled('hpr.from_audio')
+@cached('hpr')
+def from_audio(x, fs, w, N, H, t, minSineDur, nH, minf0, maxf0, f0et, harmDevSlope, fastF0Search=False):
     """
     Analyzes a sound using the harmonic plus residual model.
 
-    :param x: input sound
+    :param x: input sound (mono)
     :param fs: sampling rate
     :param w: analysis window
     :param N: FFT size
@@ -21,14 +26,18 @@ def from_audio(x, fs, w, N, H, t, minSineDur, nH, minf0, maxf0, f0et, harmDevSlo
     :param maxf0: maximum fundamental frequency in sound
     :param f0et: maximum error accepted in f0 detection algorithm
     :param harmDevSlope: allowed deviation of harmonic tracks, higher harmonics have higher allowed deviation
+    :param fastF0Search: use the faster pruned f0 search (see harmonic.from_audio())
     :returns:
       - hfreq, hmag, hphase: harmonic frequencies, magnitude and phases
       - xr: residual signal
     """
 
+    if np.ndim(x) != 1:  # the residual is computed for a single channel
+        raise ValueError("Only a mono sound can be analyzed by the hpr model")
+
     # perform harmonic analysis
     hfreq, hmag, hphase = harmonic.from_audio(
-        x, fs, w, N, H, t, nH, minf0, maxf0, f0et, harmDevSlope, minSineDur)
+        x, fs, w, N, H, t, nH, minf0, maxf0, f0et, harmDevSlope, minSineDur, fastF0Search)
 
     # subtract sinusoids from original sound
     Ns = 512
@@ -37,6 +46,7 @@ def from_audio(x, fs, w, N, H, t, minSineDur, nH, minf0, maxf0, f0et, harmDevSlo
     return hfreq, hmag, hphase, xr
 
 
+@profiling.profiled('hpr.to_audio')
 def to_audio(hfreq, hmag, hphase, xr, N, H, fs):
     """
     Synthesizes a sound using the sinusoidal plus residual model.
@@ -10,14 +10,18 @@ import numpy as np
 from scipy.interpolate import interp1d
 
 from . import harmonic, sine, stochastic
-from ..utils import residual
+from .analysis_cache import cached
+from ..utils import profiling, residual
 
 
-def from_audio(x, fs, w, N, H, t, nH, minf0, maxf0, f0et, harmDevSlope, minSineDur, Ns, stocf):
+@profiling.profiled('hps.from_audio')
+@cached('hps')
+def from_audio(x, fs, w, N, H, t, nH, minf0, maxf0, f0et, harmDevSlope, minSineDur, Ns, stocf,
+               fastF0Search=False):
     """
     Analyzes a sound using the harmonic plus stochastic model.
 
-    :param x: input sound
+    :param x: input sound (mono)
     :param fs: sampling rate
     :param w: analysis window
     :param N: FFT size
@@ -28,14 +32,18 @@ def from_audio(x, fs, w, N, H, t, nH, minf0, maxf0, f0et, harmDevSlope, minSineD
     :param f0et: error threshold in the f0 detection (ex: 5),
     :param harmDevSlope: slope of harmonic deviation
     :param minSineDur: minimum length of harmonics
+    :param fastF0Search: use the faster pruned f0 search (see harmonic.from_audio())
     :returns:
       - hfreq, hmag, hphase: harmonic frequencies, magnitude and phases
       - stocEnv: stochastic residual
     """
 
+    if np.ndim(x) != 1:  # the residual is computed for a single channel
+        raise ValueError("Only a mono sound can be analyzed by the hps model")
+
     # perform harmonic analysis
     hfreq, hmag, hphase = harmonic.from_audio(
-        x, fs, w, N, H, t, nH, minf0, maxf0, f0et, harmDevSlope, minSineDur)
+        x, fs, w, N, H, t, nH, minf0, maxf0, f0et, harmDevSlope, minSineDur, fastF0Search)
     # subtract sinusoids from original sound
     xr = residual.subtract_sinusoids(x, Ns, H, hfreq, hmag, hphase, fs)
     # perform stochastic analysis of residual
@@ -43,6 +51,7 @@ def from_audio(x, fs, w, N, H, t, nH, minf0, maxf0, f0et, harmDevSlope, minSineD
     return hfreq, hmag, hphase, stocEnv
 
 
+@profiling.profiled('hps.to_audio')
 def to_audio(hfreq, hmag, hphase, stocEnv, N, H, fs):
     """
     Synthesizes a sound using the harmonic plus stochastic model.
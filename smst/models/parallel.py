@@ -0,0 +1,146 @@
+"""
+Parallel analysis of a single long sound with the sinusoidal and harmonic models.
+
+The sound is split into segments of frames at hop-aligned boundaries. The
+segments overlap by the analysis window minus one hop, so each segment
+contains exactly the samples of its frames. The spectra and spectral peaks
+of the segments are computed in parallel worker processes. The tracking
+(which depends on the previous frame) then runs sequentially over the peaks
+of all segments, so the track/harmonic continuity across segment boundaries
+is kept, and short tracks are cleaned over the whole sound. The result is
+the same as of `sine.from_audio()` and `harmonic.from_audio()`.
+
+Example:
+
+>>> tfreq, tmag, tphase = parallel.sine_from_audio(x, fs, w, N, H, t, workers=4)
+"""
+
+import multiprocessing
+
+import numpy as np
+
+from . import dft, harmonic, sine, stft
+from ..utils.window import normalize_window
+
+
+def sine_from_audio(x, fs, w, N, H, t, maxnSines=100, minSineDur=.01, freqDevOffset=20, freqDevSlope=0.01,
+                    preselectPeaks=False, workers=None, segment_frames=1024):
+    """
+    Analyzes a sound using the sinusoidal model with the spectral peaks computed in parallel.
+
+    The parameters and outputs are the same as of `sine.from_audio()`.
+
+    :param workers: number of worker processes (default: number of CPUs, 1 = no processes)
+    :param segment_frames: number of frames in a segment analyzed by one worker task
+    :returns: xtfreq, xtmag, xtphase: frequencies, magnitudes and phases of sinusoidal tracks
+    """
+
+    frame_peaks = iterate_frame_peaks(x, fs, w, N, H, t, workers, segment_frames)
+    return sine.track_peaks(frame_peaks, fs, H, maxnSines, minSineDur, freqDevOffset, freqDevSlope, preselectPeaks)
+
+
+def harmonic_from_audio(x, fs, w, N, H, t, nH, minf0, maxf0, f0et, harmDevSlope=0.01, minSineDur=.02,
+                        fastF0Search=False, workers=None, segment_frames=1024):
+    """
+    Analyzes a sound using the harmonic model with the spectral peaks computed in parallel.
+
+    The parameters and outputs are the same as of `harmonic.from_audio()`.
+
+    :param workers: number of worker processes (default: number of CPUs, 1 = no processes)
+    :param segment_frames: number of frames in a segment analyzed by one worker task
+    :returns: xhfreq, xhmag, xhphase: harmonic frequencies, magnitudes and phases
+    """
+
+    frame_peaks = iterate_frame_peaks(x, fs, w, N, H, t, workers, segment_frames)
+    return harmonic.track_harmonics(frame_peaks, fs, H, nH, minf0, maxf0, f0et, harmDevSlope, minSineDur,
+                                    fastF0Search)
+
+
+def iterate_frame_peaks(x, fs, w, N, H, t, workers=None, segment_frames=1024):
+    """
+    Iterates over the spectral peaks of all analysis frames of a sound in order.
+
+    The peaks of the segments are computed in a pool of worker processes.
+
+    :param x: input sound (mono)
+    :param fs: sampling rate
+    :param w: analysis window
+    :param N: FFT size
+    :param H: hop size
+    :param t: threshold in negative dB
+    :param workers: number of worker processes (default: number of CPUs, 1 = no processes)
+    :param segment_frames: number of frames in a segment
+    :return: generator of (ipfreq, ipmag, ipphase) - peak frequencies, magnitudes and phases of each frame
+    """
+    if np.ndim(x) != 1:
+        raise ValueError("Only a mono sound can be analyzed in segments")
+    if H <= 0:
+        raise ValueError("Hop size (H) smaller or equal to 0")
+    if segment_frames <= 0:
+        raise ValueError("Segment size (segment_frames) smaller or equal to 0")
+
+    hM1, hM2 = dft.half_window_sizes(w.size)
+    x = stft.pad_signal(x, hM2)
+    tasks = [(segment, w, N, H, t, fs) for segment in split_segments(x, H, hM1, hM2, segment_frames)]
+
+    workers = workers or multiprocessing.cpu_count()
+    if workers == 1:
+        for task in tasks:
+            for frame_peaks in segment_peaks(task):
+                yield frame_peaks
+        return
+
+    pool = multiprocessing.Pool(workers)
+    try:
+        for segment_result in pool.imap(segment_peaks, tasks):
+            for frame_peaks in segment_result:
+                yield frame_peaks
+    except BaseException:  # incl. GeneratorExit when the consumer stops early
+        pool.terminate()  # do not wait for the queued segments
+        raise
+    else:
+        pool.close()
+    finally:
+        pool.join()
+
+
+def split_segments(x, H, hM1, hM2, segment_frames):
+    """
+    Splits a padded signal into overlapping segments of whole analysis frames.
+
+    The segment k contains the frames k * segment_frames until (k + 1) * segment_frames
+    of stft.frame_matrix(). Consecutive segments overlap by (hM1 + hM2 - H) samples.
+
+    :param x: input signal (padded by stft.pad_signal())
+    :param H: hop size
+    :param hM1: half analysis window size by rounding
+    :param hM2: half analysis window size by floor
+    :param segment_frames: number of frames in a segment
+    :returns: list of segments (views of the signal)
+    """
+    n_frames = stft.frame_count(x.size, H, hM1)
+    segments = []
+    for start in range(0, n_frames, segment_frames):
+        stop = min(start + segment_frames, n_frames)
+        # the extra hop keeps the frame count of the segment the same as in the whole signal
+        segments.append(x[start * H:stop * H + hM1 + hM2])
+    return segments
+
+
+def segment_peaks(task):
+    """
+    Computes the spectral peaks of the frames of one segment, to be run in a worker process.
+
+    :param task: tuple (segment, analysis window, N, H, t, fs)
+    :returns: list of (ipfreq, ipmag, ipphase) for each frame of the segment
+    """
+    x, w, N, H, t, fs = task
+    w = normalize_window(w)  # normalize analysis window
+    hM1, hM2 = dft.half_window_sizes(w.size)
+    frames = stft.frame_matrix(x, H, hM1, hM2)
+    result = []
+    for start in range(0, frames.shape[0], 256):
+        mX_block, pX_block = dft.from_audio(frames[start:start + 256], w, N)
+        for mX, pX in zip(mX_block, pX_block):
+            result.append(harmonic.find_spectrum_peaks(N, fs, t, mX, pX))
+    return result
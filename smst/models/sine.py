@@ -4,17 +4,26 @@ Functions that implement analysis and synthesis of sounds using the Sinusoidal M
 
 import numpy as np
 from scipy.interpolate import interp1d
-from scipy.signal import blackmanharris, triang
-from scipy.fftpack import ifft, fftshift
 
-from . import dft, stft
-from ..utils import peaks, synth
+from . import dft, stft, tracks
+from .analysis_cache import cached
+from ..utils import peaks, profiling, synth
+from ..utils.fft import ifft, fftshift
+from ..utils.window import synthesis_window
 
 
-def from_audio(x, fs, w, N, H, t, maxnSines=100, minSineDur=.01, freqDevOffset=20, freqDevSlope=0.01):
+@profiling.profiled('sine.from_audio')
+@tracks.sparse_option
+@cached('sine')
+def from_audio(x, fs, w, N, H, t, maxnSines=100, minSineDur=.01, freqDevOffset=20, freqDevSlope=0.01,
+               preselectPeaks=False):
     """
     Analyzes a sound using the sinusoidal model with sine tracking.
 
+    A multichannel sound of shape (channels, samples) is analyzed channel by
+    channel, with the spectra computed in batches of frames and the peaks
+    tracked as they come. The tracks then have shape (channels, frames, maxnSines).
+
     :param x: input array sound
     :param w: analysis window
     :param N: size of complex spectrum
@@ -24,54 +33,146 @@ def from_audio(x, fs, w, N, H, t, maxnSines=100, minSineDur=.01, freqDevOffset=2
     :param minSineDur: minimum duration of sines in seconds
     :param freqDevOffset: minimum frequency deviation at 0Hz
     :param freqDevSlope: slope increase of minimum frequency deviation
+    :param preselectPeaks: pass only the peaks which can affect the tracks to the tracking
+      (see preselect_peaks()), it makes the analysis of noisy sounds faster with the same results
+    :param sparse: (keyword only) return the tracks as tracks.SparseTracks
     :returns: xtfreq, xtmag, xtphase: frequencies, magnitudes and phases of sinusoidal tracks
     """
 
     if minSineDur < 0:  # raise error if minSineDur is smaller than 0
         raise ValueError("Minimum duration of sine tracks smaller than 0")
 
-    hM1, hM2 = dft.half_window_sizes(w.size)
-    x_padded = stft.pad_signal(x, hM2)
-    w = w / sum(w)  # normalize analysis window
+    x_channels = np.atleast_2d(x)  # a mono sound is analyzed as a single channel
+    # perform sinusoidal tracking in each channel, the peaks are streamed from the spectra
+    xtfreq, xtmag, xtphase = [np.array(tracks_c) for tracks_c in zip(*[
+        track_peaks(iterate_sound_peaks(x_c, fs, w, N, H, t), fs, H, maxnSines, minSineDur, freqDevOffset,
+                    freqDevSlope, preselectPeaks)
+        for x_c in x_channels])]
 
-    def limit_tracks(tr):
-        # limit number of tracks to maxnSines
-        return np.resize(tr, min(maxnSines, tr.size))
+    if np.ndim(x) == 1:
+        return xtfreq[0], xtmag[0], xtphase[0]
+    return xtfreq, xtmag, xtphase
 
-    def pad_tracks(tr):
-        tr_padded = np.zeros(maxnSines)
-        tr_padded[:tfreq.size] = tr
-        return tr_padded
-
-    tfreq = np.array([])
-    # xtfreq, xtmag, xtphase
-    xt = ([], [], [])
-    for x_frame in stft.iterate_analysis_frames(x_padded, H, hM1, hM2):
-        mX, pX = dft.from_audio(x_frame, w, N)  # compute dft
-        ploc = peaks.find_peaks(mX, t)  # detect locations of peaks
-        iploc, ipmag, ipphase = peaks.interpolate_peaks(mX, pX, ploc)  # refine peak values by interpolation
-        ipfreq = fs * iploc / float(N)  # convert peak locations to Hertz
-        # perform sinusoidal tracking by adding peaks to trajectories
-        track_frame = track_sinusoids(ipfreq, ipmag, ipphase, tfreq, freqDevOffset, freqDevSlope)
-        track_frame = [limit_tracks(tr_comp) for tr_comp in track_frame]
-        tfreq = track_frame[0]
 
-        for tr_comp, tracks in zip(track_frame, xt):
-            tracks.append(pad_tracks(tr_comp))
 
-    xtfreq, xtmag, xtphase = [np.vstack(xt_comp) for xt_comp in xt]
+def from_spectrogram(mX, pX, fs, N, H, t, maxnSines=100, minSineDur=.01, freqDevOffset=20, freqDevSlope=0.01,
+                     preselectPeaks=False, activeFrames=None):
+    """
+    Analyzes a precomputed spectrogram (of a mono sound) using the sinusoidal model with sine tracking.
 
-    # delete sine tracks shorter than minSineDur
-    xtfreq = clean_sinusoid_tracks(xtfreq, round(fs * minSineDur / H))
+    It gives the same tracks as from_audio() with a spectrogram from stft.from_audio(),
+    so the spectrogram can be shared by analyses with different peak picking and tracking parameters.
+
+    :param mX: magnitude spectrogram
+    :param pX: phase spectrogram
+    :param fs: sampling rate
+    :param N: FFT size of the spectrogram
+    :param H: hop size of the spectrogram
+    :param activeFrames: boolean mask of the frames to analyze (eg. from onsets.active_frames()),
+      the other frames are skipped as if they had no peaks
+    :returns: xtfreq, xtmag, xtphase: frequencies, magnitudes and phases of sinusoidal tracks
+
+    The other parameters are the same as of from_audio().
+    """
+    frame_peaks = iterate_spectrogram_peaks(mX, pX, fs, N, t, activeFrames)
+    return track_peaks(frame_peaks, fs, H, maxnSines, minSineDur, freqDevOffset, freqDevSlope, preselectPeaks)
+
+
+def track_peaks(frame_peaks, fs, H, maxnSines=100, minSineDur=.01, freqDevOffset=20, freqDevSlope=0.01,
+                preselectPeaks=False):
+    """
+    Tracks sinusoids over the spectral peaks of the frames of a mono sound.
+
+    It is the tracking shared by from_audio(), from_spectrogram() and the analyses
+    computing the peaks otherwise (eg. in parallel.sine_from_audio()).
+
+    :param frame_peaks: iterable of (ipfreq, ipmag, ipphase) - peak frequencies, magnitudes and phases of each frame
+    :param fs: sampling rate
+    :param H: hop size
+    :returns: xtfreq, xtmag, xtphase: frequencies, magnitudes and phases of sinusoidal tracks
+
+    The other parameters are the same as of from_audio().
+    """
+
+    if minSineDur < 0:  # raise error if minSineDur is smaller than 0
+        raise ValueError("Minimum duration of sine tracks smaller than 0")
+
+    tfreq = np.array([])  # incoming tracks
+    xt = ([], [], [])  # xtfreq, xtmag, xtphase
+    for ipfreq, ipmag, ipphase in frame_peaks:
+        # perform sinusoidal tracking by adding peaks to trajectories
+        with profiling.stage('sine.tracking', 1):
+            track_frame, tfreq = track_frame_peaks(
+                ipfreq, ipmag, ipphase, tfreq, maxnSines, freqDevOffset, freqDevSlope, preselectPeaks)
+        for tr_comp, tracks in zip(track_frame, xt):
+            tracks.append(tr_comp)
 
+    xtfreq, xtmag, xtphase = [np.vstack(tracks) for tracks in xt]
+    # delete sine tracks shorter than minSineDur
+    with profiling.stage('sine.cleaning', xtfreq.shape[0]):
+        clean_sinusoid_tracks(xtfreq, round(fs * minSineDur / H))
     return xtfreq, xtmag, xtphase
 
 
+def iterate_sound_peaks(x, fs, w, N, H, t, stage='sine'):
+    """
+    Iterates over the spectral peaks of the frames of a mono sound.
+
+    The spectra are computed in blocks of frames, so only one block is in memory at a time.
+
+    :param stage: prefix of the profiling stages of the spectra and peaks
+    :returns: generator of (ipfreq, ipmag, ipphase) of each frame
+
+    The other parameters are the same as of from_audio().
+    """
+    blocks = stft.iterate_spectrogram_blocks(x, w, N, H)
+    for mX_block, pX_block in profiling.iterate(stage + '.spectrum', blocks, stft.block_frame_count):
+        for mX, pX in zip(mX_block, pX_block):
+            with profiling.stage(stage + '.peaks', 1):
+                frame_peaks = spectrum_peaks(mX, pX, fs, N, t)
+            yield frame_peaks
+
+
+def iterate_spectrogram_peaks(mX, pX, fs, N, t, activeFrames=None):
+    """
+    Iterates over the spectral peaks of the frames of a spectrogram.
+
+    :param activeFrames: boolean mask of the frames to analyze, the other frames have no peaks
+    :returns: generator of (ipfreq, ipmag, ipphase) of each frame
+
+    The other parameters are the same as of from_spectrogram().
+    """
+    no_peaks = np.array([])
+    for l, (mX_frame, pX_frame) in enumerate(zip(mX, pX)):
+        if activeFrames is not None and not activeFrames[l]:  # skip the frame, the tracks end
+            yield no_peaks, no_peaks, no_peaks
+        else:
+            yield spectrum_peaks(mX_frame, pX_frame, fs, N, t)
+
+
+def spectrum_peaks(mX, pX, fs, N, t):
+    """
+    Finds the interpolated peaks of a magnitude spectrum.
+
+    :param mX: magnitude spectrum
+    :param pX: phase spectrum
+    :param fs: sampling rate
+    :param N: FFT size
+    :param t: threshold in negative dB
+    :returns: ipfreq, ipmag, ipphase: peak frequencies in Hz, magnitudes and phases
+    """
+    ploc = peaks.find_peaks(mX, t)  # detect locations of peaks
+    iploc, ipmag, ipphase = peaks.interpolate_peaks(mX, pX, ploc)  # refine peak values
+    ipfreq = fs * iploc / float(N)  # convert peak locations to Hertz
+    return ipfreq, ipmag, ipphase
+
+
+@profiling.profiled('sine.to_audio')
 def to_audio(tfreq, tmag, tphase, N, H, fs):
     """
     Synthesizes a sound using the sinusoidal model.
 
-    :param tfreq: frequencies of sinusoids
+    :param tfreq: frequencies of sinusoids or tracks.SparseTracks (tmag and tphase are ignored then)
     :param tmag: magnitudes of sinusoids
     :param tphase: phases of sinusoids
     :param N: synthesis FFT size
@@ -80,6 +181,9 @@ def to_audio(tfreq, tmag, tphase, N, H, fs):
     :returns: y: output array sound
     """
 
+    if isinstance(tfreq, tracks.SparseTracks):
+        return to_audio_sparse(tfreq, N, H, fs)
+
     hN = N / 2  # half of FFT size for synthesis
     L = tfreq.shape[0]  # number of frames
     pout = 0  # initialize output sound pointer
@@ -105,20 +209,66 @@ def to_audio(tfreq, tmag, tphase, N, H, fs):
     y = np.delete(y, range(y.size - hN, y.size))  # delete half of the last window
     return y
 
+
+def to_audio_sparse(sparse_tracks, N, H, fs):
+    """
+    Synthesizes a sound from sparse tracks, generating only the live partials of each frame.
+
+    :param sparse_tracks: tracks.SparseTracks
+    :param N: synthesis FFT size
+    :param H: hop size
+    :param fs: sampling rate
+    :returns: y: output array sound
+    """
+
+    hN = N / 2  # half of FFT size for synthesis
+    L = sparse_tracks.n_frames  # number of frames
+    y = np.zeros(H * (L + 3))  # initialize output array
+    sw = create_synth_window(N, H)
+
+    freq, mag, phase = sparse_tracks.freq, sparse_tracks.mag, sparse_tracks.phase
+    if phase is None:  # if no phases generate them
+        track_starts = sparse_tracks.offsets[:-1]
+        lengths = sparse_tracks.lengths
+        last_freq = np.concatenate([[0], freq[:-1]])
+        last_freq[track_starts] = 0  # tracks start from zero frequency
+        increments = (np.pi * (last_freq + freq) / fs) * H  # propagate phases
+        propagated = np.cumsum(increments)
+        propagated -= np.repeat(propagated[track_starts] - increments[track_starts], lengths)
+        phase = np.repeat(2 * np.pi * np.random.rand(len(sparse_tracks)), lengths) + propagated
+        phase %= 2 * np.pi  # make phase inside 2*pi
+
+    indptr, order = sparse_tracks.frame_index()
+    for l in range(L):  # iterate over the frames with partials
+        values = order[indptr[l]:indptr[l + 1]]
+        if values.size == 0:
+            continue
+        Y = synth.spectrum_for_sinusoids(freq[values], mag[values], phase[values], N, fs)
+        yw = np.real(fftshift(ifft(Y)))  # compute inverse FFT
+        y[l * H:l * H + N] += sw * yw  # overlap-add and apply a synthesis window
+    y = np.delete(y, range(hN))  # delete half of first window
+    y = np.delete(y, range(y.size - hN, y.size))  # delete half of the last window
+    return y
+
 # functions that implement transformations using the sineModel
 
 def scale_time(sfreq, smag, timeScaling):
     """
     Scales sinusoidal tracks in time.
 
-    :param sfreq: frequencies of input sinusoidal tracks
+    :param sfreq: frequencies of input sinusoidal tracks or tracks.SparseTracks (smag is ignored then)
     :param smag: magnitudes of input sinusoidal tracks
     :param timeScaling: scaling factors, in time-value pairs
     :returns: ysfreq, ysmag: frequencies and magnitudes of output sinusoidal tracks
+      (tracks.SparseTracks without phases for sparse input)
     """
     if timeScaling.size % 2 != 0:  # raise exception if array not even length
         raise ValueError("Time scaling array does not have an even size")
 
+    if isinstance(sfreq, tracks.SparseTracks):
+        sfreq, smag, _ = sfreq.to_dense()
+        return tracks.SparseTracks.from_dense(*scale_time(sfreq, smag, timeScaling))
+
     L = sfreq.shape[0]  # number of input frames
     maxInTime = max(timeScaling[::2])  # maximum value used as input times
     maxOutTime = max(timeScaling[1::2])  # maximum value used in output times
@@ -139,16 +289,20 @@ def scale_frequencies(sfreq, freqScaling):
     """
     Scales sinusoidal tracks in frequency.
 
-    :param sfreq: frequencies of input sinusoidal tracks
+    :param sfreq: frequencies of input sinusoidal tracks or tracks.SparseTracks
     :param freqScaling: scaling factors, in time-value pairs (value of 1 is no scaling)
-    :returns: ysfreq: frequencies of output sinusoidal tracks
+    :returns: ysfreq: frequencies of output sinusoidal tracks (tracks.SparseTracks for sparse input)
     """
     if freqScaling.size % 2 != 0:  # raise exception if array not even length
         raise ValueError("Frequency scaling array does not have an even size")
 
-    L = sfreq.shape[0]  # number of input frames
+    sparse = isinstance(sfreq, tracks.SparseTracks)
+    L = sfreq.n_frames if sparse else sfreq.shape[0]  # number of input frames
     # create interpolation object from the scaling values
     freqScalingEnv = np.interp(np.arange(L), L * freqScaling[::2] / freqScaling[-2], freqScaling[1::2])
+    if sparse:
+        frames = sfreq.value_positions()[0]
+        return sfreq.with_values(freq=sfreq.freq * freqScalingEnv[frames])  # scale of frequencies
     ysfreq = np.zeros_like(sfreq)  # create empty output matrix
     for l in range(L):  # go through all frames
         ind_valid = np.where(sfreq[l, :] != 0)[0]  # check if there are frequency values
@@ -221,6 +375,71 @@ def track_sinusoids(pfreq, pmag, pphase, tfreq, freqDevOffset=20, freqDevSlope=0
     return tfreqn, tmagn, tphasen
 
 
+def track_frame_peaks(pfreq, pmag, pphase, tfreq, maxnSines=100, freqDevOffset=20, freqDevSlope=0.01,
+                      preselectPeaks=False):
+    """
+    Tracks the peaks of one frame as in from_audio(), keeping at most maxnSines tracks.
+
+    :param pfreq: frequencies of current frame
+    :param pmag: magnitude of current frame
+    :param pphase: phases of current frame
+    :param tfreq: frequencies of incoming tracks from previous frame
+    :param maxnSines: maximum number of sines per frame
+    :param freqDevOffset: minimum frequency deviation at 0Hz
+    :param freqDevSlope: slope increase of minimum frequency deviation
+    :param preselectPeaks: track only the peaks selected by preselect_peaks()
+    :returns:
+      - (tfreqn, tmagn, tphasen): frequencies, magnitudes and phases of tracks padded to maxnSines
+      - tfreqn without padding: incoming tracks for the next frame
+    """
+    if preselectPeaks:
+        pfreq, pmag, pphase = preselect_peaks(pfreq, pmag, pphase, tfreq, maxnSines, freqDevOffset, freqDevSlope)
+    track_frame = track_sinusoids(pfreq, pmag, pphase, tfreq, freqDevOffset, freqDevSlope)
+    # limit number of tracks to maxnSines
+    track_frame = [np.resize(tr, min(maxnSines, tr.size)) for tr in track_frame]
+    padded = []
+    for tr in track_frame:
+        tr_padded = np.zeros(maxnSines)
+        tr_padded[:tr.size] = tr
+        padded.append(tr_padded)
+    return padded, track_frame[0]
+
+
+def preselect_peaks(pfreq, pmag, pphase, tfreq, maxnSines, freqDevOffset=20, freqDevSlope=0.01):
+    """
+    Selects the peaks of a frame which can affect the tracks kept by from_audio().
+
+    Only the maxnSines first tracks are kept in each frame. They are either
+    incoming tracks continued by a peak close enough in frequency, or new
+    tracks started by the strongest remaining peaks. So only the peaks close
+    to an incoming track and the 2 * maxnSines strongest peaks are needed,
+    the other ones can be dropped before the more expensive tracking.
+
+    :param pfreq: frequencies of current frame
+    :param pmag: magnitude of current frame
+    :param pphase: phases of current frame
+    :param tfreq: frequencies of incoming tracks from previous frame
+    :param maxnSines: maximum number of sines per frame
+    :param freqDevOffset: minimum frequency deviation at 0Hz
+    :param freqDevSlope: slope increase of minimum frequency deviation
+    :returns: pfreq, pmag, pphase: the selected peaks (in the original order)
+    """
+
+    max_peaks = 2 * maxnSines
+    if pfreq.size <= max_peaks:
+        return pfreq, pmag, pphase
+    keep = np.zeros(pfreq.size, dtype=bool)
+    keep[np.argpartition(-pmag, max_peaks - 1)[:max_peaks]] = True  # the strongest peaks
+    incoming = np.sort(tfreq[tfreq != 0])
+    if incoming.size > 0:
+        # distance of each peak to the closest incoming track
+        right = np.searchsorted(incoming, pfreq).clip(0, incoming.size - 1)
+        left = (right - 1).clip(0, incoming.size - 1)
+        distance = np.minimum(abs(pfreq - incoming[left]), abs(pfreq - incoming[right]))
+        keep |= distance < freqDevOffset + freqDevSlope * pfreq
+    return pfreq[keep], pmag[keep], pphase[keep]
+
+
 def clean_sinusoid_tracks(track_freqs, min_frames=3):
     """
     Deletes short fragments of a collection of sinusoidal tracks.
@@ -258,11 +477,11 @@ def clean_sinusoid_tracks(track_freqs, min_frames=3):
 
 
 def create_synth_window(N, H):
-    hN = N / 2
-    sw = np.zeros(N)  # initialize synthesis window
-    ow = triang(2 * H)  # triangular window
-    sw[hN - H:hN + H] = ow  # add triangular window
-    bh = blackmanharris(N)  # blackman-harris window
-    bh = bh / sum(bh)  # normalized window
-    sw[hN - H:hN + H] = sw[hN - H:hN + H] / bh[hN - H:hN + H]  # normalized synthesis window
-    return sw
+    """
+    Creates the synthesis window for the overlap-add (cached per N and H).
+
+    :param N: synthesis FFT size
+    :param H: hop size
+    :returns: sw: read-only synthesis window
+    """
+    return synthesis_window(N, H)
@@ -2,15 +2,20 @@
 Functions that implement analysis and synthesis of sounds using the Sinusoidal plus Residual Model.
 """
 
+import numpy as np
+
 from . import sine
-from ..utils import residual
+from .analysis_cache import cached
+from ..utils import profiling, residual
 
 
+@profiling.profiled('spr.from_audio')
+@cached('spr')
 def from_audio(x, fs, w, N, H, t, minSineDur, maxnSines, freqDevOffset, freqDevSlope):
     """
     Analyzes a sound using the sinusoidal plus residual model.
 
-    :param x: input sound
+    :param x: input sound (mono)
     :param fs: sampling rate
     :param w: analysis window
     :param N: FFT size
@@ -22,6 +27,9 @@ def from_audio(x, fs, w, N, H, t, minSineDur, maxnSines, freqDevOffset, freqDevS
     :returns: hfreq, hmag, hphase: harmonic frequencies, magnitude and phases; xr: residual signal
     """
 
+    if np.ndim(x) != 1:  # the residual is computed for a single channel
+        raise ValueError("Only a mono sound can be analyzed by the spr model")
+
     # perform sinusoidal analysis
     tfreq, tmag, tphase = sine.from_audio(x, fs, w, N, H, t, maxnSines, minSineDur, freqDevOffset, freqDevSlope)
     Ns = 512
@@ -30,6 +38,7 @@ def from_audio(x, fs, w, N, H, t, minSineDur, maxnSines, freqDevOffset, freqDevS
     return tfreq, tmag, tphase, xr
 
 
+@profiling.profiled('spr.to_audio')
 def to_audio(tfreq, tmag, tphase, xr, N, H, fs):
     """
     Synthesizes a sound using the sinusoidal plus residual model.
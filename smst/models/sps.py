@@ -6,15 +6,20 @@ In this model the signal is first modeled using the sinusoidal model. Then the
 residual is modeled using the stochastic model.
 """
 
+import numpy as np
+
 from . import sine, stochastic
-from ..utils import residual
+from .analysis_cache import cached
+from ..utils import profiling, residual
 
 
+@profiling.profiled('sps.from_audio')
+@cached('sps')
 def from_audio(x, fs, w, N, H, t, minSineDur, maxnSines, freqDevOffset, freqDevSlope, stocf):
     """
     Analyzes a sound using the sinusoidal plus stochastic model.
 
-    :param x: input sound
+    :param x: input sound (mono)
     :param fs: sampling rate
     :param w: analysis window
     :param N: FFT size
@@ -29,6 +34,9 @@ def from_audio(x, fs, w, N, H, t, minSineDur, maxnSines, freqDevOffset, freqDevS
       - stocEnv: stochastic residual
     """
 
+    if np.ndim(x) != 1:  # the residual is computed for a single channel
+        raise ValueError("Only a mono sound can be analyzed by the sps model")
+
     # perform sinusoidal analysis
     tfreq, tmag, tphase = sine.from_audio(x, fs, w, N, H, t, maxnSines, minSineDur, freqDevOffset, freqDevSlope)
     Ns = 512
@@ -39,6 +47,7 @@ def from_audio(x, fs, w, N, H, t, minSineDur, maxnSines, freqDevOffset, freqDevS
     return tfreq, tmag, tphase, stocEnv
 
 
+@profiling.profiled('sps.to_audio')
 def to_audio(tfreq, tmag, tphase, stocEnv, N, H, fs):
     """
     Synthesizes a sound using the sinusoidal plus stochastic model.
@@ -7,47 +7,51 @@ For example usage check the stftModel_function module.
 import math
 
 import numpy as np
+from numpy.lib.stride_tricks import as_strided
 from scipy.signal import resample
 
 from . import dft
+from .analysis_cache import cached
+from ..utils import profiling
+from ..utils.window import normalize_window
 
 
+@profiling.profiled('stft.from_audio')
+@cached('stft')
 def from_audio(x, w, N, H):
     """
     Analyzes an input signal using the short-time Fourier transform into
     a spectrogram.
 
+    A multichannel signal of shape (channels, samples) is analyzed at once
+    into spectrograms of shape (channels, frames, N / 2 + 1).
+
     :param x: input signal
     :param w: analysis window
     :param N: FFT size
     :param H: hop size
     :returns: mag_spectrogram, phase_spectrogram - magnitude and phase spectrograms
     """
-    if H <= 0:
-        raise ValueError("Hop size (H) smaller or equal to 0")
-
-    hM1, hM2 = dft.half_window_sizes(w.size)
-    x_padded = pad_signal(x, hM2)
-    w = w / sum(w)  # normalize analysis window
-    mag_spectrogram, phase_spectrogram = [], []
-    for x_frame in iterate_analysis_frames(x_padded, H, hM1, hM2):
-        mag_spectrum, phase_spectrum = dft.from_audio(x_frame, w, N)
-        mag_spectrogram.append(mag_spectrum)
-        phase_spectrogram.append(phase_spectrum)
-    return np.vstack(mag_spectrogram), np.vstack(phase_spectrogram)
+    blocks = list(profiling.iterate('stft.spectrum', iterate_spectrogram_blocks(x, w, N, H), block_frame_count))
+    return (np.concatenate([mX for mX, _ in blocks], axis=-2),
+            np.concatenate([pX for _, pX in blocks], axis=-2))
 
 
+@profiling.profiled('stft.to_audio')
 def to_audio(mY, pY, M, H):
     """
     Synthesizes an output signal from a spectrogram using the
     inverse short-time Fourier transform.
 
-    :param mY: magnitude spectrogram
+    :param mY: magnitude spectrogram (or spectrograms of shape (channels, frames, bins))
     :param pY: phase spectrogram
     :param M: window size
     :param H: hop-size
-    :returns: y - output signal
+    :returns: y - output signal (of shape (channels, samples) for multichannel spectrograms)
     """
+    if mY.ndim == 3:
+        return np.vstack([to_audio(mY_channel, pY_channel, M, H) for mY_channel, pY_channel in zip(mY, pY)])
+
     hM1, hM2 = dft.half_window_sizes(M)
     nFrames = mY.shape[0]  # number of frames
     y = np.zeros(nFrames * H + hM1 + hM2)  # initialize output array
@@ -82,7 +86,7 @@ def filter(x, fs, w, N, H, filter):
     x = np.append(x, np.zeros(hM1))  # add zeros at the end to analyze last sample
     pin = hM1  # initialize sound pointer in middle of analysis window
     pend = x.size - hM1  # last sample to start a frame
-    w = w / sum(w)  # normalize analysis window
+    w = normalize_window(w)  # normalize analysis window
     y = np.zeros(x.size)  # initialize output array
     while pin < pend:  # while sound pointer is smaller than last sample
         # -----analysis-----
@@ -132,7 +136,7 @@ def morph(x1, x2, fs, w1, N1, w2, N2, H1, smoothf, balancef):
     x1 = np.append(np.zeros(hM1_2), x1)  # add zeros at beginning to center first window at sample 0
     x1 = np.append(x1, np.zeros(hM1_1))  # add zeros at the end to analyze last sample
     pin1 = hM1_1  # initialize sound pointer in middle of analysis window
-    w1 = w1 / sum(w1)  # normalize analysis window
+    w1 = normalize_window(w1)  # normalize analysis window
     M2 = w2.size  # size of analysis window
     hM2_1 = int(math.floor((M2 + 1) / 2))  # half analysis window size by rounding
     hM2_2 = int(math.floor(M2 / 2))  # half analysis window size by floor2
@@ -158,9 +162,10 @@ def morph(x1, x2, fs, w1, N1, w2, N2, H1, smoothf, balancef):
     return y
 
 def pad_signal(x, hM2):
-    x_padded = np.append(np.zeros(hM2), x)  # add zeros at beginning to center first window at sample 0
-    x_padded = np.append(x_padded, np.zeros(hM2))  # add zeros at the end to analyze last sample
-    return x_padded
+    # add zeros at beginning to center first window at sample 0 and at the end to analyze last sample
+    # (along the last axis, so that the channels of a multichannel signal are padded at once)
+    padding = np.zeros(x.shape[:-1] + (hM2,))
+    return np.concatenate([padding, x, padding], axis=-1)
 
 def iterate_analysis_frames(x, H, hM1, hM2):
     """
@@ -179,3 +184,61 @@ def iterate_analysis_frames(x, H, hM1, hM2):
         frame_end = pin + hM2
         yield x[frame_start:frame_end]  # select one frame of input sound
         pin += H  # advance sound pointer
+
+
+def frame_count(size, H, hM1):
+    """Number of frames generated by iterate_analysis_frames() from a padded signal of given size."""
+    return max(0, int(math.ceil((size - 2 * hM1) / float(H))))
+
+
+def frame_matrix(x, H, hM1, hM2):
+    """
+    Selects all analysis frames of a signal at once without copying it.
+
+    It returns the same frames as iterate_analysis_frames() as a read-only
+    strided view. Multichannel signals of shape (channels, samples) give
+    frames of shape (channels, frames, window size).
+
+    :param x: input signal (padded)
+    :param H: hop size
+    :param hM1: half analysis window size by rounding
+    :param hM2: half analysis window size by floor
+    :return: array of frames of shape (..., frames, hM1 + hM2)
+    """
+    x = np.ascontiguousarray(x)
+    n_frames = frame_count(x.shape[-1], H, hM1)
+    step = x.strides[-1]
+    frames = as_strided(x, shape=x.shape[:-1] + (n_frames, hM1 + hM2),
+                        strides=x.strides[:-1] + (H * step, step))
+    frames.flags.writeable = False
+    return frames
+
+
+def iterate_spectrogram_blocks(x, w, N, H, block_frames=256):
+    """
+    Iterates over the short-time spectra of a signal computed in blocks of frames.
+
+    Each block of frames (of all the channels) is transformed by one batched
+    DFT call. The blocks bound the memory needed for the intermediate arrays.
+
+    :param x: input signal of shape (samples,) or (channels, samples)
+    :param w: analysis window
+    :param N: FFT size
+    :param H: hop size
+    :param block_frames: number of frames in a block
+    :return: generator of (mX, pX) - magnitude and phase spectra of shape (..., frames in block, N / 2 + 1)
+    """
+    if H <= 0:
+        raise ValueError("Hop size (H) smaller or equal to 0")
+
+    hM1, hM2 = dft.half_window_sizes(w.size)
+    frames = frame_matrix(pad_signal(x, hM2), H, hM1, hM2)
+    w = normalize_window(w)  # normalize analysis window
+    n_frames = frames.shape[-2]
+    for start in range(0, max(n_frames, 1), block_frames):
+        yield dft.from_audio(frames[..., start:start + block_frames, :], w, N)
+
+
+def block_frame_count(block):
+    """Number of frames (of all channels) in a block (mX, pX) from iterate_spectrogram_blocks()."""
+    return block[0][..., 0].size
@@ -9,21 +9,30 @@ are generated randomly.
 
 import numpy as np
 from scipy.interpolate import interp1d
-from scipy.signal import hanning, resample
-from scipy.fftpack import fft, ifft
+from scipy.signal import resample
 
 from . import stft
-from ..utils.math import is_power_of_two, from_db_magnitudes, to_db_magnitudes
+from .analysis_cache import cached
+from ..utils import profiling
+from ..utils.fft import fft, ifft
+from ..utils.math import is_fast_fft_size, from_db_magnitudes, to_db_magnitudes
+from ..utils.window import hanning_window
 
 
-def from_audio(x, H, N, stocf):
+@profiling.profiled('stochastic.from_audio')
+@cached('stochastic')
+def from_audio(x, H, N, stocf, block_frames=256):
     """
     Analyzes a sound using the stochastic model.
 
+    All frames (and channels of a multichannel sound of shape (channels, samples))
+    are analyzed at once, the envelope then has shape (channels, frames, stocf * (N / 2 + 1)).
+
     :param x: input array sound
     :param H: hop size
     :param N: FFT size
     :param stocf: decimation factor of mag spectrum for stochastic analysis, bigger than 0, maximum of 1
+    :param block_frames: number of frames transformed at once
     :returns: stocEnv: stochastic envelope
     """
 
@@ -38,42 +47,47 @@ def from_audio(x, H, N, stocf):
     if H <= 0:  # raise error if hop size 0 or negative
         raise ValueError("Hop size (H) smaller or equal to 0")
 
-    if not (is_power_of_two(N)):  # raise error if N not a power of two
-        raise ValueError("FFT size (N) is not a power of 2")
+    if not (is_fast_fft_size(N)):  # raise error if N is not a supported FFT size
+        raise ValueError("FFT size (N) is not an even product of powers of 2, 3 and 5")
 
-    w = hanning(N)  # analysis window
-    x = np.append(np.zeros(No2), x)  # add zeros at beginning to center first window at sample 0
-    x = np.append(x, np.zeros(No2))  # add zeros at the end to analyze last sample
+    w = hanning_window(N)  # analysis window
+    x = stft.pad_signal(x, No2)  # center first window at sample 0 and analyze last sample
+    frames = stft.frame_matrix(x, H, No2, No2)
     stocEnv = []
-    for x_frame in stft.iterate_analysis_frames(x, H, No2, No2):
-        xw = x_frame * w  # window the input sound
-        X = fft(xw)  # compute FFT
-        mX = to_db_magnitudes(X[:hN])  # magnitude spectrum of positive frequencies
-        mY = resample(np.maximum(-200, mX), stocf * hN)  # decimate the mag spectrum
+    for start in range(0, frames.shape[-2], block_frames):
+        xw = frames[..., start:start + block_frames, :] * w  # window the input sound
+        with profiling.stage('stochastic.spectrum', xw[..., 0].size):
+            X = fft(xw)  # compute FFT
+            mX = to_db_magnitudes(X[..., :hN])  # magnitude spectrum of positive frequencies
+        with profiling.stage('stochastic.envelope', xw[..., 0].size):
+            mY = resample(np.maximum(-200, mX), stocf * hN, axis=-1)  # decimate the mag spectrum
         stocEnv.append(mY)
-    stocEnv = np.vstack(stocEnv)
+    stocEnv = np.concatenate(stocEnv, axis=-2)
     return stocEnv
 
 
+@profiling.profiled('stochastic.to_audio')
 def to_audio(stocEnv, H, N):
     """
     Synthesizes sound from a stochastic model.
 
-    :param stocEnv: stochastic envelope
+    :param stocEnv: stochastic envelope (or envelopes of shape (channels, frames, size))
     :param H: hop size
     :param N: fft size
-    :returns: y: output sound
+    :returns: y: output sound (of shape (channels, samples) for multichannel envelopes)
     """
+    if stocEnv.ndim == 3:
+        return np.vstack([to_audio(stocEnv_channel, H, N) for stocEnv_channel in stocEnv])
 
-    if not (is_power_of_two(N)):  # raise error if N not a power of two
-        raise ValueError("N is not a power of two")
+    if not (is_fast_fft_size(N)):  # raise error if N is not a supported FFT size
+        raise ValueError("N is not an even product of powers of 2, 3 and 5")
 
     hN = N / 2 + 1  # positive size of fft
     No2 = N / 2  # half of N
     L = stocEnv.shape[0]  # number of frames
     ysize = H * (L + 3)  # output sound size
     y = np.zeros(ysize)  # initialize output array
-    ws = 2 * hanning(N)  # synthesis window
+    ws = hanning_window(N, 2)  # synthesis window
     pout = 0  # output sound pointer
     for l in range(L):
         mY = resample(stocEnv[l, :], hN)  # interpolate to original size
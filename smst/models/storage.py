@@ -0,0 +1,257 @@
+"""
+Compact on-disk storage of model analysis results.
+
+The outputs of a model analysis (eg. `tfreq`, `tmag`, `tphase`, `stocEnv`)
+can be saved once and loaded many times for transformations and synthesis.
+
+An analysis is stored in a directory containing `metadata.json` (model name,
+analysis parameters, library version and the layout of the arrays) and one
+file per stored array:
+
+- values can be quantized to float32 or float16
+- sinusoidal/harmonic tracks are stored sparsely - only the slots with a
+  non-zero frequency, in the compressed sparse row layout (`indptr`,
+  `indices`, values) shared by the frequencies, magnitudes and phases
+- arrays are either plain .npy files which can be memory-mapped, or split
+  into chunks of frames compressed with zlib, so that a range of frames can
+  be loaded without decompressing the whole array
+
+Example:
+
+>>> tfreq, tmag, tphase = sine.from_audio(x, fs, w, N, H, t)
+>>> storage.save('analysis/sax', 'sine', dict(tfreq=tfreq, tmag=tmag, tphase=tphase),
+...              params=dict(fs=fs, N=N, H=H, t=t), dtype=np.float32)
+>>> outputs, metadata = storage.load('analysis/sax', mmap=True)
+"""
+
+from collections import OrderedDict
+import json
+import os
+import zlib
+
+import numpy as np
+
+from .. import __version__
+from ..utils.files import ensure_directory
+
+FORMAT_VERSION = 1
+
+METADATA_FILE = 'metadata.json'
+
+# groups of track arrays sharing the support of the non-zero frequencies
+TRACK_GROUPS = [('tfreq', 'tmag', 'tphase'), ('hfreq', 'hmag', 'hphase'), ('xtfreq', 'xtmag', 'xtphase')]
+
+
+def save(path, model, outputs, params=None, dtype=np.float32, sparse=True, keep_empty_slots=True,
+         compress=False, chunk_bytes=1 << 20, compress_level=6):
+    """
+    Saves analysis outputs of a model.
+
+    :param path: directory where to store the analysis (created if necessary)
+    :param model: name of the model (eg. sine, harmonic, hps)
+    :param outputs: dict of output arrays (eg. tfreq, tmag, tphase, stocEnv)
+    :param params: dict of analysis parameters stored as metadata (must be JSON-serializable)
+    :param dtype: float dtype of stored values (np.float64, np.float32, np.float16),
+      or a dict of dtypes per output name, None keeps the dtypes of the outputs;
+      integer and complex arrays are stored as they are
+    :param sparse: store track matrices sparsely (only slots with non-zero frequency)
+    :param keep_empty_slots: if True the magnitudes/phases of slots with zero frequency (not used
+      in synthesis) are kept exactly, storing the array densely if needed; if False they are
+      replaced with their most common value (eg. -100 dB) on loading
+    :param compress: compress the arrays in chunks of frames (they cannot be memory-mapped then)
+    :param chunk_bytes: approximate size of an uncompressed chunk
+    :param compress_level: zlib compression level (1-9)
+    """
+    ensure_directory(path)
+    arrays = OrderedDict()
+    for name, value in outputs.items():
+        value = np.asarray(value)
+        arrays[name] = _quantize(value, dtype.get(name) if isinstance(dtype, dict) else dtype)
+
+    files = OrderedDict()
+    array_meta = OrderedDict()
+
+    sparse_names = set()
+    if sparse:
+        for group in TRACK_GROUPS:
+            freq_name = group[0]
+            if freq_name not in arrays or arrays[freq_name].ndim != 2:
+                continue
+            support = arrays[freq_name] != 0
+            indptr = np.concatenate([[0], np.cumsum(support.sum(axis=1))]).astype(np.int64)
+            indices = np.nonzero(support)[1].astype(_index_dtype(support.shape[1]))
+            group_files = OrderedDict([('indptr', '%s.indptr' % freq_name), ('indices', '%s.indices' % freq_name)])
+            group_used = False
+            for name in group:
+                if name not in arrays or arrays[name].shape != support.shape:
+                    continue
+                values = arrays[name]
+                dropped = values[~support]
+                if keep_empty_slots and dropped.size > 0 and np.any(dropped != dropped[0]):
+                    continue  # the values outside the support would be lost
+                fill = _most_common(dropped)
+                files['%s.values' % name] = values[support]
+                array_meta[name] = OrderedDict([
+                    ('layout', 'sparse'),
+                    ('shape', list(values.shape)),
+                    ('dtype', values.dtype.str),
+                    ('support', freq_name),
+                    ('fill', fill),
+                ])
+                sparse_names.add(name)
+                group_used = True
+            if group_used:
+                files[group_files['indptr']] = indptr
+                files[group_files['indices']] = indices
+
+    for name, values in arrays.items():
+        if name in sparse_names:
+            continue
+        files[name] = values
+        array_meta[name] = OrderedDict([
+            ('layout', 'dense'),
+            ('shape', list(values.shape)),
+            ('dtype', values.dtype.str),
+        ])
+
+    file_meta = OrderedDict()
+    for file_name, values in files.items():
+        file_meta[file_name] = _write_file(path, file_name, values, compress, chunk_bytes, compress_level)
+
+    metadata = OrderedDict([
+        ('format_version', FORMAT_VERSION),
+        ('smst_version', __version__),
+        ('model', model),
+        ('params', params or {}),
+        ('arrays', array_meta),
+        ('files', file_meta),
+    ])
+    with open(os.path.join(path, METADATA_FILE), 'w') as file:
+        json.dump(metadata, file, indent=2, default=_json_default)
+
+
+def load(path, mmap=False, frames=None):
+    """
+    Loads analysis outputs saved by save().
+
+    :param path: directory with the stored analysis
+    :param mmap: memory-map the uncompressed dense arrays instead of reading them
+    :param frames: optional pair (start, stop) - load only this range of frames
+    :returns:
+      - outputs: ordered dict of output arrays
+      - metadata: dict with model, params and other metadata
+    """
+    metadata = load_metadata(path)
+    frame_slice = slice(*frames) if frames is not None else slice(None)
+    outputs = OrderedDict()
+    for name, meta in metadata['arrays'].items():
+        if meta['layout'] == 'dense':
+            outputs[name] = _read_file(path, name, metadata['files'][name], mmap, frame_slice)
+        else:
+            outputs[name] = _load_sparse(path, name, meta, metadata['files'], frame_slice)
+    return outputs, metadata
+
+
+def load_metadata(path):
+    """Loads only the metadata (model, parameters, array layout) of a stored analysis."""
+    with open(os.path.join(path, METADATA_FILE)) as file:
+        metadata = json.load(file, object_pairs_hook=OrderedDict)
+    if metadata['format_version'] > FORMAT_VERSION:
+        raise ValueError("Unsupported analysis format version: %s" % metadata['format_version'])
+    return metadata
+
+
+def stored_size(path):
+    """Total size in bytes of a stored analysis."""
+    return sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+
+# -- support functions --
+
+
+def _quantize(values, dtype):
+    if dtype is not None and values.dtype.kind == 'f' and values.dtype != np.dtype(dtype):
+        return values.astype(dtype)
+    return values
+
+
+def _most_common(values):
+    if values.size == 0:
+        return 0
+    unique, counts = np.unique(values, return_counts=True)
+    return unique[np.argmax(counts)].item()
+
+
+def _index_dtype(size):
+    return np.uint16 if size <= np.iinfo(np.uint16).max else np.int32
+
+
+def _load_sparse(path, name, meta, files, frame_slice):
+    support = meta['support']
+    indptr = _read_file(path, '%s.indptr' % support, files['%s.indptr' % support], False, slice(None))
+    start, stop, _ = frame_slice.indices(len(indptr) - 1)
+    stop = max(start, stop)
+    value_slice = slice(indptr[start], indptr[stop])
+    indices = _read_file(path, '%s.indices' % support, files['%s.indices' % support], False, value_slice)
+    values = _read_file(path, '%s.values' % name, files['%s.values' % name], False, value_slice)
+    shape = [stop - start] + meta['shape'][1:]
+    dense = np.empty(shape, dtype=np.dtype(str(meta['dtype'])))
+    dense.fill(meta['fill'])
+    rows = np.repeat(np.arange(stop - start), np.diff(indptr[start:stop + 1]))
+    dense[rows, indices] = values
+    return dense
+
+
+def _write_file(path, file_name, values, compress, chunk_bytes, compress_level):
+    values = np.ascontiguousarray(values)
+    meta = OrderedDict([('shape', list(values.shape)), ('dtype', values.dtype.str)])
+    if not compress:
+        meta['file'] = file_name + '.npy'
+        np.save(os.path.join(path, meta['file']), values)
+        return meta
+
+    row_bytes = max(1, values[:1].nbytes)
+    rows_per_chunk = max(1, chunk_bytes // row_bytes)
+    offsets = [0]
+    meta['file'] = file_name + '.zchunks'
+    meta['rows_per_chunk'] = rows_per_chunk
+    with open(os.path.join(path, meta['file']), 'wb') as file:
+        for start in range(0, max(len(values), 1), rows_per_chunk):
+            chunk = zlib.compress(values[start:start + rows_per_chunk].tobytes(), compress_level)
+            file.write(chunk)
+            offsets.append(offsets[-1] + len(chunk))
+    meta['offsets'] = offsets
+    return meta
+
+
+def _read_file(path, file_name, meta, mmap, row_slice):
+    dtype = np.dtype(str(meta['dtype']))
+    shape = meta['shape']
+    if 'offsets' not in meta:
+        values = np.load(os.path.join(path, meta['file']), mmap_mode='r' if mmap else None)
+        return values[row_slice] if row_slice != slice(None) else values
+
+    start, stop, _ = slice(row_slice.start, row_slice.stop).indices(shape[0] if shape else 1)
+    stop = max(start, stop)
+    rows_per_chunk = meta['rows_per_chunk']
+    offsets = meta['offsets']
+    first_chunk = start // rows_per_chunk
+    last_chunk = (stop - 1) // rows_per_chunk if stop > start else first_chunk - 1
+    parts = []
+    with open(os.path.join(path, meta['file']), 'rb') as file:
+        for chunk in range(first_chunk, last_chunk + 1):
+            file.seek(offsets[chunk])
+            data = zlib.decompress(file.read(offsets[chunk + 1] - offsets[chunk]))
+            parts.append(np.frombuffer(data, dtype=dtype).reshape([-1] + shape[1:]))
+    if not parts:
+        return np.zeros([0] + shape[1:], dtype=dtype)
+    values = np.concatenate(parts)
+    chunk_start = first_chunk * rows_per_chunk
+    return values[start - chunk_start:stop - chunk_start]
+
+
+def _json_default(value):
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError("Not JSON serializable: %r" % (value,))
@@ -0,0 +1,132 @@
+"""
+Parameter sweeps of the sinusoidal and harmonic analysis sharing the spectrogram.
+
+Tuning the peak picking and tracking parameters (eg. t, maxnSines,
+freqDevOffset, minf0/maxf0, f0et) does not change the spectrogram, which
+depends only on the window, FFT size and hop size. A sweep computes the
+spectrogram once, then analyzes it with each combination of a grid of the
+other parameters (in parallel worker processes) and measures the error of
+the sound reconstructed from the tracks.
+
+Example:
+
+>>> results = sweep.sine_sweep(x, fs, w, N, H, dict(t=[-80, -70], maxnSines=[50, 100, 150]))
+>>> best = min(results, key=lambda result: result['error'])
+>>> best['params']
+{'maxnSines': 150, 't': -80}
+"""
+
+from collections import OrderedDict
+import itertools
+import multiprocessing
+
+import numpy as np
+
+from . import harmonic, sine, stft
+from ..utils.math import rmse
+
+_shared = None  # (analysis, x, fs, mX, pX, N, H, Ns, keep_outputs) shared by the tasks of a worker process
+
+
+def sine_sweep(x, fs, w, N, H, grid, Ns=512, workers=None, keep_outputs=True):
+    """
+    Analyzes a sound using the sinusoidal model with each combination of the parameters in a grid.
+
+    :param x: input sound (mono)
+    :param fs: sampling rate
+    :param w: analysis window
+    :param N: FFT size
+    :param H: hop size
+    :param grid: dict of parameter name -> list of values, the parameters of sine.from_spectrogram()
+      (t is required)
+    :param Ns: FFT size of the synthesis used to measure the reconstruction error
+    :param workers: number of worker processes (default: number of CPUs, 1 = no processes)
+    :param keep_outputs: include the tracks in the results
+    :returns: list of results (see sweep())
+    """
+    return sweep(sine.from_spectrogram, x, fs, w, N, H, grid, Ns, workers, keep_outputs)
+
+
+def harmonic_sweep(x, fs, w, N, H, grid, Ns=512, workers=None, keep_outputs=True):
+    """
+    Analyzes a sound using the harmonic model with each combination of the parameters in a grid.
+
+    :param grid: dict of parameter name -> list of values, the parameters of harmonic.from_spectrogram()
+      (t, nH, minf0, maxf0 and f0et are required)
+    :returns: list of results (see sweep())
+
+    The other parameters are the same as of sine_sweep().
+    """
+    return sweep(harmonic.from_spectrogram, x, fs, w, N, H, grid, Ns, workers, keep_outputs)
+
+
+def sweep(analysis, x, fs, w, N, H, grid, Ns=512, workers=None, keep_outputs=True):
+    """
+    Analyzes the spectrogram of a sound with each combination of the parameters in a grid.
+
+    :param analysis: function (mX, pX, fs, N, H, **params) returning (tfreq, tmag, tphase),
+      eg. sine.from_spectrogram() (must be picklable for the worker processes)
+    :returns: list of results in the order of parameter_grid(grid), each a dict with:
+      - params: the parameters of the analysis
+      - error: RMSE between the sound and the sound synthesized from the tracks
+      - outputs: tfreq, tmag, tphase (only with keep_outputs)
+
+    The other parameters are the same as of sine_sweep().
+    """
+    if np.ndim(x) != 1:
+        raise ValueError("Only a mono sound can be swept")
+
+    mX, pX = stft.from_audio(x, w, N, H)  # shared by all the combinations
+    # the sound and spectrogram are passed to each worker once, the tasks are just the parameters
+    shared = (analysis, x, fs, mX, pX, N, H, Ns, keep_outputs)
+    tasks = parameter_grid(grid)
+
+    workers = workers or multiprocessing.cpu_count()
+    if workers == 1:
+        _init_worker(shared)
+        try:
+            return [evaluate(params) for params in tasks]
+        finally:
+            _init_worker(None)
+
+    pool = multiprocessing.Pool(workers, _init_worker, (shared,))
+    try:
+        return pool.map(evaluate, tasks)
+    finally:
+        pool.close()
+        pool.join()
+
+
+def parameter_grid(grid):
+    """
+    All combinations of parameter values.
+
+    :param grid: dict of parameter name -> list of values (or a single value)
+    :returns: list of dicts of parameter name -> value, the last parameter (by name) varies fastest
+    """
+    names = sorted(grid)
+    values = [grid[name] if isinstance(grid[name], (list, tuple, np.ndarray)) else [grid[name]] for name in names]
+    return [dict(zip(names, combination)) for combination in itertools.product(*values)]
+
+
+def evaluate(params):
+    """
+    Analyzes the shared spectrogram with one combination of parameters, to be run in a worker process.
+
+    :param params: dict of the parameters of the analysis
+    :returns: result dict (see sweep())
+    """
+    analysis, x, fs, mX, pX, N, H, Ns, keep_outputs = _shared
+    tfreq, tmag, tphase = analysis(mX, pX, fs, N, H, **params)
+    # sine.to_audio() modifies the phases in place
+    y = sine.to_audio(tfreq, tmag, tphase.copy(), Ns, H, fs)
+    size = min(x.size, y.size)
+    result = OrderedDict([('params', params), ('error', rmse(x[:size], y[:size]))])
+    if keep_outputs:
+        result['outputs'] = (tfreq, tmag, tphase)
+    return result
+
+
+def _init_worker(shared):
+    global _shared
+    _shared = shared
@@ -0,0 +1,136 @@
+"""
+Incremental synthesis of sinusoidal tracks for interactive editing.
+
+`SynthesisCache` keeps the last rendered output of `sine.to_audio()` together
+with a hash of each frame of the model (the rows of tfreq, tmag, tphase).
+When the model is rendered again (eg. after editing a transformation
+envelope over a short region) only the frames whose rows changed are
+synthesized again, together with their overlap-add neighbours, and spliced
+into the cached output.
+
+Example:
+
+>>> cache = synthesis_cache.SynthesisCache(Ns, H, fs)
+>>> y = cache.render(hfreq, hmag, hphase)
+>>> y = cache.render(hfreq_edited, hmag, hphase)  # synthesizes only the changed frames
+
+Without phases (empty tphase) the phases are propagated from frame to frame,
+so an edit changes the phases of all the following frames and everything
+from the first changed frame on has to be synthesized again.
+"""
+
+import hashlib
+
+import numpy as np
+
+from . import sine
+from ..utils import synth
+from ..utils.fft import ifft, fftshift
+
+
+class SynthesisCache(object):
+    """
+    Sinusoidal synthesis which re-renders only the frames changed since the last render.
+
+    :param N: synthesis FFT size
+    :param H: hop size
+    :param fs: sampling rate
+    """
+
+    def __init__(self, N, H, fs):
+        self.N = N
+        self.H = H
+        self.fs = fs
+        self.synthesis_window = sine.create_synth_window(N, H)
+        self.hashes = None  # hashes of the frames of the last rendered model
+        self.y = None  # output of all frames before trimming the half windows
+        self.phases = None  # phases used in the synthesis of each frame
+        self.rendered_frames = 0  # number of frames synthesized by the last render
+
+    def render(self, tfreq, tmag, tphase=np.array([])):
+        """
+        Synthesizes the sound of sinusoidal tracks like `sine.to_audio()`.
+
+        :param tfreq: frequencies of sinusoids
+        :param tmag: magnitudes of sinusoids
+        :param tphase: phases of sinusoids (empty to propagate the phases)
+        :returns: y: output sound
+        """
+        L = tfreq.shape[0]  # number of frames
+        propagate = tphase.size == 0
+        hashes = frame_hashes(tfreq, tmag, None if propagate else tphase)
+        if self.hashes is None or len(hashes) != len(self.hashes) or self.phases.shape != tfreq.shape:
+            self.y = np.zeros(self.H * (L + 3))
+            self.phases = np.zeros(tfreq.shape)
+            changed = np.arange(L)
+        else:
+            changed = np.flatnonzero(hashes != self.hashes)
+            if propagate and changed.size > 0:  # the phases of all the following frames change
+                changed = np.arange(changed[0], L)
+        self.hashes = hashes
+
+        self._update_phases(tfreq, tphase, changed)
+        self.rendered_frames = 0
+        for start, stop in self._affected_ranges(changed):
+            self._render_range(tfreq, tmag, start, stop)
+
+        hN = self.N / 2  # half of FFT size for synthesis
+        return self.y[hN:self.y.size - hN].copy()  # delete half of the first and last window
+
+    def clear(self):
+        """Forgets the last rendered output."""
+        self.hashes = self.y = self.phases = None
+
+    def _update_phases(self, tfreq, tphase, changed):
+        if changed.size == 0:
+            return
+        if tphase.size > 0:
+            self.phases[changed] = tphase[changed]
+            return
+        # propagate the phases from the first changed frame on as sine.to_audio() does
+        first = changed[0]
+        if first == 0:
+            ytphase = 2 * np.pi * np.random.rand(tfreq.shape[1])  # initialize synthesis phases
+            lastytfreq = tfreq[0, :]
+        else:
+            ytphase = self.phases[first - 1] % (2 * np.pi)
+            lastytfreq = tfreq[first - 1, :]
+        for l in range(first, tfreq.shape[0]):
+            ytphase = ytphase + (np.pi * (lastytfreq + tfreq[l, :]) / self.fs) * self.H  # propagate phases
+            self.phases[l] = ytphase
+            lastytfreq = tfreq[l, :]
+            ytphase = ytphase % (2 * np.pi)  # make phase inside 2*pi
+
+    def _affected_ranges(self, changed):
+        """Merges the output sample ranges [start, stop) of the changed frames."""
+        ranges = []
+        for l in changed:
+            start, stop = l * self.H, l * self.H + self.N
+            if ranges and start <= ranges[-1][1]:
+                ranges[-1][1] = stop
+            else:
+                ranges.append([start, stop])
+        return ranges
+
+    def _render_range(self, tfreq, tmag, start, stop):
+        """Synthesizes the output samples [start, stop) again from all the frames overlapping them."""
+        N, H = self.N, self.H
+        self.y[start:stop] = 0
+        first_frame = max(0, -(-(start - N + 1) // H))
+        last_frame = min(tfreq.shape[0] - 1, (stop - 1) // H)
+        for l in range(first_frame, last_frame + 1):  # in the same order as the whole synthesis
+            Y = synth.spectrum_for_sinusoids(tfreq[l, :], tmag[l, :], self.phases[l], N, self.fs)
+            yw = self.synthesis_window * np.real(fftshift(ifft(Y)))  # inverse FFT and synthesis window
+            frame_start, frame_stop = max(start, l * H), min(stop, l * H + N)
+            self.y[frame_start:frame_stop] += yw[frame_start - l * H:frame_stop - l * H]  # overlap-add
+            self.rendered_frames += 1
+
+
+def frame_hashes(tfreq, tmag, tphase=None):
+    """
+    Hashes of the frames (rows) of a sinusoidal model.
+
+    :returns: array of hexadecimal digests, one per frame
+    """
+    rows = np.ascontiguousarray(np.hstack([a for a in (tfreq, tmag, tphase) if a is not None]))
+    return np.array([hashlib.sha1(row.tobytes()).hexdigest() for row in rows])
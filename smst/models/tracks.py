@@ -0,0 +1,178 @@
+"""
+Sparse representation of sinusoidal/harmonic tracks.
+
+The models represent tracks densely as matrices of shape (frames, slots)
+(eg. `tfreq`, `tmag`, `tphase` with maxnSines or nH slots) where a zero
+frequency means that there is no partial in the slot. `SparseTracks`
+stores only the partials - each track (a continuous run of non-zero
+frequencies in one slot) has its start frame and slot, and the values of
+all tracks are concatenated into contiguous arrays. For sparse sounds
+(eg. percussive ones) it takes a fraction of the memory and lets the
+synthesis iterate only over the live partials.
+
+Example:
+
+>>> tracks = sine.from_audio(x, fs, w, N, H, t, sparse=True)
+>>> y = sine.to_audio(tracks, None, None, Ns, H, fs)
+>>> tfreq, tmag, tphase = tracks.to_dense()
+"""
+
+import functools
+
+import numpy as np
+
+
+class SparseTracks(object):
+    """
+    Sinusoidal tracks stored sparsely.
+
+    The values of the track i are freq[offsets[i]:offsets[i + 1]] (same for
+    mag and phase), they start at the frame starts[i] in the slot slots[i].
+
+    :param n_frames: number of frames
+    :param n_slots: number of slots (columns of the dense matrices)
+    :param starts: start frame of each track
+    :param slots: slot of each track
+    :param offsets: offsets of the tracks in the value arrays (size: number of tracks + 1)
+    :param freq: frequencies of all tracks
+    :param mag: magnitudes of all tracks
+    :param phase: phases of all tracks or None if there are no phases
+    """
+
+    __slots__ = ('n_frames', 'n_slots', 'starts', 'slots', 'offsets', 'freq', 'mag', 'phase')
+
+    def __init__(self, n_frames, n_slots, starts, slots, offsets, freq, mag, phase=None):
+        self.n_frames = n_frames
+        self.n_slots = n_slots
+        self.starts = starts
+        self.slots = slots
+        self.offsets = offsets
+        self.freq = freq
+        self.mag = mag
+        self.phase = phase
+
+    @classmethod
+    def from_dense(cls, tfreq, tmag, tphase=None):
+        """
+        Converts dense track matrices into sparse tracks.
+
+        :param tfreq: frequencies of shape (frames, slots), zero where there is no partial
+        :param tmag: magnitudes
+        :param tphase: phases (None or empty if there are no phases)
+        :returns: SparseTracks instance
+        """
+        n_frames, n_slots = tfreq.shape
+        support = (tfreq != 0).T  # slot-major, so that the values of a track are contiguous
+        edges = np.zeros((n_slots, n_frames + 2), dtype=np.int8)
+        edges[:, 1:-1] = support
+        edges = np.diff(edges, axis=1)
+        slots, starts = np.nonzero(edges == 1)
+        ends = np.nonzero(edges == -1)[1]
+        offsets = np.concatenate([[0], np.cumsum(ends - starts)])
+        has_phase = tphase is not None and np.size(tphase) > 0
+        return cls(n_frames, n_slots, starts, slots, offsets,
+                   tfreq.T[support], tmag.T[support], tphase.T[support] if has_phase else None)
+
+    def to_dense(self, empty_mag=0.0):
+        """
+        Converts the sparse tracks into dense track matrices.
+
+        :param empty_mag: magnitude of the slots without a partial
+        :returns: tfreq, tmag, tphase: matrices of shape (frames, slots), the phases are
+          an empty array if there are no phases
+        """
+        shape = (self.n_frames, self.n_slots)
+        frames, slots = self.value_positions()
+        tfreq = np.zeros(shape)
+        tfreq[frames, slots] = self.freq
+        tmag = np.empty(shape)
+        tmag.fill(empty_mag)
+        tmag[frames, slots] = self.mag
+        if self.phase is None:
+            return tfreq, tmag, np.array([])
+        tphase = np.zeros(shape)
+        tphase[frames, slots] = self.phase
+        return tfreq, tmag, tphase
+
+    def value_positions(self):
+        """Frame and slot of each value (of freq, mag, phase)."""
+        lengths = self.lengths
+        index_in_track = np.arange(self.offsets[-1]) - np.repeat(self.offsets[:-1], lengths)
+        return np.repeat(self.starts, lengths) + index_in_track, np.repeat(self.slots, lengths)
+
+    def frame_index(self):
+        """
+        Index of the values by frames.
+
+        :returns: indptr, order - the values of the frame l are freq[order[indptr[l]:indptr[l + 1]]]
+        """
+        frames = self.value_positions()[0]
+        order = np.argsort(frames, kind='mergesort')
+        indptr = np.concatenate([[0], np.cumsum(np.bincount(frames, minlength=self.n_frames))])
+        return indptr, order
+
+    def iter_frames(self):
+        """
+        Iterates over the live partials in each frame.
+
+        :return: generator of (freq, mag, phase) of each frame, phase is None if there are no phases
+        """
+        indptr, order = self.frame_index()
+        for l in range(self.n_frames):
+            values = order[indptr[l]:indptr[l + 1]]
+            yield self.freq[values], self.mag[values], self.phase[values] if self.phase is not None else None
+
+    def track(self, i):
+        """
+        Values of one track.
+
+        :returns: start, slot, freq, mag, phase (views, phase is None if there are no phases)
+        """
+        values = slice(self.offsets[i], self.offsets[i + 1])
+        phase = self.phase[values] if self.phase is not None else None
+        return self.starts[i], self.slots[i], self.freq[values], self.mag[values], phase
+
+    def with_values(self, freq=None, mag=None):
+        """New tracks with the same positions and replaced frequencies and/or magnitudes."""
+        return SparseTracks(self.n_frames, self.n_slots, self.starts, self.slots, self.offsets,
+                            self.freq if freq is None else freq, self.mag if mag is None else mag, self.phase)
+
+    @property
+    def lengths(self):
+        """Number of frames of each track."""
+        return np.diff(self.offsets)
+
+    @property
+    def nbytes(self):
+        """Memory taken by the arrays."""
+        arrays = [self.starts, self.slots, self.offsets, self.freq, self.mag, self.phase]
+        return sum(a.nbytes for a in arrays if a is not None)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __repr__(self):
+        return 'SparseTracks(frames=%d, slots=%d, tracks=%d, partials=%d)' % (
+            self.n_frames, self.n_slots, len(self), self.freq.size)
+
+
+def sparse_option(func):
+    """
+    Decorator of track analysis functions adding a keyword argument sparse.
+
+    With sparse=True the output (tfreq, tmag, tphase) is converted to SparseTracks
+    (a list of them for each channel of a multichannel sound).
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        sparse = kwargs.pop('sparse', False)
+        outputs = func(*args, **kwargs)
+        if not sparse:
+            return outputs
+        tfreq, tmag, tphase = outputs
+        if tfreq.ndim == 3:
+            return [SparseTracks.from_dense(*channel) for channel in zip(tfreq, tmag, tphase)]
+        return SparseTracks.from_dense(tfreq, tmag, tphase)
+
+    return wrapper
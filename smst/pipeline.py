@@ -0,0 +1,242 @@
+"""
+Lazy analysis -> transformation -> synthesis pipelines with memoized stages.
+
+A pipeline is a graph of named nodes. Each node computes its output by a
+function of the outputs of its input nodes and of its own parameters. The
+outputs are computed only when requested and remembered, so changing the
+parameters of a node recomputes only that node and the nodes depending on
+it on the next request.
+
+Example:
+
+>>> p = pipeline.sps_pipeline('sounds/bendir.wav')
+>>> y = p['output']  # computes everything
+>>> p.set('transformed', freqScaling=np.array([0, 1.2, 1, 1.2]))
+>>> y = p['output']  # recomputes only the transformation and the synthesis
+>>> tfreq, tmag, tphase = p['tracks']  # intermediate results are available too
+
+Custom pipelines are built with `Pipeline.add()`:
+
+>>> p = pipeline.Pipeline()
+>>> p.add('sound', audio.read_wav, filename='sounds/piano.wav')
+>>> p.add('spectrogram', stft.from_audio, inputs=dict(x=('sound', 1)), w=w, N=2048, H=256)
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+from scipy.signal import get_window
+
+from .models import sine, sps, stft, stochastic
+from .utils import audio, residual
+
+
+class Node(object):
+    """
+    A stage of a pipeline.
+
+    :param name: name of the node
+    :param func: function computing the output
+    :param inputs: dict of argument name -> input node name, or (input node name, index)
+      to pass only an item of the output of the input node
+    :param params: dict of the other (constant) arguments of func
+    """
+
+    def __init__(self, name, func, inputs=None, params=None):
+        self.name = name
+        self.func = func
+        self.inputs = inputs or {}
+        self.params = params or {}
+        self.output = None
+        self.valid = False
+        self.evaluations = 0  # number of times the output has been computed
+
+    def input_names(self):
+        """Names of the input nodes."""
+        return [source[0] if isinstance(source, tuple) else source for source in self.inputs.values()]
+
+    def __repr__(self):
+        return 'Node(%r, inputs=%r, valid=%r)' % (self.name, self.input_names(), self.valid)
+
+
+class Pipeline(object):
+    """
+    Graph of nodes evaluated lazily with memoized outputs.
+    """
+
+    def __init__(self):
+        self.nodes = OrderedDict()
+
+    def add(self, name, func, inputs=None, **params):
+        """
+        Adds a node (or replaces a node of the same name).
+
+        :param name: name of the node
+        :param func: function computing the output of the node
+        :param inputs: dict of argument name -> input node name or (input node name, index)
+        :param params: other arguments of the function
+        :returns: the node
+        """
+        node = Node(name, func, inputs, params)
+        for input_name in node.input_names():
+            if input_name not in self.nodes:
+                raise ValueError("Unknown input node: %s" % input_name)
+        if name in self.nodes:
+            self.invalidate(name)
+        self.nodes[name] = node
+        return node
+
+    def get(self, name):
+        """Returns the output of a node, computing it and its inputs if needed."""
+        node = self._node(name)
+        if not node.valid:
+            args = dict(node.params)
+            for arg, source in node.inputs.items():
+                if isinstance(source, tuple):
+                    args[arg] = self.get(source[0])[source[1]]
+                else:
+                    args[arg] = self.get(source)
+            node.output = node.func(**args)
+            node.valid = True
+            node.evaluations += 1
+        return node.output
+
+    __getitem__ = get
+
+    def set(self, name, **params):
+        """
+        Changes parameters of a node, the node and its dependent nodes are recomputed on the next request.
+        """
+        node = self._node(name)
+        unknown = set(params) - set(node.params)
+        if unknown:
+            raise ValueError("Unknown parameters of node %s: %s" % (name, ', '.join(sorted(unknown))))
+        node.params.update(params)
+        self.invalidate(name)
+
+    def invalidate(self, name):
+        """Forgets the output of a node and of all nodes depending on it."""
+        self._node(name).valid = False
+        for dependent in self.dependents(name):
+            self.nodes[dependent].valid = False
+
+    def dependents(self, name):
+        """Names of all nodes depending directly or indirectly on a node."""
+        result = []
+        pending = [name]
+        while pending:
+            current = pending.pop()
+            for node in self.nodes.values():
+                if current in node.input_names() and node.name not in result:
+                    result.append(node.name)
+                    pending.append(node.name)
+        return result
+
+    def params(self, name):
+        """Parameters of a node (a copy)."""
+        return dict(self._node(name).params)
+
+    def _node(self, name):
+        if name not in self.nodes:
+            raise ValueError("Unknown node: %s" % name)
+        return self.nodes[name]
+
+    def __contains__(self, name):
+        return name in self.nodes
+
+    def __repr__(self):
+        return 'Pipeline(%s)' % ', '.join(repr(node) for node in self.nodes.values())
+
+
+# -- stages of the standard pipelines --
+
+
+def read_sound(filename):
+    """Reads a sound file, returns (fs, x)."""
+    return audio.read_wav(filename)
+
+
+def analysis_window(window, M):
+    """Analysis window of a given type and size."""
+    return get_window(window, M)
+
+
+def spectrogram(sound, w, N, H):
+    """Magnitude and phase spectrogram of a sound (fs, x), returns (mX, pX)."""
+    return stft.from_audio(sound[1], w, N, H)
+
+
+def spectral_peaks(spectrogram, fs, N, t):
+    """
+    Interpolated spectral peaks of each frame of a spectrogram.
+
+    :returns: list of (ipfreq, ipmag, ipphase) of each frame
+    """
+    mX, pX = spectrogram
+    return list(sine.iterate_spectrogram_peaks(mX, pX, fs, N, t))
+
+
+def sinusoid_tracks(frame_peaks, fs, H, maxnSines=100, minSineDur=.01, freqDevOffset=20, freqDevSlope=0.01):
+    """
+    Tracks sinusoids over the spectral peaks of all frames as `sine.from_audio()` does.
+
+    :returns: tfreq, tmag, tphase
+    """
+    return sine.track_peaks(frame_peaks, fs, H, maxnSines, minSineDur, freqDevOffset, freqDevSlope)
+
+
+def sinusoid_residual(sound, tracks, Ns, H):
+    """Residual of a sound (fs, x) after subtracting the sinusoidal tracks."""
+    fs, x = sound
+    return residual.subtract_sinusoids(x, Ns, H, tracks[0], tracks[1], tracks[2], fs)
+
+
+def stochastic_envelope(residual, H, stocf):
+    """Stochastic envelope of a residual."""
+    return stochastic.from_audio(residual, H, H * 2, stocf)
+
+
+def scale_sinusoids(tracks, stocEnv, freqScaling, timeScaling):
+    """
+    Scales the sinusoidal tracks in frequency and the tracks with the stochastic envelope in time.
+
+    :returns: tfreq, tmag, stocEnv
+    """
+    tfreq, tmag = sine.scale_frequencies(tracks[0], freqScaling), tracks[1]
+    tfreq, tmag = sine.scale_time(tfreq, tmag, timeScaling)
+    stocEnv = stochastic.scale_time(stocEnv, timeScaling)
+    return tfreq, tmag, stocEnv
+
+
+def sps_synthesis(transformed, sound, Ns, H):
+    """Synthesizes the transformed sinusoidal and stochastic model, returns the output sound."""
+    tfreq, tmag, stocEnv = transformed
+    y, _, _ = sps.to_audio(tfreq, tmag, np.array([]), stocEnv, Ns, H, sound[0])
+    return y
+
+
+def sps_pipeline(filename, window='hamming', M=2001, N=2048, H=128, t=-80, maxnSines=150, minSineDur=0.02,
+                 freqDevOffset=10, freqDevSlope=0.001, stocf=0.2, Ns=512,
+                 freqScaling=np.array([0, 1, 1, 1]), timeScaling=np.array([0, 0, 1, 1])):
+    """
+    Pipeline of the sinusoidal plus stochastic model analysis, transformation and synthesis.
+
+    Nodes: sound, window, spectrogram, peaks, tracks, residual, stochastic, transformed, output.
+    The parameters are the same as of `sps.from_audio()`, `sine.scale_frequencies()`
+    and `sine.scale_time()`.
+
+    :returns: Pipeline
+    """
+    p = Pipeline()
+    p.add('sound', read_sound, filename=filename)
+    p.add('window', analysis_window, window=window, M=M)
+    p.add('spectrogram', spectrogram, inputs=dict(sound='sound', w='window'), N=N, H=H)
+    p.add('peaks', spectral_peaks, inputs=dict(spectrogram='spectrogram', fs=('sound', 0)), N=N, t=t)
+    p.add('tracks', sinusoid_tracks, inputs=dict(frame_peaks='peaks', fs=('sound', 0)), H=H,
+          maxnSines=maxnSines, minSineDur=minSineDur, freqDevOffset=freqDevOffset, freqDevSlope=freqDevSlope)
+    p.add('residual', sinusoid_residual, inputs=dict(sound='sound', tracks='tracks'), Ns=Ns, H=H)
+    p.add('stochastic', stochastic_envelope, inputs=dict(residual='residual'), H=H, stocf=stocf)
+    p.add('transformed', scale_sinusoids, inputs=dict(tracks='tracks', stocEnv='stochastic'),
+          freqScaling=freqScaling, timeScaling=timeScaling)
+    p.add('output', sps_synthesis, inputs=dict(transformed='transformed', sound='sound'), Ns=Ns, H=H)
+    return p
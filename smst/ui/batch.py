@@ -0,0 +1,273 @@
+"""
+Batch analysis of many sound files with one model in a pool of worker processes.
+
+Example:
+
+$ smst-batch sine sounds/ -o analysis/ -p t=-90 -p maxnSines=50 -j 4
+
+Each input file is analyzed with the selected model and its outputs
+(eg. frequencies, magnitudes and phases of the sinusoidal tracks) are stored
+into the output directory using `smst.models.storage`, one analysis
+directory per sound. The default parameters of each model are the same as
+in the demo modules in `smst.ui.models`.
+"""
+
+from __future__ import print_function
+import argparse
+from collections import OrderedDict
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+import numpy as np
+
+from ..models import harmonic, hpr, hps, sine, spr, sps, stft, stochastic, storage
+from ..utils import audio
+from ..utils.files import find_sound_files
+from ..utils.window import get_window
+
+
+def analyze_stft(x, fs, p):
+    w = get_window(p['window'], p['M'])
+    mX, pX = stft.from_audio(x, w, p['N'], p['H'])
+    return OrderedDict([('mX', mX), ('pX', pX)])
+
+
+def analyze_sine(x, fs, p):
+    w = get_window(p['window'], p['M'])
+    tfreq, tmag, tphase = sine.from_audio(
+        x, fs, w, p['N'], p['H'], p['t'], p['maxnSines'], p['minSineDur'], p['freqDevOffset'], p['freqDevSlope'])
+    return OrderedDict([('tfreq', tfreq), ('tmag', tmag), ('tphase', tphase)])
+
+
+def analyze_harmonic(x, fs, p):
+    w = get_window(p['window'], p['M'])
+    hfreq, hmag, hphase = harmonic.from_audio(
+        x, fs, w, p['N'], p['H'], p['t'], p['nH'], p['minf0'], p['maxf0'], p['f0et'], p['harmDevSlope'],
+        p['minSineDur'])
+    return OrderedDict([('hfreq', hfreq), ('hmag', hmag), ('hphase', hphase)])
+
+
+def analyze_stochastic(x, fs, p):
+    stocEnv = stochastic.from_audio(x, p['H'], p['N'], p['stocf'])
+    return OrderedDict([('stocEnv', stocEnv)])
+
+
+def analyze_hps(x, fs, p):
+    w = get_window(p['window'], p['M'])
+    hfreq, hmag, hphase, stocEnv = hps.from_audio(
+        x, fs, w, p['N'], p['H'], p['t'], p['nH'], p['minf0'], p['maxf0'], p['f0et'], p['harmDevSlope'],
+        p['minSineDur'], p['Ns'], p['stocf'])
+    return OrderedDict([('hfreq', hfreq), ('hmag', hmag), ('hphase', hphase), ('stocEnv', stocEnv)])
+
+
+def analyze_hpr(x, fs, p):
+    w = get_window(p['window'], p['M'])
+    hfreq, hmag, hphase, xr = hpr.from_audio(
+        x, fs, w, p['N'], p['H'], p['t'], p['minSineDur'], p['nH'], p['minf0'], p['maxf0'], p['f0et'],
+        p['harmDevSlope'])
+    return OrderedDict([('hfreq', hfreq), ('hmag', hmag), ('hphase', hphase), ('xr', xr)])
+
+
+def analyze_sps(x, fs, p):
+    w = get_window(p['window'], p['M'])
+    tfreq, tmag, tphase, stocEnv = sps.from_audio(
+        x, fs, w, p['N'], p['H'], p['t'], p['minSineDur'], p['maxnSines'], p['freqDevOffset'], p['freqDevSlope'],
+        p['stocf'])
+    return OrderedDict([('tfreq', tfreq), ('tmag', tmag), ('tphase', tphase), ('stocEnv', stocEnv)])
+
+
+def analyze_spr(x, fs, p):
+    w = get_window(p['window'], p['M'])
+    tfreq, tmag, tphase, xr = spr.from_audio(
+        x, fs, w, p['N'], p['H'], p['t'], p['minSineDur'], p['maxnSines'], p['freqDevOffset'], p['freqDevSlope'])
+    return OrderedDict([('tfreq', tfreq), ('tmag', tmag), ('tphase', tphase), ('xr', xr)])
+
+
+_sine_params = dict(window='hamming', M=2001, N=2048, H=128, t=-80, minSineDur=0.02, maxnSines=150,
+                    freqDevOffset=10, freqDevSlope=0.001)
+_harmonic_params = dict(window='blackman', M=1201, N=2048, H=128, t=-90, minSineDur=0.1, nH=100,
+                        minf0=130, maxf0=300, f0et=7, harmDevSlope=0.01)
+
+# model name -> (analysis function, default parameters)
+models = OrderedDict([
+    ('stft', (analyze_stft, dict(window='hamming', M=1024, N=1024, H=512))),
+    ('sine', (analyze_sine, _sine_params)),
+    ('harmonic', (analyze_harmonic, _harmonic_params)),
+    ('stochastic', (analyze_stochastic, dict(H=256, N=512, stocf=0.1))),
+    ('hps', (analyze_hps, dict(_harmonic_params, Ns=512, stocf=0.1))),
+    ('hpr', (analyze_hpr, _harmonic_params)),
+    ('sps', (analyze_sps, dict(_sine_params, stocf=0.2))),
+    ('spr', (analyze_spr, _sine_params)),
+])
+
+
+def model_params(model, params=None):
+    """
+    Returns the default parameters of a model updated with the given ones.
+
+    :param model: model name (key in `models`)
+    :param params: dict of parameters overriding the defaults
+    :returns: dict of all parameters for the model
+    """
+    if model not in models:
+        raise ValueError("Unknown model: %s (available: %s)" % (model, ', '.join(models)))
+    defaults = models[model][1]
+    params = params or {}
+    unknown = set(params) - set(defaults)
+    if unknown:
+        raise ValueError("Unknown parameters of model %s: %s" % (model, ', '.join(sorted(unknown))))
+    all_params = dict(defaults)
+    all_params.update(params)
+    return all_params
+
+
+def output_path(output_dir, name, model):
+    return os.path.join(output_dir, '%s_%s' % (os.path.splitext(name)[0], model))
+
+
+def analyze_file(task):
+    """
+    Analyzes a single file, to be run in a worker process.
+
+    :param task: tuple (input file, output path, model name, model parameters, storage options)
+    :returns: tuple (input file, audio duration in seconds, analysis time in seconds, error message or None)
+    """
+    input_file, output_file, model, params, storage_options = task
+    start = time.time()
+    duration = 0.0
+    try:
+        fs, x = audio.read_wav(input_file)
+        duration = x.shape[-1] / float(fs)
+        outputs = models[model][0](x, fs, params)
+        storage.save(output_file, model, outputs, params=dict(params, fs=fs), **storage_options)
+    except Exception as e:
+        return input_file, duration, time.time() - start, '%s: %s' % (type(e).__name__, e)
+    return input_file, duration, time.time() - start, None
+
+
+def run(model, inputs, output_dir, params=None, workers=None, skip_existing=False, verbose=False,
+        dtype=np.float32, compress=False):
+    """
+    Analyzes sound files with a model in a pool of worker processes.
+
+    :param model: model name (key in `models`)
+    :param inputs: paths to sound files or directories
+    :param output_dir: directory where to store the model outputs
+    :param params: dict of model parameters overriding the defaults
+    :param workers: number of worker processes (default: number of CPUs)
+    :param skip_existing: do not analyze files whose output already exists
+    :param verbose: print a line for each analyzed file
+    :param dtype: float dtype of the stored outputs
+    :param compress: store the outputs compressed
+    :returns: dict of statistics about the run
+    """
+    params = model_params(model, params)
+    storage_options = dict(dtype=dtype, compress=compress)
+    tasks = []
+    for input_file, name in find_sound_files(inputs):
+        output_file = output_path(output_dir, name, model)
+        if skip_existing and os.path.isdir(output_file):
+            continue
+        tasks.append((input_file, output_file, model, params, storage_options))
+
+    workers = workers or multiprocessing.cpu_count()
+    start = time.time()
+    results = []
+    if workers == 1:
+        result_iter = (analyze_file(task) for task in tasks)
+    else:
+        pool = multiprocessing.Pool(workers)
+        result_iter = pool.imap_unordered(analyze_file, tasks)
+    try:
+        for result in result_iter:
+            input_file, duration, elapsed, error = result
+            if error is not None:
+                print('FAILED %s - %s' % (input_file, error), file=sys.stderr)
+            elif verbose:
+                print('%s - %.2f s of audio in %.2f s' % (input_file, duration, elapsed))
+            results.append(result)
+    finally:
+        if workers != 1:
+            pool.close()
+            pool.join()
+    wall_time = time.time() - start
+
+    succeeded = [r for r in results if r[3] is None]
+    audio_duration = sum(r[1] for r in succeeded)
+    cpu_time = sum(r[2] for r in results)
+    return OrderedDict([
+        ('model', model),
+        ('workers', workers),
+        ('files', len(tasks)),
+        ('failed', len(results) - len(succeeded)),
+        ('audio_seconds', audio_duration),
+        ('wall_seconds', wall_time),
+        ('worker_seconds', cpu_time),
+        ('files_per_second', len(results) / wall_time if wall_time > 0 else 0.0),
+        ('realtime_factor', audio_duration / wall_time if wall_time > 0 else 0.0),
+    ])
+
+
+def print_stats(stats):
+    print('model: %(model)s, workers: %(workers)d' % stats)
+    print('files: %(files)d (failed: %(failed)d)' % stats)
+    print('audio: %(audio_seconds).1f s, wall time: %(wall_seconds).1f s, worker time: %(worker_seconds).1f s' % stats)
+    print('throughput: %(files_per_second).2f files/s, %(realtime_factor).1fx realtime' % stats)
+
+
+def parse_param(text):
+    """Parses a key=value parameter, the value is parsed as JSON if possible."""
+    if '=' not in text:
+        raise argparse.ArgumentTypeError("Parameter must be in the form key=value: %s" % text)
+    key, value = text.split('=', 1)
+    try:
+        value = json.loads(value)
+    except ValueError:
+        pass  # keep as string, eg. window=hanning
+    return key, value
+
+
+def parse_args(args=None):
+    parser = argparse.ArgumentParser(description='Batch analysis of sound files with one of the models')
+    parser.add_argument('model', choices=list(models), help='model to use')
+    parser.add_argument('inputs', nargs='*', help='sound files or directories (searched recursively)')
+    parser.add_argument('-l', '--file-list', help='text file with paths of the input files, one per line')
+    parser.add_argument('-o', '--output-dir', default='output_analysis', help='directory for the model outputs')
+    parser.add_argument('-p', '--param', type=parse_param, action='append', default=[],
+                        help='model parameter key=value (eg. -p t=-90 -p window=hanning)')
+    parser.add_argument('--params', help='JSON file with model parameters')
+    parser.add_argument('--dtype', choices=['float64', 'float32', 'float16'], default='float32',
+                        help='float precision of the stored outputs')
+    parser.add_argument('--compress', action='store_true', help='compress the stored outputs')
+    parser.add_argument('-j', '--workers', type=int, default=None, help='number of worker processes')
+    parser.add_argument('--skip-existing', action='store_true', help='skip files that were already analyzed')
+    parser.add_argument('-v', '--verbose', action='store_true', help='print each analyzed file')
+    return parser.parse_args(args)
+
+
+def main():
+    args = parse_args()
+    params = {}
+    if args.params:
+        with open(args.params) as file:
+            params.update(json.load(file))
+    params.update(dict(args.param))
+    inputs = list(args.inputs)
+    if args.file_list:
+        with open(args.file_list) as file:
+            inputs.extend(line.strip() for line in file if line.strip())
+    if not inputs:
+        print('No input files given', file=sys.stderr)
+        sys.exit(1)
+    stats = run(args.model, inputs, args.output_dir, params, args.workers, args.skip_existing, args.verbose,
+                np.dtype(args.dtype), args.compress)
+    print_stats(stats)
+    if stats['failed'] > 0:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
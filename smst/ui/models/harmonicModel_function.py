@@ -18,7 +18,7 @@ def main(inputFile=demo_sound_path('vignesh.wav'), window='blackman', M=1201, N=
     Analysis and synthesis using the harmonic model
     inputFile: input sound file (monophonic with sampling rate of 44100)
     window: analysis window type (rectangular, hanning, hamming, blackman, blackmanharris)
-    M: analysis window size; N: fft size (power of two, bigger or equal than M)
+    M: analysis window size; N: fft size (even with prime factors 2, 3 and 5 only, eg. utils.math.next_fast_size(M))
     t: magnitude threshold of spectral peaks; minSineDur: minimum duration of sinusoidal tracks
     nH: maximum number of harmonics; minf0: minimum fundamental frequency in sound
     maxf0: maximum fundamental frequency in sound; f0et: maximum error accepted in f0 detection algorithm
@@ -32,7 +32,7 @@ def main(inputFile=demo_sound_path('vignesh.wav'), window='blackman', M=1201, N=
     H = 128
 
     # read input sound
-    (fs, x) = audio.read_wav(inputFile)
+    (fs, x) = audio.read_wav(inputFile, mono=True)
 
     # compute analysis window
     w = get_window(window, M)
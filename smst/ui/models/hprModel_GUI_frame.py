@@ -58,7 +58,7 @@ class HprModelFrame:
         self.M.insert(0, "601")
 
         # FFT SIZE
-        N_label = "FFT size (N) (power of two bigger than M):"
+        N_label = "FFT size (N) (even, prime factors 2, 3, 5, at least M):"
         Label(self.parent, text=N_label).grid(row=4, column=0, sticky=W, padx=5, pady=(10, 2))
         self.N = Entry(self.parent, justify=CENTER)
         self.N["width"] = 5
@@ -19,12 +19,12 @@ def main(inputFile=demo_sound_path('piano.wav'), window='hamming', M=1024, N=102
     inputFile: input sound file (monophonic with sampling rate of 44100)
     window: analysis window type (choice of rectangular, hanning, hamming, blackman, blackmanharris)
     M: analysis window size
-    N: fft size (power of two, bigger or equal than M)
+    N: fft size (even with prime factors 2, 3 and 5 only, eg. utils.math.next_fast_size(M))
     H: hop size (at least 1/2 of analysis window size to have good overlap-add)
     """
 
     # read input sound (monophonic with sampling rate of 44100)
-    fs, x = audio.read_wav(inputFile)
+    fs, x = audio.read_wav(inputFile, mono=True)
 
     # compute analysis window
     w = get_window(window, M)
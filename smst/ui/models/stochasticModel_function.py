@@ -20,7 +20,7 @@ def main(inputFile=demo_sound_path('ocean.wav'), H=256, N=512, stocf=.1,
     """
 
     # read input sound
-    (fs, x) = audio.read_wav(inputFile)
+    (fs, x) = audio.read_wav(inputFile, mono=True)
 
     # compute stochastic model
     stocEnv = stochastic.from_audio(x, H, N, stocf)
@@ -20,7 +20,7 @@ def analysis(inputFile=demo_sound_path('vignesh.wav'), window='blackman', M=1201
     inputFile: input sound file (monophonic with sampling rate of 44100)
     window: analysis window type (rectangular, hanning, hamming, blackman, blackmanharris)
     M: analysis window size
-    N: fft size (power of two, bigger or equal than M)
+    N: fft size (even with prime factors 2, 3 and 5 only, eg. utils.math.next_fast_size(M))
     t: magnitude threshold of spectral peaks
     minSineDur: minimum duration of sinusoidal tracks
     nH: maximum number of harmonics
@@ -39,7 +39,7 @@ def analysis(inputFile=demo_sound_path('vignesh.wav'), window='blackman', M=1201
     H = 128
 
     # read input sound
-    fs, x = audio.read_wav(inputFile)
+    fs, x = audio.read_wav(inputFile, mono=True)
 
     # compute analysis window
     w = get_window(window, M)
@@ -101,7 +101,7 @@ def analysis(inputFile=demo_sound_path('vignesh.wav'), window='blackman', M=1201
 def transformation_synthesis(inputFile, fs, hfreq, hmag, freqScaling=np.array([0, 2.0, 1, .3]),
                              freqStretching=np.array([0, 1, 1, 1.5]), timbrePreservation=1,
                              timeScaling=np.array([0, .0, .671, .671, 1.978, 1.978 + 1.0]),
-                             interactive=True, plotFile=False):
+                             interactive=True, plotFile=False, synthesisCache=None):
     """
     Transform the analysis values returned by the analysis function and synthesize the sound
     inputFile: name of input file
@@ -111,6 +111,9 @@ def transformation_synthesis(inputFile, fs, hfreq, hmag, freqScaling=np.array([0
     freqStretchig: frequency stretching factors, in time-value pairs
     timbrePreservation: 1 preserves original timbre, 0 it does not
     timeScaling: time scaling factors, in time-value pairs
+    synthesisCache: optional synthesis_cache.SynthesisCache(512, 128, fs) kept between calls,
+      the frames before the first one changed since the previous call are not synthesized again
+      (the phases are propagated, so the frames after a change are synthesized again too)
     """
 
     # size of fft used in synthesis
@@ -126,7 +129,10 @@ def transformation_synthesis(inputFile, fs, hfreq, hmag, freqScaling=np.array([0
     yhfreq, yhmag = sine.scale_time(yhfreq, yhmag, timeScaling)
 
     # synthesis
-    y = sine.to_audio(yhfreq, yhmag, np.array([]), Ns, H, fs)
+    if synthesisCache is not None:
+        y = synthesisCache.render(yhfreq, yhmag, np.array([]))
+    else:
+        y = sine.to_audio(yhfreq, yhmag, np.array([]), Ns, H, fs)
 
     # write output sound
     outputFile = 'output_sounds/' + strip_file(inputFile) + '_harmonicModelTransformation.wav'
@@ -21,7 +21,7 @@ def analysis(inputFile1=demo_sound_path('violin-B3.wav'), window1='blackman', M1
     inputFile: input sound file (monophonic with sampling rate of 44100)
     window: analysis window type (rectangular, hanning, hamming, blackman, blackmanharris)
     M: analysis window size
-    N: fft size (power of two, bigger or equal than M)
+    N: fft size (even with prime factors 2, 3 and 5 only, eg. utils.math.next_fast_size(M))
     t: magnitude threshold of spectral peaks
     minSineDur: minimum duration of sinusoidal tracks
     nH: maximum number of harmonics
@@ -39,8 +39,8 @@ def analysis(inputFile1=demo_sound_path('violin-B3.wav'), window1='blackman', M1
     # hop size (has to be 1/4 of Ns)
     H = 128
     # read input sounds
-    (fs1, x1) = audio.read_wav(inputFile1)
-    (fs2, x2) = audio.read_wav(inputFile2)
+    (fs1, x1) = audio.read_wav(inputFile1, mono=True)
+    (fs2, x2) = audio.read_wav(inputFile2, mono=True)
     # compute analysis windows
     w1 = get_window(window1, M1)
     w2 = get_window(window2, M2)
@@ -19,7 +19,7 @@ def analysis(inputFile=demo_sound_path('mridangam.wav'), window='hamming', M=801
     Analyze a sound with the sine model
     inputFile: input sound file (monophonic with sampling rate of 44100)
     window: analysis window type (rectangular, hanning, hamming, blackman, blackmanharris)
-    M: analysis window size; N: fft size (power of two, bigger or equal than M)
+    M: analysis window size; N: fft size (even with prime factors 2, 3 and 5 only, eg. utils.math.next_fast_size(M))
     t: magnitude threshold of spectral peaks; minSineDur: minimum duration of sinusoidal tracks
     maxnSines: maximum number of parallel sinusoids
     freqDevOffset: frequency deviation allowed in the sinusoids from frame to frame at frequency 0
@@ -35,7 +35,7 @@ def analysis(inputFile=demo_sound_path('mridangam.wav'), window='hamming', M=801
     H = 128
 
     # read input sound
-    (fs, x) = audio.read_wav(inputFile)
+    (fs, x) = audio.read_wav(inputFile, mono=True)
 
     # compute analysis window
     w = get_window(window, M)
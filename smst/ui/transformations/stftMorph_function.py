@@ -28,8 +28,8 @@ def main(inputFile1=demo_sound_path('ocean.wav'), inputFile2=demo_sound_path('sp
     """
 
     # read input sounds
-    (fs, x1) = audio.read_wav(inputFile1)
-    (fs, x2) = audio.read_wav(inputFile2)
+    (fs, x1) = audio.read_wav(inputFile1, mono=True)
+    (fs, x2) = audio.read_wav(inputFile2, mono=True)
 
     # compute analysis windows
     w1 = get_window(window1, M1)
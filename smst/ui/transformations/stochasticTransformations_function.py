@@ -24,7 +24,7 @@ def main(inputFile=demo_sound_path('rain.wav'), stocf=0.1, timeScaling=np.array(
     H = 128
 
     # read input sound
-    (fs, x) = audio.read_wav(inputFile)
+    (fs, x) = audio.read_wav(inputFile, mono=True)
 
     # perform stochastic analysis
     mYst = stochastic.from_audio(x, H, H * 2, stocf)
@@ -1,5 +1,5 @@
-import copy
 import os
+import struct
 import subprocess
 import sys
 
@@ -18,37 +18,227 @@ if sys.platform == "win32":
         print "You won't be able to play sounds, winsound could not be imported"
 
 INT16_FAC = (2 ** 15) - 1
+INT24_FAC = (2 ** 23) - 1
 INT32_FAC = (2 ** 31) - 1
 INT64_FAC = (2 ** 63) - 1
-norm_fact = {'int16': INT16_FAC, 'int32': INT32_FAC, 'int64': INT64_FAC, 'float32': 1.0, 'float64': 1.0}
+norm_fact = {'int16': INT16_FAC, 'int24': INT24_FAC, 'int32': INT32_FAC, 'int64': INT64_FAC,
+             'float32': 1.0, 'float64': 1.0}
 
 
-def read_wav(filename):
+def read_wav(filename, mono=False):
     """
     Reads a sound file and converts it to a normalized floating point array.
 
+    Files with any sampling rate and number of channels are supported.
+    The samples of multichannel files are returned in an array of shape
+    (channels, samples) which can be analyzed by the models at once
+    (the models with a residual only analyze mono sounds).
+
     :param filename: name of file to read
+    :param mono: mix the channels of a multichannel file down to a mono sound
     :returns:
       - fs: sampling rate of file
-      - x: floating point array
+      - x: floating point array of shape (samples,) for mono files and (channels, samples) otherwise
     """
 
     if not os.path.isfile(filename):  # raise error if wrong input file
         raise ValueError("Input file is wrong")
 
-    fs, x = read(filename)
-
-    if len(x.shape) != 1:  # raise error if more than one channel
-        raise ValueError("Audio file should be mono")
-
-    if fs != 44100:  # raise error if more than one channel
-        raise ValueError("Sampling rate of input sound should be 44100")
+    fs, x, sample_format = read_pcm(filename)
 
     # scale down and convert audio into floating point number in range of -1 to 1
-    x = np.float32(x) / norm_fact[x.dtype.name]
+    x = to_float(x[:].T, sample_format)
+    if mono and x.ndim > 1:
+        x = np.mean(x, axis=0)
     return fs, x
 
 
+def to_float(x, sample_format=None):
+    """
+    Converts PCM samples to a normalized float32 array in range of -1 to 1.
+
+    :param x: integer or floating point samples
+    :param sample_format: key of norm_fact (default: the dtype of x, int24 samples come as int32)
+    :returns: float32 array (a new one, the input is never modified)
+    """
+    sample_format = sample_format or x.dtype.name
+    if sample_format not in norm_fact:
+        raise ValueError("Unsupported sample format: %s" % sample_format)
+    y = x.astype(np.float32, order='C')
+    y /= norm_fact[sample_format]
+    return y
+
+
+def read_pcm(filename, mmap=False):
+    """
+    Reads the samples of a WAV file without conversion.
+
+    scipy.io.wavfile does not read 24-bit PCM, such files are decoded here.
+
+    :param filename: name of file to read
+    :param mmap: memory-map the samples instead of loading them
+    :returns: fs, data, sample_format - data of shape (samples,) or (samples, channels)
+      (Int24Samples for 24-bit files, decoded to int32 by slicing) and its key of norm_fact
+    """
+    with open(filename, 'rb') as f:
+        header = _read_pcm24_header(f)
+    if header is None:
+        fs, data = read(filename, mmap=mmap)
+        return fs, data, data.dtype.name
+    fs, channels, offset, size = header
+    frames = size // (3 * channels)
+    if mmap:
+        raw = np.memmap(filename, dtype=np.uint8, mode='r', offset=offset, shape=(frames, channels, 3))
+    else:
+        with open(filename, 'rb') as f:
+            f.seek(offset)
+            raw = np.fromfile(f, dtype=np.uint8, count=frames * channels * 3).reshape(frames, channels, 3)
+    return fs, Int24Samples(raw), 'int24'
+
+
+class Int24Samples(object):
+    """
+    24-bit PCM samples decoded to int32 on slicing (eg. of a memory-mapped file).
+
+    :param raw: uint8 array of shape (samples, channels, 3) with little-endian samples
+    """
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.shape = raw.shape[:1] if raw.shape[1] == 1 else raw.shape[:2]
+        self.ndim = len(self.shape)
+
+    def __getitem__(self, index):
+        raw = np.asarray(self.raw[index])
+        samples = (raw[..., 0].astype(np.int32) | (raw[..., 1].astype(np.int32) << 8) |
+                   (raw[..., 2].astype(np.int8).astype(np.int32) << 16))  # sign from the highest byte
+        return samples[..., 0] if self.ndim == 1 else samples
+
+
+def _read_pcm24_header(f):
+    """
+    Parses the chunks of a WAV file.
+
+    :returns: (fs, channels, data offset, data size) for 24-bit PCM files, None for other files
+    """
+    riff = f.read(12)
+    if len(riff) < 12 or riff[:4] != b'RIFF' or riff[8:] != b'WAVE':
+        return None
+    fmt = None
+    while True:
+        chunk = f.read(8)
+        if len(chunk) < 8:
+            return None
+        chunk_id, chunk_size = chunk[:4], struct.unpack('<I', chunk[4:])[0]
+        if chunk_id == b'fmt ':
+            fmt = f.read(chunk_size)
+            f.seek(chunk_size % 2, 1)
+        elif chunk_id == b'data':
+            break
+        else:
+            f.seek(chunk_size + chunk_size % 2, 1)
+    if fmt is None:
+        return None
+    format_tag, channels, fs = struct.unpack('<HHI', fmt[:8])
+    bits = struct.unpack('<H', fmt[14:16])[0]
+    if format_tag == 0xFFFE and len(fmt) >= 26:  # WAVE_FORMAT_EXTENSIBLE, the format tag in the subformat
+        format_tag = struct.unpack('<H', fmt[24:26])[0]
+    if format_tag != 1 or bits != 24:
+        return None
+    return fs, channels, f.tell(), chunk_size
+
+
+class WavReader(object):
+    """
+    Reader of a WAV file which memory-maps the samples instead of loading them.
+
+    Samples are converted to normalized floating point only for the requested
+    blocks or frames, so even very long files can be processed in a small
+    amount of memory.
+
+    Example:
+
+    >>> with WavReader('long.wav') as reader:
+    ...     for block in reader.blocks(44100):
+    ...         process(block)
+
+    :param filename: name of file to read
+    """
+
+    def __init__(self, filename):
+        if not os.path.isfile(filename):  # raise error if wrong input file
+            raise ValueError("Input file is wrong")
+        self.filename = filename
+        self.fs, self._data, self._sample_format = read_pcm(filename, mmap=True)
+        self.length = self._data.shape[0]  # number of samples per channel
+        self.channels = 1 if self._data.ndim == 1 else self._data.shape[1]
+
+    def __len__(self):
+        return self.length
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Releases the memory-mapped file."""
+        self._data = None
+
+    def read(self, start=0, count=None):
+        """
+        Reads a range of samples, zero-padded where it is outside of the file.
+
+        :param start: index of the first sample (may be negative)
+        :param count: number of samples (default: until the end of the file)
+        :returns: x: float32 array of normalized samples, of shape (count,) for mono files
+          and (channels, count) for multichannel files
+        """
+        if count is None:
+            count = self.length - start
+        stop = start + count
+        data = self._data[max(start, 0):max(min(stop, self.length), 0)]
+        x = to_float(data.T, self._sample_format)
+        if start < 0 or stop > self.length:  # pad the parts outside of the file with zeros
+            padded = np.zeros(x.shape[:-1] + (count,), dtype=np.float32)
+            offset = max(-start, 0)
+            padded[..., offset:offset + x.shape[-1]] = x
+            x = padded
+        return x
+
+    def read_frame(self, center, hM1, hM2):
+        """
+        Reads an analysis frame of size hM1 + hM2 centered at a sample.
+
+        The frame centered at sample l * H is the same as the l-th frame selected
+        by `stft.iterate_analysis_frames()` from the sound padded by `stft.pad_signal()`.
+
+        :param center: index of the sample in the center of the frame
+        :param hM1: half analysis window size by rounding
+        :param hM2: half analysis window size by floor
+        :returns: frame of normalized samples
+        """
+        return self.read(center - hM2, hM1 + hM2)
+
+    def blocks(self, block_size, overlap=0):
+        """
+        Iterates over consecutive blocks of normalized samples.
+
+        :param block_size: number of samples in a block (the last one may be shorter)
+        :param overlap: number of samples shared by consecutive blocks
+        :returns: generator of float32 arrays
+        """
+        if block_size <= overlap:
+            raise ValueError("Block size must be bigger than the overlap")
+        start = 0
+        while start < self.length:
+            yield self.read(start, min(block_size, self.length - start))
+            if start + block_size >= self.length:
+                break
+            start += block_size - overlap
+
+
 def play_wav(filename):
     """
     Plays a wav audio file from system using OS calls.
@@ -74,20 +264,122 @@ def play_wav(filename):
             print("Platform not recognized")
 
 
-def write_wav(y, fs, filename):
+def write_wav(y, fs, filename, sample_format='int16'):
     """
     Writes a sound file from an array with the sound and the sampling rate.
     Creates the directory for the file if it does not exist.
 
-    :param y: floating point array of one dimension
+    :param y: floating point array of shape (samples,) or (channels, samples)
     :param fs: sampling rate
     :param filename: name of file to create (can be a path)
+    :param sample_format: int16, int24 or float32
+    """
+    channels = 1 if y.ndim == 1 else y.shape[0]
+    with WavWriter(filename, fs, channels, sample_format) as writer:
+        writer.write(y)
+
+
+class WavWriter(object):
+    """
+    Writer of a WAV file which appends blocks of samples to the open file.
+
+    The blocks of floating point samples are clipped to the range of -1 to 1,
+    optionally dithered and converted to the output sample format. The sizes
+    in the header are patched when the file is closed, so the whole sound never
+    needs to be in memory.
+
+    Example:
+
+    >>> with WavWriter('long.wav', 44100, sample_format='int24', dither=True) as writer:
+    ...     for block in blocks:
+    ...         writer.write(block)
+
+    :param filename: name of file to create (can be a path)
+    :param fs: sampling rate
+    :param channels: number of channels
+    :param sample_format: int16, int24 or float32
+    :param dither: add triangular dither of one quantization step before rounding to integers
+    :param seed: seed of the dither noise generator
     """
 
-    dir = os.path.dirname(filename)
-    ensure_directory(dir)
+    # sample format -> (WAVE format tag, bytes per sample, integer scaling factor)
+    formats = {
+        'int16': (1, 2, INT16_FAC),
+        'int24': (1, 3, INT24_FAC),
+        'float32': (3, 4, None),
+    }
+
+    def __init__(self, filename, fs, channels=1, sample_format='int16', dither=False, seed=None):
+        if sample_format not in self.formats:
+            raise ValueError("Unsupported sample format: %s (available: %s)" % (
+                sample_format, ', '.join(sorted(self.formats))))
+        if channels < 1:
+            raise ValueError("Number of channels must be positive")
+        ensure_directory(os.path.dirname(filename))
+        self.filename = filename
+        self.fs = fs
+        self.channels = channels
+        self.sample_format = sample_format
+        self.dither = dither
+        self.length = 0  # number of written samples per channel
+        self._format_tag, self._sample_width, self._scale = self.formats[sample_format]
+        self._random = np.random.RandomState(seed)
+        self._file = open(filename, 'wb')
+        self._write_header(0)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def write(self, block):
+        """
+        Appends a block of samples.
+
+        :param block: floating point array of shape (samples,) for mono files
+          and (channels, samples) for multichannel files
+        """
+        block = np.asarray(block)
+        if block.ndim == 1:
+            block = block[np.newaxis, :]
+        if block.shape[0] != self.channels:
+            raise ValueError("Block has %d channels, the file has %d" % (block.shape[0], self.channels))
+        samples = np.ascontiguousarray(np.clip(block, -1, 1).T)  # interleaved channels
+        if self._scale is None:
+            data = samples.astype('<f4')
+        else:
+            samples = samples * self._scale  # scaling floating point -1 to 1 range signal to integer range
+            if self.dither:
+                samples += self._random.random_sample(samples.shape) - self._random.random_sample(samples.shape)
+                np.clip(samples, -self._scale, self._scale, out=samples)
+                np.round(samples, out=samples)  # truncation would bias the dithered values towards zero
+            data = samples.astype('<i4')
+            if self._sample_width == 2:
+                data = data.astype('<i2')
+            else:
+                data = data.view(np.uint8).reshape(-1, 4)[:, :3]  # lowest three bytes of each sample
+        self._file.write(np.ascontiguousarray(data).tobytes())
+        self.length += block.shape[1]
+
+    def close(self):
+        """Patches the header with the final sizes and closes the file."""
+        if self._file is None:
+            return
+        data_size = self.length * self.channels * self._sample_width
+        if data_size % 2 == 1:
+            self._file.write(b'\x00')  # chunks are aligned to two bytes
+        self._file.seek(0)
+        self._write_header(data_size)
+        self._file.close()
+        self._file = None
 
-    x = copy.deepcopy(y)  # copy array
-    x *= INT16_FAC  # scaling floating point -1 to 1 range signal to int16 range
-    x = np.int16(x)  # converting to int16 type
-    write(filename, fs, x)
+    def _write_header(self, data_size):
+        block_align = self.channels * self._sample_width
+        self._file.write(b'RIFF')
+        self._file.write(struct.pack('<I', 36 + data_size + data_size % 2))
+        self._file.write(b'WAVEfmt ')
+        self._file.write(struct.pack('<IHHIIHH', 16, self._format_tag, self.channels, self.fs,
+                                     self.fs * block_align, block_align, 8 * self._sample_width))
+        self._file.write(b'data')
+        self._file.write(struct.pack('<I', data_size))
@@ -0,0 +1,101 @@
+"""
+Small in-memory LRU cache used to reuse setup values (windows, FFT plans)
+across calls of the models.
+"""
+
+from collections import OrderedDict
+import functools
+import threading
+
+
+class LRUCache(object):
+    """
+    Mapping with a bounded number of items. When full, the least recently
+    used item is evicted.
+
+    :param maxsize: maximum number of items kept in the cache
+    """
+
+    def __init__(self, maxsize=32):
+        if maxsize <= 0:
+            raise ValueError("Cache size (maxsize) smaller or equal to 0")
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._items.pop(key)
+            except KeyError:
+                self.misses += 1
+                return default
+            self._items[key] = value  # move to the most recently used position
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._items.pop(key, None)
+            self._items[key] = value
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)  # drop the least recently used item
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._items
+
+    def __len__(self):
+        with self._lock:
+            return len(self._items)
+
+
+_all_caches = []
+
+
+def memoize(maxsize=32):
+    """
+    Decorator caching the results of a function with hashable arguments
+    in an LRU cache. Array results should be made read-only by the
+    function since the same instance is returned to all callers.
+
+    The cache of a decorated function is available as its `cache` attribute.
+    """
+
+    def decorator(func):
+        cache = LRUCache(maxsize)
+        _all_caches.append(cache)
+        missing = object()
+
+        @functools.wraps(func)
+        def wrapper(*args):
+            value = cache.get(args, missing)
+            if value is missing:
+                value = func(*args)
+                cache.put(args, value)
+            return value
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
+
+
+def clear_caches():
+    """Clears all caches created by the memoize() decorator."""
+    for cache in _all_caches:
+        cache.clear()
+
+
+def read_only(array):
+    """Marks a numpy array as read-only and returns it."""
+    array.setflags(write=False)
+    return array
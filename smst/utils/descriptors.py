@@ -0,0 +1,134 @@
+"""
+Frame-wise audio descriptors computed from a spectrogram.
+
+All the functions take a whole magnitude spectrogram in dB of shape
+(frames, N / 2 + 1) as returned by `stft.from_audio()` and compute the
+descriptor of all the frames at once.
+
+Example:
+
+>>> mX, pX = stft.from_audio(x, w, N, H)
+>>> centroid = descriptors.spectral_centroid(mX, fs, N)
+>>> coefficients = descriptors.mfcc(mX, fs, N)  # shape (frames, 13)
+"""
+
+import numpy as np
+from scipy.fftpack import dct
+
+from . import peaks
+from ..models import harmonic
+from .math import from_db_magnitudes
+
+
+def bin_frequencies(fs, N):
+    """Frequencies (in Hz) of the bins of the positive spectrum."""
+    return np.arange(N // 2 + 1) * fs / float(N)
+
+
+def spectral_energy(mX):
+    """Energy of each frame (sum of the squared magnitudes)."""
+    return np.sum(from_db_magnitudes(mX) ** 2, axis=-1)
+
+
+def loudness(mX):
+    """Loudness of each frame by the Stevens' power law (energy ** 0.67)."""
+    return spectral_energy(mX) ** 0.67
+
+
+def spectral_centroid(mX, fs, N):
+    """Spectral centroid (in Hz) of each frame, 0 for silent frames."""
+    magnitudes = from_db_magnitudes(mX)
+    total = np.sum(magnitudes, axis=-1)
+    weighted = np.dot(magnitudes, bin_frequencies(fs, N))
+    return np.where(total > 0, weighted / np.maximum(total, np.finfo(float).tiny), 0.0)
+
+
+def spectral_flux(mX):
+    """
+    Spectral flux of each frame - the L2 norm of the increase of the magnitudes
+    since the previous frame (0 for the first frame).
+    """
+    magnitudes = from_db_magnitudes(mX)
+    flux = np.zeros(mX.shape[:-1])
+    increase = np.maximum(np.diff(magnitudes, axis=-2), 0)  # half-wave rectified difference
+    flux[..., 1:] = np.sqrt(np.sum(increase ** 2, axis=-1))
+    return flux
+
+
+def high_frequency_content(mX):
+    """High frequency content of each frame - the squared magnitudes weighted by the bin index."""
+    return np.dot(from_db_magnitudes(mX) ** 2, np.arange(mX.shape[-1]))
+
+
+def mel_filterbank(fs, N, n_bands=40, low_freq=0.0, high_freq=None):
+    """
+    Triangular filters equally spaced on the mel scale.
+
+    :param fs: sampling rate
+    :param N: FFT size
+    :param n_bands: number of filters
+    :param low_freq: lowest frequency of the first filter in Hz
+    :param high_freq: highest frequency of the last filter in Hz (default: fs / 2)
+    :returns: matrix of shape (n_bands, N / 2 + 1)
+    """
+    if high_freq is None:
+        high_freq = fs / 2.0
+    if not 0 <= low_freq < high_freq <= fs / 2.0:
+        raise ValueError("Frequency range of the mel bands outside 0 - fs/2")
+
+    def hz_to_mel(f):
+        return 2595 * np.log10(1 + f / 700.0)
+
+    def mel_to_hz(m):
+        return 700 * (10 ** (m / 2595.0) - 1)
+
+    edges = mel_to_hz(np.linspace(hz_to_mel(low_freq), hz_to_mel(high_freq), n_bands + 2))
+    freqs = bin_frequencies(fs, N)
+    lower, center, upper = edges[:-2, np.newaxis], edges[1:-1, np.newaxis], edges[2:, np.newaxis]
+    rising = (freqs - lower) / (center - lower)
+    falling = (upper - freqs) / (upper - center)
+    return np.maximum(0, np.minimum(rising, falling))
+
+
+def mfcc(mX, fs, N, n_bands=40, n_coeffs=13, filterbank=None):
+    """
+    Mel-frequency cepstral coefficients of each frame.
+
+    :param mX: magnitude spectrogram in dB
+    :param fs: sampling rate
+    :param N: FFT size
+    :param n_bands: number of mel bands
+    :param n_coeffs: number of coefficients
+    :param filterbank: precomputed mel_filterbank(fs, N, n_bands)
+    :returns: matrix of shape (frames, n_coeffs)
+    """
+    if filterbank is None:
+        filterbank = mel_filterbank(fs, N, n_bands)
+    band_energies = np.dot(from_db_magnitudes(mX) ** 2, filterbank.T)
+    log_energies = 10 * np.log10(np.maximum(band_energies, np.finfo(float).eps))
+    return dct(log_energies, type=2, norm='ortho', axis=-1)[..., :n_coeffs]
+
+
+def pitch(mX, pX, fs, N, t, minf0, maxf0, f0et):
+    """
+    Fundamental frequency of each frame by the two-way mismatch algorithm
+    with the same stable f0 tracking as the harmonic model.
+
+    :param mX: magnitude spectrogram in dB
+    :param pX: phase spectrogram
+    :param fs: sampling rate
+    :param N: FFT size
+    :param t: threshold of the spectral peaks in negative dB
+    :param minf0: minimum f0 frequency in Hz
+    :param maxf0: maximum f0 frequency in Hz
+    :param f0et: error threshold in the f0 detection (ex: 5)
+    :returns: f0 of each frame, 0 for unpitched frames
+    """
+    f0 = np.zeros(mX.shape[0])
+    f0_stable = 0
+    for l in range(mX.shape[0]):
+        ploc = peaks.find_peaks(mX[l], t)  # detect peak locations
+        iploc, ipmag, ipphase = peaks.interpolate_peaks(mX[l], pX[l], ploc)  # refine peak values
+        f0[l] = peaks.find_fundamental_twm(fs * iploc / float(N), ipmag, f0et, minf0, maxf0, f0_stable)
+        f0_stable = f0[l] if harmonic.is_f0_stable(f0[l], f0_stable) else 0
+    return f0
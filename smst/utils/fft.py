@@ -0,0 +1,215 @@
+"""
+Pluggable FFT backend used by all the models.
+
+The models call fft(), ifft() and fftshift() from this module which forward
+to the currently selected backend. Available backends:
+
+- `scipy.fftpack` - the default, single-threaded
+- `numpy` - numpy.fft, single-threaded
+- `scipy.fft` - scipy >= 1.4, multi-threaded via the `workers` option
+- `pyfftw` - optional pyFFTW package, multi-threaded via the `threads`
+  option, with FFTW plans cached per transform shape and optional wisdom
+  persistence via the `wisdom_file` option
+
+The backend can be selected at runtime:
+
+>>> from smst.utils import fft
+>>> fft.set_backend('scipy.fft', workers=4)
+
+or temporarily:
+
+>>> with fft.use_backend('pyfftw', threads=4, wisdom_file='fftw.wisdom'):
+...     mX, pX = stft.from_audio(x, w, N, H)
+
+The initial backend can be set via the SMST_FFT_BACKEND environment variable
+(an unknown or unavailable one falls back to scipy.fftpack with a warning).
+"""
+
+from contextlib import contextmanager
+import os
+import pickle
+import warnings
+
+import numpy as np
+
+from .cache import LRUCache
+
+
+class FftpackBackend(object):
+    name = 'scipy.fftpack'
+
+    def __init__(self):
+        from scipy import fftpack
+        self._fftpack = fftpack
+
+    def fft(self, x, n=None, axis=-1):
+        return self._fftpack.fft(x, n, axis)
+
+    def ifft(self, x, n=None, axis=-1):
+        return self._fftpack.ifft(x, n, axis)
+
+
+class NumpyBackend(object):
+    name = 'numpy'
+
+    def fft(self, x, n=None, axis=-1):
+        return np.fft.fft(x, n, axis)
+
+    def ifft(self, x, n=None, axis=-1):
+        return np.fft.ifft(x, n, axis)
+
+
+class ScipyFftBackend(object):
+    name = 'scipy.fft'
+
+    def __init__(self, workers=None):
+        """
+        :param workers: number of threads (None - one thread, -1 - all CPUs)
+        """
+        import scipy.fft
+        self._scipy_fft = scipy.fft
+        self.workers = workers
+
+    def fft(self, x, n=None, axis=-1):
+        return self._scipy_fft.fft(x, n, axis, workers=self.workers)
+
+    def ifft(self, x, n=None, axis=-1):
+        return self._scipy_fft.ifft(x, n, axis, workers=self.workers)
+
+
+class PyfftwBackend(object):
+    name = 'pyfftw'
+
+    def __init__(self, threads=1, planner_effort='FFTW_MEASURE', wisdom_file=None, max_plans=64):
+        """
+        :param threads: number of threads used by FFTW
+        :param planner_effort: FFTW planner flag (FFTW_ESTIMATE, FFTW_MEASURE, FFTW_PATIENT, ...)
+        :param wisdom_file: file to load FFTW wisdom from (if it exists), see save_wisdom()
+        :param max_plans: maximum number of cached FFTW plans
+        """
+        import pyfftw
+        import pyfftw.builders
+        self._pyfftw = pyfftw
+        self.threads = threads
+        self.planner_effort = planner_effort
+        self.wisdom_file = wisdom_file
+        self._plans = LRUCache(max_plans)
+        if wisdom_file is not None and os.path.isfile(wisdom_file):
+            self.load_wisdom(wisdom_file)
+
+    def fft(self, x, n=None, axis=-1):
+        return self._plan(self._pyfftw.builders.fft, x, n, axis)(x).copy()
+
+    def ifft(self, x, n=None, axis=-1):
+        return self._plan(self._pyfftw.builders.ifft, x, n, axis)(x).copy()
+
+    def _plan(self, builder, x, n, axis):
+        x = np.asarray(x)
+        key = (builder.__name__, x.shape, x.dtype.str, n, axis)
+        plan = self._plans.get(key)
+        if plan is None:
+            plan = builder(np.empty_like(x), n=n, axis=axis, threads=self.threads,
+                           planner_effort=self.planner_effort)
+            self._plans.put(key, plan)
+        return plan
+
+    def load_wisdom(self, filename):
+        with open(filename, 'rb') as file:
+            self._pyfftw.import_wisdom(pickle.load(file))
+
+    def save_wisdom(self, filename=None):
+        """Stores the FFTW wisdom gathered while planning for the next run."""
+        filename = filename or self.wisdom_file
+        if filename is None:
+            raise ValueError("No wisdom file given")
+        with open(filename, 'wb') as file:
+            pickle.dump(self._pyfftw.export_wisdom(), file)
+
+
+backends = {
+    FftpackBackend.name: FftpackBackend,
+    NumpyBackend.name: NumpyBackend,
+    ScipyFftBackend.name: ScipyFftBackend,
+    PyfftwBackend.name: PyfftwBackend,
+}
+
+_backend = None
+
+
+def set_backend(name, **options):
+    """
+    Selects the FFT backend used by the models.
+
+    :param name: backend name (scipy.fftpack, numpy, scipy.fft, pyfftw)
+    :param options: backend options (eg. workers for scipy.fft, threads for pyfftw)
+    :returns: the backend instance
+    """
+    global _backend
+    if name not in backends:
+        raise ValueError("Unknown FFT backend: %s (available: %s)" % (name, ', '.join(sorted(backends))))
+    try:
+        backend = backends[name](**options)
+    except ImportError as e:
+        raise ValueError("FFT backend %s is not available: %s" % (name, e))
+    _backend = backend
+    return backend
+
+
+def get_backend():
+    """Returns the currently used FFT backend instance."""
+    return _backend
+
+
+def available_backends():
+    """Returns names of the backends whose dependencies can be imported."""
+    available = []
+    for name, backend_class in sorted(backends.items()):
+        try:
+            backend_class()
+        except ImportError:
+            continue
+        available.append(name)
+    return available
+
+
+@contextmanager
+def use_backend(name, **options):
+    """Context manager selecting a FFT backend temporarily."""
+    global _backend
+    previous = _backend
+    try:
+        yield set_backend(name, **options)
+    finally:
+        _backend = previous
+
+
+def fft(x, n=None, axis=-1):
+    """Discrete Fourier transform computed by the current backend."""
+    return _backend.fft(x, n, axis)
+
+
+def ifft(x, n=None, axis=-1):
+    """Inverse discrete Fourier transform computed by the current backend."""
+    return _backend.ifft(x, n, axis)
+
+
+fftshift = np.fft.fftshift
+
+
+
+def _set_default_backend():
+    """
+    Selects the backend named by the SMST_FFT_BACKEND environment variable.
+
+    An unknown or unavailable backend only produces a warning and falls back
+    to scipy.fftpack so that importing the models does not fail.
+    """
+    name = os.environ.get('SMST_FFT_BACKEND', FftpackBackend.name)
+    try:
+        set_backend(name)
+    except ValueError as e:
+        warnings.warn("%s, falling back to %s" % (e, FftpackBackend.name))
+        set_backend(FftpackBackend.name)
+
+
+_set_default_backend()
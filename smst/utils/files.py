@@ -9,3 +9,26 @@ def strip_file(filePath):
 def ensure_directory(dir):
     if len(dir) > 0 and not os.path.isdir(dir) and not os.path.isfile(dir):
         os.makedirs(dir)
+
+
+def find_sound_files(inputs, extensions=('.wav',)):
+    """
+    Lists sound files from a list of files and directories (searched recursively).
+
+    :param inputs: paths to files or directories
+    :param extensions: file extensions of sound files in directories
+    :returns: list of pairs (input path, name relative to the input directory, eg. for output paths)
+    """
+    files = []
+    for input_path in inputs:
+        if os.path.isdir(input_path):
+            for dir_path, _, file_names in sorted(os.walk(input_path)):
+                for file_name in sorted(file_names):
+                    if os.path.splitext(file_name)[1].lower() in extensions:
+                        path = os.path.join(dir_path, file_name)
+                        files.append((path, os.path.relpath(path, input_path)))
+        elif os.path.isfile(input_path):
+            files.append((input_path, os.path.basename(input_path)))
+        else:
+            raise ValueError("Input file or directory does not exist: %s" % input_path)
+    return files
@@ -6,6 +6,31 @@ def is_power_of_two(num):
     """
     return ((num & (num - 1)) == 0) and num > 0
 
+def is_fast_fft_size(num):
+    """
+    Checks if num is a size supported by the models - an even number
+    with no prime factors other than 2, 3 and 5 (eg. 1280, 1536, 2048).
+
+    The FFT of such sizes is as fast as of powers of two. The size must be
+    even so that the positive spectrum has exactly num / 2 + 1 bins.
+    """
+    if num <= 0 or num % 2 != 0:
+        return False
+    for factor in (2, 3, 5):
+        while num % factor == 0:
+            num //= factor
+    return num == 1
+
+def next_fast_size(num):
+    """
+    Smallest FFT size supported by the models (see is_fast_fft_size())
+    which is bigger or equal to num, eg. 1250 for a window of 1201 samples.
+    """
+    size = max(2, int(num) + int(num) % 2)
+    while not is_fast_fft_size(size):
+        size += 2
+    return size
+
 def rmse(x, y):
     """
     Root mean square error.
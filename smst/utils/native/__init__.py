@@ -0,0 +1,77 @@
+"""
+Native (C/Cython) implementations of the performance critical functions and
+a runtime switch between them and the Python reference implementations.
+
+- `spec_synth.genSpecSines` - reference: `smst.utils.synth.spectrum_for_sinusoids_py`
+- `twm.twm` - reference: `smst.utils.peaks.find_fundamental_twm_py`
+
+The models call the functions via `smst.utils.synth.spectrum_for_sinusoids()`
+and `smst.utils.peaks.twm()` which use the selected
+implementation:
+
+>>> from smst.utils import native
+>>> native.set_implementation('python')
+
+or temporarily:
+
+>>> with native.use_implementation('python'):
+...     hfreq, hmag, hphase = harmonic.from_audio(x, fs, w, N, H, t, nH, minf0, maxf0, f0et)
+
+The native implementation is used by default if the extensions are built.
+The initial implementation can be set via the SMST_IMPLEMENTATION
+environment variable. See `smst.utils.native.parity` for comparison of the
+results and speed of both implementations.
+"""
+
+from contextlib import contextmanager
+import os
+
+try:
+    from . import spec_synth, twm
+    native_available = True
+except ImportError:  # the extensions are not built
+    spec_synth = twm = None
+    native_available = False
+
+IMPLEMENTATIONS = ('native', 'python')
+
+_implementation = None
+
+
+def set_implementation(name):
+    """
+    Selects the implementation of the functions having a native version.
+
+    :param name: native or python
+    """
+    global _implementation
+    if name not in IMPLEMENTATIONS:
+        raise ValueError("Unknown implementation: %s (available: %s)" % (name, ', '.join(IMPLEMENTATIONS)))
+    if name == 'native' and not native_available:
+        raise ValueError("Native implementation is not available, the extensions are not built")
+    _implementation = name
+
+
+def get_implementation():
+    """Returns the name of the selected implementation."""
+    return _implementation
+
+
+def use_native():
+    """Indicates whether the native implementation is selected."""
+    return _implementation == 'native'
+
+
+@contextmanager
+def use_implementation(name):
+    """Context manager selecting an implementation temporarily."""
+    global _implementation
+    previous = _implementation
+    try:
+        set_implementation(name)
+        yield name
+    finally:
+        _implementation = previous
+
+
+set_implementation(os.environ.get('SMST_IMPLEMENTATION', 'native' if native_available else 'python'))
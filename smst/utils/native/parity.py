@@ -0,0 +1,161 @@
+"""
+Comparison of the native and Python implementations of the functions
+in `smst.utils.native`.
+
+Both implementations are run on the same randomized inputs. The report
+contains the numerical differences of the results and the time per call of
+each implementation.
+
+Example:
+
+$ python -m smst.utils.native.parity --trials 200
+"""
+
+from __future__ import print_function
+import argparse
+from collections import OrderedDict
+import json
+import timeit
+
+import numpy as np
+
+from . import native_available, spec_synth, twm
+from .. import peaks, synth
+
+
+def random_sinusoids(random, N=2048, fs=44100, max_sines=100):
+    """
+    Generates random sinusoids over the whole frequency range.
+
+    :returns: arguments of `synth.spectrum_for_sinusoids()`: ipfreq, ipmag, ipphase, N, fs
+    """
+    count = random.randint(1, max_sines + 1)
+    ipfreq = random.uniform(0, fs / 2.0, count)
+    ipmag = random.uniform(-100, 0, count)
+    ipphase = random.uniform(-np.pi, np.pi, count)
+    return ipfreq, ipmag, ipphase, N, fs
+
+
+def random_peaks(random, fs=44100, minf0=50, maxf0=1000, max_harmonics=30, max_spurious=5):
+    """
+    Generates random spectral peaks of a slightly inharmonic sound with some spurious peaks.
+
+    :returns: arguments of the TWM function: pfreq, pmag, f0c
+    """
+    f0 = random.uniform(minf0, maxf0)
+    harmonics = f0 * np.arange(1, random.randint(3, max_harmonics + 1) + 1)
+    harmonics *= 1 + random.normal(0, 0.003, harmonics.size)
+    spurious = random.uniform(minf0 / 2.0, fs / 4.0, random.randint(0, max_spurious + 1))
+    pfreq = np.sort(np.concatenate([harmonics[harmonics < fs / 2.0], spurious]))
+    pmag = random.uniform(-90, -10, pfreq.size)
+    f0c = pfreq[(pfreq > minf0) & (pfreq < maxf0)]
+    if f0c.size == 0:
+        f0c = np.array([f0])
+    return pfreq, pmag, f0c
+
+
+def compare(native_func, python_func, inputs, difference):
+    """
+    Runs both implementations on the inputs and compares the results.
+
+    :param native_func: native implementation
+    :param python_func: Python implementation
+    :param inputs: list of argument tuples
+    :param difference: function (native result, python result) -> (absolute, relative difference)
+    :returns: ordered dict of statistics
+    """
+    native_results, native_time = _run_timed(native_func, inputs)
+    python_results, python_time = _run_timed(python_func, inputs)
+    differences = np.array([difference(n, p) for n, p in zip(native_results, python_results)]).reshape(-1, 2)
+    calls = float(max(len(inputs), 1))
+    return OrderedDict([
+        ('trials', len(inputs)),
+        ('max_abs_difference', float(np.max(differences[:, 0])) if len(inputs) else 0.0),
+        ('max_rel_difference', float(np.max(differences[:, 1])) if len(inputs) else 0.0),
+        ('mean_rel_difference', float(np.mean(differences[:, 1])) if len(inputs) else 0.0),
+        ('native_seconds_per_call', native_time / calls),
+        ('python_seconds_per_call', python_time / calls),
+        ('speedup', python_time / native_time if native_time > 0 else float('inf')),
+    ])
+
+
+def compare_spec_synth(trials=100, seed=0, N=2048, fs=44100):
+    """
+    Compares `spec_synth.genSpecSines` with `synth.spectrum_for_sinusoids_py`.
+
+    The relative difference is relative to the maximum magnitude of the Python spectrum.
+    """
+    _check_native()
+    random = np.random.RandomState(seed)
+    inputs = [random_sinusoids(random, N, fs) for _ in range(trials)]
+
+    def native_func(ipfreq, ipmag, ipphase, N, fs):
+        return spec_synth.genSpecSines(N * ipfreq / float(fs), ipmag, ipphase, N)
+
+    def difference(Y_native, Y_python):
+        abs_diff = np.max(np.abs(Y_native - Y_python))
+        return abs_diff, abs_diff / max(np.max(np.abs(Y_python)), np.finfo(float).tiny)
+
+    return compare(native_func, synth.spectrum_for_sinusoids_py, inputs, difference)
+
+
+def compare_twm(trials=100, seed=0):
+    """
+    Compares `twm.twm` with `peaks.find_fundamental_twm_py`.
+
+    The differences are of the detected fundamental frequencies.
+    """
+    _check_native()
+    random = np.random.RandomState(seed)
+    inputs = [random_peaks(random) for _ in range(trials)]
+
+    def difference(native_result, python_result):
+        abs_diff = abs(native_result[0] - python_result[0])
+        return abs_diff, abs_diff / python_result[0]
+
+    return compare(twm.twm, peaks.find_fundamental_twm_py, inputs, difference)
+
+
+def run(trials=100, seed=0):
+    """Compares all the native functions, returns a dict of statistics per function."""
+    return OrderedDict([
+        ('spec_synth.genSpecSines', compare_spec_synth(trials, seed)),
+        ('twm.twm', compare_twm(trials, seed)),
+    ])
+
+# -- support functions --
+
+
+def _check_native():
+    if not native_available:
+        raise ValueError("Native implementation is not available, the extensions are not built")
+
+
+def _run_timed(func, inputs):
+    results = []
+    elapsed = 0.0
+    for args in inputs:
+        start = timeit.default_timer()
+        results.append(func(*args))
+        elapsed += timeit.default_timer() - start
+    return results, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compares native and Python implementations')
+    parser.add_argument('-n', '--trials', type=int, default=100, help='number of random inputs')
+    parser.add_argument('-s', '--seed', type=int, default=0, help='random seed')
+    parser.add_argument('--json', action='store_true', help='print the report as JSON')
+    args = parser.parse_args()
+    report = run(args.trials, args.seed)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    for name, stats in report.items():
+        print(name)
+        for key, value in stats.items():
+            print('  %s: %s' % (key, value))
+
+
+if __name__ == '__main__':
+    main()
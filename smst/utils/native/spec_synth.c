@@ -1,15 +1,21 @@
 #include "spec_synth.h"
 
-const float bh_92_1001[BH_SIZE] = {   8.876e-06, 9.5606e-06, 1.0255e-05,  1.0956e-05, 1.1664e-05, 1.2376e-05, 1.309e-05, 1.3804e-05, 1.4516e-05, 1.5224e-05, 1.5927e-05, 1.662e-05, 1.7303e-05, 1.7973e-05, 1.8628e-05, 1.9265e-05, 1.9881e-05, 2.0475e-05, 2.1045e-05, 2.1586e-05, 2.2098e-05, 2.2578e-05, 2.3022e-05, 2.343e-05, 2.3798e-05, 2.4124e-05, 2.4406e-05, 2.4642e-05, 2.4829e-05, 2.4966e-05, 2.5051e-05, 2.5081e-05, 2.5055e-05, 2.4971e-05, 2.4828e-05, 2.4625e-05, 2.436e-05, 2.4032e-05, 2.3642e-05, 2.3187e-05, 2.2668e-05, 2.2085e-05, 2.1437e-05, 2.0726e-05, 1.9952e-05, 1.9116e-05, 1.822e-05, 1.7264e-05, 1.6253e-05, 1.5186e-05, 1.4069e-05, 1.2904e-05, 1.1694e-05, 1.0445e-05, 9.1607e-06, 7.8463e-06, 6.5078e-06, 5.1516e-06, 3.7846e-06, 2.4143e-06, 1.0491e-06, 3.0242e-07, 1.6305e-06, 2.925e-06, 4.1749e-06, 5.3683e-06, 6.4929e-06, 7.5353e-06, 8.481e-06, 9.3154e-06, 1.0022e-05, 1.0584e-05, 1.0984e-05, 1.1202e-05, 1.1219e-05, 1.1013e-05, 1.0564e-05, 9.8468e-06, 8.8379e-06, 7.5115e-06, 5.8412e-06, 3.7985e-06, 1.3548e-06, 1.5209e-06, 4.8605e-06, 8.6968e-06, 1.3065e-05, 1.8002e-05, 2.3544e-05, 2.973e-05, 3.6602e-05, 4.4202e-05, 5.2573e-05, 6.1761e-05, 7.1816e-05, 8.2779e-05, 9.471e-05, 0.00010766, 0.00012167, 0.00013682, 0.00015315, 0.00017072, 0.0001896, 0.00020986, 0.00023155, 0.00025474, 0.00027951, 0.00030592, 0.00033406, 0.00036401, 0.00039582, 0.00042959, 0.0004654, 0.00050335, 0.0005435, 0.00058595, 0.00063081, 0.00067816, 0.00072811, 0.00078076, 0.0008362, 0.00089452, 0.00095588, 0.0010203, 0.001088, 0.0011591, 0.0012336, 0.0013117, 0.0013935, 0.0014791, 0.0015687, 0.0016625, 0.0017604, 0.0018628, 0.0019696, 0.0020811, 0.0021974, 0.0023187, 0.0024451, 0.0025767, 0.0027137, 0.0028564, 0.0030048, 0.0031592, 0.0033195, 0.003486, 0.0036593, 0.0038388, 0.0040255, 0.004219, 0.0044196, 0.0046273, 0.0048431, 0.0050664, 0.0052977, 0.005537, 0.0057848, 0.0060412, 0.0063063, 0.0065804, 0.0068638, 0.0071565, 0.0074591, 0.0077713, 0.0080938, 0.0084265, 0.00877, 0.0091241, 0.0094893, 0.0098661, 0.010254, 0.010654, 0.011066, 0.01149, 0.011927, 0.012377, 0.01284, 0.013315, 0.013805, 0.014309, 0.014827, 0.015359, 0.015906, 0.016468, 0.017045, 0.017637, 0.018246, 0.01887, 0.019511, 0.020169, 0.020844, 0.021536, 0.022245, 0.022973, 0.023718, 0.024482, 0.025264, 0.026066, 0.026887, 0.027728, 0.028589, 0.02947, 0.030371, 0.031294, 0.032237, 0.033201, 0.03419, 0.035198, 0.03623, 0.037285, 0.03836, 0.039461, 0.040587, 0.041734, 0.042906, 0.044103, 0.045324, 0.046571, 0.047845, 0.049141, 0.050468, 0.051817, 0.053194, 0.054598, 0.056031, 0.057491, 0.058976, 0.060492, 0.062036, 0.063608, 0.065211, 0.066842, 0.068501, 0.070191, 0.071912, 0.073664, 0.075443, 0.077257, 0.079099, 0.080975, 0.082882, 0.08482, 0.086792, 0.088794, 0.090832, 0.0929, 0.095002, 0.097135, 0.099305, 0.10151, 0.10375, 0.10602, 0.10832, 0.11066, 0.11304, 0.11545, 0.11789, 0.12037, 0.12289, 0.12544, 0.12803, 0.13065, 0.13331, 0.13601, 0.13874, 0.14151, 0.14431, 0.14715, 0.15003, 0.15295, 0.1559, 0.15889, 0.16192, 0.16498, 0.16808, 0.17122, 0.1744, 0.17761, 0.18086, 0.18415, 0.18747, 0.19083, 0.19424, 0.19767, 0.20115, 0.20466, 0.20821, 0.21179, 0.21542, 0.21907, 0.22277, 0.22651, 0.23028, 0.23408, 0.23793, 0.24181, 0.24572, 0.24967, 0.25366, 0.25769, 0.26175, 0.26584, 0.26996, 0.27413, 0.27833, 0.28256, 0.28683, 0.29113, 0.29546, 0.29983, 0.30423, 0.30866, 0.31313, 0.31762, 0.32215, 0.32671, 0.3313, 0.33592, 0.34057, 0.34525, 0.34996, 0.35471, 0.35948, 0.36426, 0.36909, 0.37393, 0.37883, 0.38373, 0.38866, 0.39362, 0.39858, 0.4036, 0.40863, 0.41368, 0.41873, 0.42385, 0.42897, 0.43411, 0.43926, 0.44444, 0.44962, 0.45486, 0.46006, 0.46534, 0.47061, 0.47588, 0.48118, 0.48648, 0.49181, 0.49715, 0.50251, 0.50788, 0.51324, 0.51863, 0.52403, 0.52942, 0.53485, 0.54028, 0.5457, 0.55113, 0.55655, 0.56201, 0.56744, 0.57289, 0.57835, 0.58381, 0.58923, 0.59469, 0.60015, 0.60557, 0.61103, 0.61646, 0.62191, 0.62734, 0.63277, 0.63816, 0.64359, 0.64898, 0.65438, 0.65974, 0.66511, 0.67047, 0.6758, 0.68114, 0.68644, 0.69174, 0.69701, 0.70225, 0.70749, 0.71273, 0.71794, 0.72312, 0.72826, 0.73338, 0.7385, 0.74358, 0.74864, 0.75366, 0.75868, 0.76364, 0.7686, 0.7735, 0.7784, 0.78324, 0.78804, 0.79285, 0.79759, 0.80231, 0.80696, 0.81161, 0.8162, 0.82076, 0.82528, 0.82978, 0.83421, 0.83861, 0.84296, 0.84727, 0.85151, 0.85573, 0.85992, 0.86404, 0.8681, 0.87213, 0.8761, 0.88004, 0.88391, 0.88773, 0.89148, 0.8952, 0.89886, 0.90246, 0.90602, 0.90952, 0.91294, 0.91632, 0.91963, 0.92289, 0.92611, 0.92924, 0.93231, 0.93532, 0.9383, 0.94118, 0.944, 0.94676, 0.94946, 0.9521, 0.95467, 0.95718, 0.9596, 0.96199, 0.96428, 0.96651, 0.96868, 0.97076, 0.97278, 0.97473, 0.97662, 0.97845, 0.98019, 0.98186, 0.98344, 0.98499, 0.98642, 0.98781, 0.98912, 0.99036, 0.99154, 0.99262, 0.99361, 0.99457, 0.99541, 0.99622, 0.99693, 0.99758, 0.99814, 0.99864, 0.99904, 0.99938, 0.99966, 0.99984, 0.99994, 1, 0.99994, 0.99984, 0.99966, 0.99938, 0.99904, 0.99864, 0.99814, 0.99758, 0.99693, 0.99622, 0.99541, 0.99457, 0.99361, 0.99262, 0.99154, 0.99036, 0.98912, 0.98781, 0.98642, 0.98499, 0.98344, 0.98186, 0.98019, 0.97845, 0.97662, 0.97473, 0.97278, 0.97076, 0.96868, 0.96651, 0.96428, 0.96199, 0.9596, 0.95718, 0.95467, 0.9521, 0.94946, 0.94676, 0.944, 0.94118, 0.9383, 0.93532, 0.93231, 0.92924, 0.92611, 0.92289, 0.91963, 0.91632, 0.91294, 0.90952, 0.90602, 0.90246, 0.89886, 0.8952, 0.89148, 0.88773, 0.88391, 0.88004, 0.8761, 0.87213, 0.8681, 0.86404, 0.85992, 0.85573, 0.85151, 0.84727, 0.84296, 0.83861, 0.83421, 0.82978, 0.82528, 0.82076, 0.8162, 0.81161, 0.80696, 0.80231, 0.79759, 0.79285, 0.78804, 0.78324, 0.7784, 0.7735, 0.7686, 0.76364, 0.75868, 0.75366, 0.74864, 0.74358, 0.7385, 0.73338, 0.72826, 0.72312, 0.71794, 0.71273, 0.70749, 0.70225, 0.69701, 0.69174, 0.68644, 0.68114, 0.6758, 0.67047, 0.66511, 0.65974, 0.65438, 0.64898, 0.64359, 0.63816, 0.63277, 0.62734, 0.62191, 0.61646, 0.61103, 0.60557, 0.60015, 0.59469, 0.58923, 0.58381, 0.57835, 0.57289, 0.56744, 0.56201, 0.55655, 0.55113, 0.5457, 0.54028, 0.53485, 0.52942, 0.52403, 0.51863, 0.51324, 0.50788, 0.50251, 0.49715, 0.49181, 0.48648, 0.48118, 0.47588, 0.47061, 0.46534, 0.46006, 0.45486, 0.44962, 0.44444, 0.43926, 0.43411, 0.42897, 0.42385, 0.41873, 0.41368, 0.40863, 0.4036, 0.39858, 0.39362, 0.38866, 0.38373, 0.37883, 0.37393, 0.36909, 0.36426, 0.35948, 0.35471, 0.34996, 0.34525, 0.34057, 0.33592, 0.3313, 0.32671, 0.32215, 0.31762, 0.31313, 0.30866, 0.30423, 0.29983, 0.29546, 0.29113, 0.28683, 0.28256, 0.27833, 0.27413, 0.26996, 0.26584, 0.26175, 0.25769, 0.25366, 0.24967, 0.24572, 0.24181, 0.23793, 0.23408, 0.23028, 0.22651, 0.22277, 0.21907, 0.21542, 0.21179, 0.20821, 0.20466, 0.20115, 0.19767, 0.19424, 0.19083, 0.18747, 0.18415, 0.18086, 0.17761, 0.1744, 0.17122, 0.16808, 0.16498, 0.16192, 0.15889, 0.1559, 0.15295, 0.15003, 0.14715, 0.14431, 0.14151, 0.13874, 0.13601, 0.13331, 0.13065, 0.12803, 0.12544, 0.12289, 0.12037, 0.11789, 0.11545, 0.11304, 0.11066, 0.10832, 0.10602, 0.10375, 0.10151, 0.099305, 0.097135, 0.095002, 0.0929, 0.090832, 0.088794, 0.086792, 0.08482, 0.082882, 0.080975, 0.079099, 0.077257, 0.075443, 0.073664, 0.071912, 0.070191, 0.068501, 0.066842, 0.065211, 0.063608, 0.062036, 0.060492, 0.058976, 0.057491, 0.056031, 0.054598, 0.053194, 0.051817, 0.050468, 0.049141, 0.047845, 0.046571, 0.045324, 0.044103, 0.042906, 0.041734, 0.040587, 0.039461, 0.03836, 0.037285, 0.03623, 0.035198, 0.03419, 0.033201, 0.032237, 0.031294, 0.030371, 0.02947, 0.028589, 0.027728, 0.026887, 0.026066, 0.025264, 0.024482, 0.023718, 0.022973, 0.022245, 0.021536, 0.020844, 0.020169, 0.019511, 0.01887, 0.018246, 0.017637, 0.017045, 0.016468, 0.015906, 0.015359, 0.014827, 0.014309, 0.013805, 0.013315, 0.01284, 0.012377, 0.011927, 0.01149, 0.011066, 0.010654, 0.010254, 0.0098661, 0.0094893, 0.0091241, 0.00877, 0.0084265, 0.0080938, 0.0077713, 0.0074591, 0.0071565, 0.0068638, 0.0065804, 0.0063063, 0.0060412, 0.0057848, 0.005537, 0.0052977, 0.0050664, 0.0048431, 0.0046273, 0.0044196, 0.004219, 0.0040255, 0.0038388, 0.0036593, 0.003486, 0.0033195, 0.0031592, 0.0030048, 0.0028564, 0.0027137, 0.0025767, 0.0024451, 0.0023187, 0.0021974, 0.0020811, 0.0019696, 0.0018628, 0.0017604, 0.0016625, 0.0015687, 0.0014791, 0.0013935, 0.0013117, 0.0012336, 0.0011591, 0.001088, 0.0010203, 0.00095588, 0.00089452, 0.0008362, 0.00078076, 0.00072811, 0.00067816, 0.00063081, 0.00058595, 0.0005435, 0.00050335, 0.0004654, 0.00042959, 0.00039582, 0.00036401, 0.00033406, 0.00030592, 0.00027951, 0.00025474, 0.00023155, 0.00020986, 0.0001896, 0.00017072, 0.00015315, 0.00013682, 0.00012167, 0.00010766, 9.471e-05, 8.2779e-05, 7.1816e-05, 6.1761e-05, 5.2573e-05, 4.4202e-05, 3.6602e-05, 2.973e-05, 2.3544e-05, 1.8002e-05, 1.3065e-05, 8.6968e-06, 4.8605e-06, 1.5209e-06, 1.3548e-06, 3.7985e-06, 5.8412e-06, 7.5115e-06, 8.8379e-06, 9.8468e-06, 1.0564e-05, 1.1013e-05, 1.1219e-05, 1.1202e-05, 1.0984e-05, 1.0584e-05, 1.0022e-05, 9.3154e-06, 8.481e-06, 7.5353e-06, 6.4929e-06, 5.3683e-06, 4.1749e-06, 2.925e-06, 1.6305e-06, 3.0242e-07, 1.0491e-06, 2.4143e-06, 3.7846e-06, 5.1516e-06, 6.5078e-06, 7.8463e-06, 9.1607e-06, 1.0445e-05, 1.1694e-05, 1.2904e-05, 1.4069e-05, 1.5186e-05, 1.6253e-05, 1.7264e-05, 1.822e-05, 1.9116e-05, 1.9952e-05, 2.0726e-05, 2.1437e-05, 2.2085e-05, 2.2668e-05, 2.3187e-05, 2.3642e-05, 2.4032e-05, 2.436e-05, 2.4625e-05, 2.4828e-05, 2.4971e-05, 2.5055e-05, 2.5081e-05, 2.5051e-05, 2.4966e-05, 2.4829e-05, 2.4642e-05, 2.4406e-05, 2.4124e-05, 2.3798e-05, 2.343e-05, 2.3022e-05, 2.2578e-05, 2.2098e-05, 2.1586e-05, 2.1045e-05, 2.0475e-05, 1.9881e-05, 1.9265e-05, 1.8628e-05, 1.7973e-05, 1.7303e-05, 1.662e-05, 1.5927e-05, 1.5224e-05, 1.4516e-05, 1.3804e-05, 1.309e-05, 1.2376e-05, 1.1664e-05, 1.0956e-05, 1.0255e-05, 9.5606e-06, 8.876e-06, 8.2026e-06, 7.5422e-06, 6.8957e-06, 6.265e-06, 5.6514e-06, 5.0561e-06, 4.48e-06, 3.9244e-06, 3.3905e-06, 2.8791e-06, 2.3909e-06, 1.9268e-06, 1.4875e-06, 1.0735e-06, 6.8548e-07, 3.2373e-07    };
+const float bh_92_1001[BH_SIZE] = { 6.5013141e-21, 3.2045879e-07, 6.6765113e-07, 1.0412558e-06, 1.4408736e-06, 1.8660264e-06, 2.3161557e-06, 2.7906222e-06, 3.288705e-06, 3.8096007e-06, 4.3524238e-06, 4.9162055e-06, 5.4998946e-06, 6.1023569e-06, 6.7223761e-06, 7.3586542e-06, 8.0098121e-06, 8.6743906e-06, 9.3508522e-06, 1.0037582e-05, 1.0732888e-05, 1.1435007e-05, 1.2142103e-05, 1.2852271e-05, 1.3563539e-05, 1.4273873e-05, 1.4981179e-05, 1.5683304e-05, 1.6378047e-05, 1.7063154e-05, 1.773633e-05, 1.839524e-05, 1.9037516e-05, 1.9660761e-05, 2.0262555e-05, 2.0840462e-05, 2.1392037e-05, 2.1914832e-05, 2.2406403e-05, 2.2864317e-05, 2.3286164e-05, 2.366956e-05, 2.401216e-05, 2.4311665e-05, 2.4565832e-05, 2.4772484e-05, 2.4929523e-05, 2.5034937e-05, 2.5086812e-05, 2.5083348e-05, 2.5022864e-05, 2.4903818e-05, 2.4724815e-05, 2.4484621e-05, 2.4182182e-05, 2.3816631e-05, 2.3387307e-05, 2.2893772e-05, 2.2335821e-05, 2.1713506e-05, 2.1027146e-05, 2.0277348e-05, 1.9465022e-05, 1.8591403e-05, 1.7658065e-05, 1.6666944e-05, 1.5620357e-05, 1.4521017e-05, 1.3372063e-05, 1.2177071e-05, 1.0940082e-05, 9.6656224e-06, 8.3587253e-06, 7.024954e-06, 5.6704254e-06, 4.3018337e-06, 2.9264747e-06, 1.5522703e-06, 1.8779379e-07, -1.1577046e-06, -2.4742717e-06, -3.7512251e-06, -4.9771262e-06, -6.1397528e-06, -7.2260718e-06, -8.2222106e-06, -9.113429e-06, -9.8840902e-06, -1.0517631e-05, -1.0996535e-05, -1.1302296e-05, -1.1415397e-05, -1.131527e-05, -1.0980274e-05, -1.0387654e-05, -9.51352e-06, -8.3328054e-06, -6.8192411e-06, -4.9453203e-06, -2.6822664e-06, -6.5009504e-21, 3.1328942e-06, 6.7492013e-06, 1.0883109e-05, 1.5570243e-05, 2.0847698e-05, 2.6754076e-05, 3.3329517e-05, 4.0615735e-05, 4.8656052e-05, 5.7495434e-05, 6.7180522e-05, 7.7759673e-05, 8.9282987e-05, 0.00010180235, 0.00011537146, 0.00013004586, 0.000145883, 0.00016294223, 0.00018128485, 0.00020097418, 0.00022207554, 0.0002446563, 0.00026878594, 0.00029453605, 0.00032198039, 0.00035119491, 0.00038225777, 0.0004152494, 0.00045025253, 0.00048735218, 0.00052663576, 0.00056819302, 0.00061211616, 0.00065849982, 0.00070744111, 0.00075903962, 0.00081339751, 0.00087061949, 0.00093081284, 0.00099408747, 0.0010605559, 0.0011303335, 0.0012035379, 0.00128029, 0.0013607131, 0.0014449332, 0.0015330793, 0.0016252831, 0.0017216793, 0.001822405, 0.0019276008, 0.0020374095, 0.0021519774, 0.0022714534, 0.0023959892, 0.0025257399, 0.0026608631, 0.0028015196, 0.0029478731, 0.0031000904, 0.0032583411, 0.003422798, 0.0035936367, 0.003771036, 0.0039551776, 0.0041462462, 0.0043444298, 0.0045499189, 0.0047629075, 0.0049835923, 0.0052121731, 0.0054488528, 0.0056938372, 0.0059473349, 0.0062095579, 0.0064807207, 0.0067610411, 0.0070507396, 0.0073500397, 0.0076591678, 0.0079783531, 0.0083078278, 0.0086478267, 0.0089985876, 0.0093603509, 0.00973336, 0.010117861, 0.010514102, 0.010922335, 0.011342813, 0.011775793, 0.012221534, 0.012680298, 0.013152349, 0.013637952, 0.014137376, 0.014650894, 0.015178777, 0.015721302, 0.016278746, 0.016851388, 0.017439512, 0.0180434, 0.018663339, 0.019299615, 0.019952519, 0.020622341, 0.021309374, 0.022013913, 0.022736253, 0.023476693, 0.024235529, 0.025013064, 0.025809597, 0.026625432, 0.027460871, 0.02831622, 0.029191782, 0.030087865, 0.031004775, 0.03194282, 0.032902307, 0.033883544, 0.034886841, 0.035912506, 0.036960848, 0.038032177, 0.0391268, 0.040245028, 0.041387168, 0.042553528, 0.043744417, 0.04496014, 0.046201005, 0.047467316, 0.048759378, 0.050077495, 0.051421969, 0.0527931, 0.054191188, 0.055616531, 0.057069426, 0.058550166, 0.060059044, 0.061596351, 0.063162375, 0.064757402, 0.066381716, 0.068035598, 0.069719326, 0.071433176, 0.07317742, 0.074952329, 0.076758168, 0.0785952, 0.080463686, 0.08236388, 0.084296036, 0.086260401, 0.088257221, 0.090286734, 0.092349178, 0.094444783, 0.096573776, 0.098736381, 0.10093281, 0.10316329, 0.10542801, 0.10772718, 0.110061, 0.11242965, 0.11483333, 0.11727222, 0.11974648, 0.12225629, 0.1248018, 0.12738318, 0.13000057, 0.13265411, 0.13534394, 0.13807019, 0.14083299, 0.14363244, 0.14646865, 0.14934172, 0.15225176, 0.15519883, 0.15818302, 0.16120441, 0.16426304, 0.16735898, 0.17049227, 0.17366295, 0.17687105, 0.18011658, 0.18339956, 0.18672, 0.19007788, 0.1934732, 0.19690592, 0.20037602, 0.20388346, 0.20742818, 0.21101012, 0.21462921, 0.21828538, 0.22197853, 0.22570857, 0.22947538, 0.23327885, 0.23711884, 0.24099523, 0.24490785, 0.24885656, 0.25284118, 0.25686153, 0.26091742, 0.26500866, 0.26913503, 0.27329631, 0.27749227, 0.28172266, 0.28598724, 0.29028574, 0.29461788, 0.29898339, 0.30338196, 0.30781329, 0.31227705, 0.31677294, 0.32130059, 0.32585967, 0.33044982, 0.33507066, 0.33972181, 0.34440288, 0.34911346, 0.35385315, 0.35862151, 0.36341811, 0.3682425, 0.37309423, 0.37797283, 0.38287782, 0.38780872, 0.39276501, 0.3977462, 0.40275176, 0.40778117, 0.41283388, 0.41790934, 0.42300699, 0.42812626, 0.43326657, 0.43842733, 0.44360793, 0.44880778, 0.45402624, 0.45926269, 0.46451649, 0.46978699, 0.47507353, 0.48037546, 0.48569208, 0.49102273, 0.4963667, 0.5017233, 0.50709181, 0.51247152, 0.5178617, 0.52326161, 0.52867052, 0.53408768, 0.53951232, 0.54494368, 0.55038099, 0.55582347, 0.56127033, 0.56672079, 0.57217403, 0.57762927, 0.58308567, 0.58854243, 0.59399872, 0.59945371, 0.60490657, 0.61035646, 0.61580252, 0.62124391, 0.62667978, 0.63210927, 0.6375315, 0.64294562, 0.64835075, 0.65374602, 0.65913055, 0.66450345, 0.66986384, 0.67521084, 0.68054355, 0.68586109, 0.69116255, 0.69644705, 0.70171368, 0.70696154, 0.71218974, 0.71739738, 0.72258355, 0.72774735, 0.73288788, 0.73800424, 0.74309553, 0.74816084, 0.75319928, 0.75820995, 0.76319194, 0.76814437, 0.77306635, 0.77795697, 0.78281535, 0.7876406, 0.79243184, 0.79718818, 0.80190876, 0.8065927, 0.81123912, 0.81584716, 0.82041596, 0.82494467, 0.82943242, 0.83387838, 0.8382817, 0.84264155, 0.84695709, 0.8512275, 0.85545198, 0.85962969, 0.86375985, 0.86784165, 0.8718743, 0.87585702, 0.87978904, 0.88366959, 0.88749792, 0.89127327, 0.89499489, 0.89866207, 0.90227408, 0.9058302, 0.90932973, 0.91277197, 0.91615625, 0.91948188, 0.92274821, 0.92595457, 0.92910034, 0.93218487, 0.93520756, 0.93816778, 0.94106495, 0.94389847, 0.94666778, 0.94937231, 0.95201152, 0.95458487, 0.95709184, 0.95953191, 0.96190459, 0.96420939, 0.96644584, 0.96861349, 0.97071189, 0.97274061, 0.97469924, 0.97658736, 0.9784046, 0.98015058, 0.98182493, 0.98342732, 0.98495741, 0.98641488, 0.98779944, 0.9891108, 0.99034868, 0.99151284, 0.99260302, 0.993619, 0.99456058, 0.99542755, 0.99621974, 0.99693698, 0.99757912, 0.99814603, 0.99863759, 0.9990537, 0.99939428, 0.99965924, 0.99984854, 0.99996213, 1, 0.99996213, 0.99984854, 0.99965924, 0.99939428, 0.9990537, 0.99863759, 0.99814603, 0.99757912, 0.99693698, 0.99621974, 0.99542755, 0.99456058, 0.993619, 0.99260302, 0.99151284, 0.99034868, 0.9891108, 0.98779944, 0.98641488, 0.98495741, 0.98342732, 0.98182493, 0.98015058, 0.9784046, 0.97658736, 0.97469924, 0.97274061, 0.97071189, 0.96861349, 0.96644584, 0.96420939, 0.96190459, 0.95953191, 0.95709184, 0.95458487, 0.95201152, 0.94937231, 0.94666778, 0.94389847, 0.94106495, 0.93816778, 0.93520756, 0.93218487, 0.92910034, 0.92595457, 0.92274821, 0.91948188, 0.91615625, 0.91277197, 0.90932973, 0.9058302, 0.90227408, 0.89866207, 0.89499489, 0.89127327, 0.88749792, 0.88366959, 0.87978904, 0.87585702, 0.8718743, 0.86784165, 0.86375985, 0.85962969, 0.85545198, 0.8512275, 0.84695709, 0.84264155, 0.8382817, 0.83387838, 0.82943242, 0.82494467, 0.82041596, 0.81584716, 0.81123912, 0.8065927, 0.80190876, 0.79718818, 0.79243184, 0.7876406, 0.78281535, 0.77795697, 0.77306635, 0.76814437, 0.76319194, 0.75820995, 0.75319928, 0.74816084, 0.74309553, 0.73800424, 0.73288788, 0.72774735, 0.72258355, 0.71739738, 0.71218974, 0.70696154, 0.70171368, 0.69644705, 0.69116255, 0.68586109, 0.68054355, 0.67521084, 0.66986384, 0.66450345, 0.65913055, 0.65374602, 0.64835075, 0.64294562, 0.6375315, 0.63210927, 0.62667978, 0.62124391, 0.61580252, 0.61035646, 0.60490657, 0.59945371, 0.59399872, 0.58854243, 0.58308567, 0.57762927, 0.57217403, 0.56672079, 0.56127033, 0.55582347, 0.55038099, 0.54494368, 0.53951232, 0.53408768, 0.52867052, 0.52326161, 0.5178617, 0.51247152, 0.50709181, 0.5017233, 0.4963667, 0.49102273, 0.48569208, 0.48037546, 0.47507353, 0.46978699, 0.46451649, 0.45926269, 0.45402624, 0.44880778, 0.44360793, 0.43842733, 0.43326657, 0.42812626, 0.42300699, 0.41790934, 0.41283388, 0.40778117, 0.40275176, 0.3977462, 0.39276501, 0.38780872, 0.38287782, 0.37797283, 0.37309423, 0.3682425, 0.36341811, 0.35862151, 0.35385315, 0.34911346, 0.34440288, 0.33972181, 0.33507066, 0.33044982, 0.32585967, 0.32130059, 0.31677294, 0.31227705, 0.30781329, 0.30338196, 0.29898339, 0.29461788, 0.29028574, 0.28598724, 0.28172266, 0.27749227, 0.27329631, 0.26913503, 0.26500866, 0.26091742, 0.25686153, 0.25284118, 0.24885656, 0.24490785, 0.24099523, 0.23711884, 0.23327885, 0.22947538, 0.22570857, 0.22197853, 0.21828538, 0.21462921, 0.21101012, 0.20742818, 0.20388346, 0.20037602, 0.19690592, 0.1934732, 0.19007788, 0.18672, 0.18339956, 0.18011658, 0.17687105, 0.17366295, 0.17049227, 0.16735898, 0.16426304, 0.16120441, 0.15818302, 0.15519883, 0.15225176, 0.14934172, 0.14646865, 0.14363244, 0.14083299, 0.13807019, 0.13534394, 0.13265411, 0.13000057, 0.12738318, 0.1248018, 0.12225629, 0.11974648, 0.11727222, 0.11483333, 0.11242965, 0.110061, 0.10772718, 0.10542801, 0.10316329, 0.10093281, 0.098736381, 0.096573776, 0.094444783, 0.092349178, 0.090286734, 0.088257221, 0.086260401, 0.084296036, 0.08236388, 0.080463686, 0.0785952, 0.076758168, 0.074952329, 0.07317742, 0.071433176, 0.069719326, 0.068035598, 0.066381716, 0.064757402, 0.063162375, 0.061596351, 0.060059044, 0.058550166, 0.057069426, 0.055616531, 0.054191188, 0.0527931, 0.051421969, 0.050077495, 0.048759378, 0.047467316, 0.046201005, 0.04496014, 0.043744417, 0.042553528, 0.041387168, 0.040245028, 0.0391268, 0.038032177, 0.036960848, 0.035912506, 0.034886841, 0.033883544, 0.032902307, 0.03194282, 0.031004775, 0.030087865, 0.029191782, 0.02831622, 0.027460871, 0.026625432, 0.025809597, 0.025013064, 0.024235529, 0.023476693, 0.022736253, 0.022013913, 0.021309374, 0.020622341, 0.019952519, 0.019299615, 0.018663339, 0.0180434, 0.017439512, 0.016851388, 0.016278746, 0.015721302, 0.015178777, 0.014650894, 0.014137376, 0.013637952, 0.013152349, 0.012680298, 0.012221534, 0.011775793, 0.011342813, 0.010922335, 0.010514102, 0.010117861, 0.00973336, 0.0093603509, 0.0089985876, 0.0086478267, 0.0083078278, 0.0079783531, 0.0076591678, 0.0073500397, 0.0070507396, 0.0067610411, 0.0064807207, 0.0062095579, 0.0059473349, 0.0056938372, 0.0054488528, 0.0052121731, 0.0049835923, 0.0047629075, 0.0045499189, 0.0043444298, 0.0041462462, 0.0039551776, 0.003771036, 0.0035936367, 0.003422798, 0.0032583411, 0.0031000904, 0.0029478731, 0.0028015196, 0.0026608631, 0.0025257399, 0.0023959892, 0.0022714534, 0.0021519774, 0.0020374095, 0.0019276008, 0.001822405, 0.0017216793, 0.0016252831, 0.0015330793, 0.0014449332, 0.0013607131, 0.00128029, 0.0012035379, 0.0011303335, 0.0010605559, 0.00099408747, 0.00093081284, 0.00087061949, 0.00081339751, 0.00075903962, 0.00070744111, 0.00065849982, 0.00061211616, 0.00056819302, 0.00052663576, 0.00048735218, 0.00045025253, 0.0004152494, 0.00038225777, 0.00035119491, 0.00032198039, 0.00029453605, 0.00026878594, 0.0002446563, 0.00022207554, 0.00020097418, 0.00018128485, 0.00016294223, 0.000145883, 0.00013004586, 0.00011537146, 0.00010180235, 8.9282987e-05, 7.7759673e-05, 6.7180522e-05, 5.7495434e-05, 4.8656052e-05, 4.0615735e-05, 3.3329517e-05, 2.6754076e-05, 2.0847698e-05, 1.5570243e-05, 1.0883109e-05, 6.7492013e-06, 3.1328942e-06, -6.5009504e-21, -2.6822664e-06, -4.9453203e-06, -6.8192411e-06, -8.3328054e-06, -9.51352e-06, -1.0387654e-05, -1.0980274e-05, -1.131527e-05, -1.1415397e-05, -1.1302296e-05, -1.0996535e-05, -1.0517631e-05, -9.8840902e-06, -9.113429e-06, -8.2222106e-06, -7.2260718e-06, -6.1397528e-06, -4.9771262e-06, -3.7512251e-06, -2.4742717e-06, -1.1577046e-06, 1.8779379e-07, 1.5522703e-06, 2.9264747e-06, 4.3018337e-06, 5.6704254e-06, 7.024954e-06, 8.3587253e-06, 9.6656224e-06, 1.0940082e-05, 1.2177071e-05, 1.3372063e-05, 1.4521017e-05, 1.5620357e-05, 1.6666944e-05, 1.7658065e-05, 1.8591403e-05, 1.9465022e-05, 2.0277348e-05, 2.1027146e-05, 2.1713506e-05, 2.2335821e-05, 2.2893772e-05, 2.3387307e-05, 2.3816631e-05, 2.4182182e-05, 2.4484621e-05, 2.4724815e-05, 2.4903818e-05, 2.5022864e-05, 2.5083348e-05, 2.5086812e-05, 2.5034937e-05, 2.4929523e-05, 2.4772484e-05, 2.4565832e-05, 2.4311665e-05, 2.401216e-05, 2.366956e-05, 2.3286164e-05, 2.2864317e-05, 2.2406403e-05, 2.1914832e-05, 2.1392037e-05, 2.0840462e-05, 2.0262555e-05, 1.9660761e-05, 1.9037516e-05, 1.839524e-05, 1.773633e-05, 1.7063154e-05, 1.6378047e-05, 1.5683304e-05, 1.4981179e-05, 1.4273873e-05, 1.3563539e-05, 1.2852271e-05, 1.2142103e-05, 1.1435007e-05, 1.0732888e-05, 1.0037582e-05, 9.3508522e-06, 8.6743906e-06, 8.0098121e-06, 7.3586542e-06, 6.7223761e-06, 6.1023569e-06, 5.4998946e-06, 4.9162055e-06, 4.3524238e-06, 3.8096007e-06, 3.288705e-06, 2.7906222e-06, 2.3161557e-06, 1.8660264e-06, 1.4408736e-06, 1.0412558e-06, 6.6765113e-07, 3.2045879e-07, 6.5013141e-21};
 
 
+// value of the main lobe at x bins from its center, the nearest sample of the table
+static double bh_92_lobe(double x)
+{
+  return bh_92_1001[(int) floor(x * 100 + 0.5) + BH_SIZE_BY2];
+}
+
 void genbh92lobe_C(double *x, double *y, int N)
 {
   int ii = 0;
 
   for (ii = 0; ii < N; ii++)
   {
-    y[ii] = bh_92_1001[(int)(x[ii] * 100) + BH_SIZE_BY2];
+    y[ii] = bh_92_lobe(x[ii]);
   }
 }
 
@@ -24,7 +30,7 @@ void genspecsines_C(
 {
 	int ii = 0, jj = 0, ploc_int;
 	int size_spec_half = (int) floor(size_spec / 2);
-	float bin_remainder, loc, mag;
+	double bin_remainder, loc, mag;
 
 	for (ii = 0; ii < n_peaks; ii++)
 	{
@@ -38,8 +44,8 @@ void genspecsines_C(
 
 			for(jj = -4; jj < 5; jj++)
 			{
-				real[ploc_int + jj] += mag * bh_92_1001[(int)((bin_remainder + jj) * 100) + BH_SIZE_BY2] * cos(ipphase[ii]);
-				imag[ploc_int + jj] += mag * bh_92_1001[(int)((bin_remainder + jj) * 100) + BH_SIZE_BY2] * sin(ipphase[ii]);
+				real[ploc_int + jj] += mag * bh_92_lobe(bin_remainder + jj) * cos(ipphase[ii]);
+				imag[ploc_int + jj] += mag * bh_92_lobe(bin_remainder + jj) * sin(ipphase[ii]);
 			}
 		}
 		else if ((loc > 0) && (loc < 5))
@@ -50,17 +56,17 @@ void genspecsines_C(
 			{
 				if(ploc_int + jj < 0)
 				{
-					real[-1 * (ploc_int + jj)] += mag * bh_92_1001[(int)((bin_remainder + jj) * 100) + BH_SIZE_BY2] * cos(ipphase[ii]);
-					imag[-1 * (ploc_int + jj)] += -1 *mag * bh_92_1001[(int)((bin_remainder + jj) * 100) + BH_SIZE_BY2] * sin(ipphase[ii]);
+					real[-1 * (ploc_int + jj)] += mag * bh_92_lobe(bin_remainder + jj) * cos(ipphase[ii]);
+					imag[-1 * (ploc_int + jj)] += -1 *mag * bh_92_lobe(bin_remainder + jj) * sin(ipphase[ii]);
 				}
 				else if (ploc_int + jj == 0)
 				{
-					real[(ploc_int + jj)] += 2 * mag * bh_92_1001[(int)((bin_remainder + jj) * 100) + BH_SIZE_BY2] * cos(ipphase[ii]);
+					real[(ploc_int + jj)] += 2 * mag * bh_92_lobe(bin_remainder + jj) * cos(ipphase[ii]);
 				}
 				else
 				{
-					real[(ploc_int + jj)] += mag * bh_92_1001[(int)((bin_remainder + jj) * 100) + BH_SIZE_BY2] * cos(ipphase[ii]);
-					imag[ploc_int + jj] += mag * bh_92_1001[(int)((bin_remainder + jj) * 100) + BH_SIZE_BY2] * sin(ipphase[ii]);
+					real[(ploc_int + jj)] += mag * bh_92_lobe(bin_remainder + jj) * cos(ipphase[ii]);
+					imag[ploc_int + jj] += mag * bh_92_lobe(bin_remainder + jj) * sin(ipphase[ii]);
 				}
 			}
 		}
@@ -72,17 +78,17 @@ void genspecsines_C(
 			{
 				if (ploc_int + jj > size_spec_half)
 				{
-					real[size_spec - (ploc_int + jj)] += mag * bh_92_1001[(int)((bin_remainder + jj) * 100) + BH_SIZE_BY2] * cos(ipphase[ii]);
-					imag[size_spec - (ploc_int + jj)] += -1 * mag * bh_92_1001[(int)((bin_remainder + jj) * 100) + BH_SIZE_BY2] * sin(ipphase[ii]);
+					real[size_spec - (ploc_int + jj)] += mag * bh_92_lobe(bin_remainder + jj) * cos(ipphase[ii]);
+					imag[size_spec - (ploc_int + jj)] += -1 * mag * bh_92_lobe(bin_remainder + jj) * sin(ipphase[ii]);
 				}
 				else if (ploc_int + jj == size_spec_half)
 				{
-					real[(ploc_int + jj)] += 2 * mag * bh_92_1001[(int)((bin_remainder + jj) * 100) + BH_SIZE_BY2] * cos(ipphase[ii]);
+					real[(ploc_int + jj)] += 2 * mag * bh_92_lobe(bin_remainder + jj) * cos(ipphase[ii]);
 				}
 				else
 				{
-					real[(ploc_int + jj)] += mag * bh_92_1001[(int)((bin_remainder + jj) * 100) + BH_SIZE_BY2] * cos(ipphase[ii]);
-					imag[ploc_int + jj] += mag * bh_92_1001[(int)((bin_remainder + jj) * 100) + BH_SIZE_BY2] * sin(ipphase[ii]);
+					real[(ploc_int + jj)] += mag * bh_92_lobe(bin_remainder + jj) * cos(ipphase[ii]);
+					imag[ploc_int + jj] += mag * bh_92_lobe(bin_remainder + jj) * sin(ipphase[ii]);
 				}
 			}
 		}
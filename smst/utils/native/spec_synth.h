@@ -10,10 +10,10 @@
 
 #define SPEC_SYNTH_H
 
-// size of the window
+// size of the table of the main lobe of the window (sampled at 0.01 bin from -5 to 5 bins)
 #define BH_SIZE 1001
-// half-size of the window
-#define BH_SIZE_BY2 501
+// index of the center of the main lobe in the table
+#define BH_SIZE_BY2 500
 
 // generates the main lobe of a Blackman-Harris window
 void genbh92lobe_C(double *x, double *y, int N);
@@ -0,0 +1,202 @@
+"""
+Onset detection from spectrograms.
+
+The onset functions (spectral flux, high frequency content) are computed
+for all the frames of a spectrogram from `stft.from_audio()` at once. The
+onsets are the peaks of the onset function picked by `pick_peaks()`.
+`OnsetDetector` does the same on a stream of spectrogram blocks (eg. from
+`stft.iterate_spectrogram_blocks()`) with a latency of a few frames.
+
+Example:
+
+>>> mX, pX = stft.from_audio(x, w, N, H)
+>>> onset_frames = onsets.detect_onsets(mX, method='flux')
+>>> onset_times = onset_frames * H / float(fs)
+
+>>> detector = onsets.OnsetDetector(method='hfc', delta=0.5)
+>>> for mX_block, pX_block in stft.iterate_spectrogram_blocks(x, w, N, H):
+...     new_onsets = detector.process(mX_block)
+>>> new_onsets = detector.flush()
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import as_strided
+
+from . import descriptors
+
+ONSET_FUNCTIONS = {
+    'flux': descriptors.spectral_flux,
+    'hfc': descriptors.high_frequency_content,
+}
+
+
+def onset_function(mX, method='flux'):
+    """
+    Onset detection function of each frame of a spectrogram.
+
+    :param mX: magnitude spectrogram in dB of shape (frames, N / 2 + 1)
+    :param method: 'flux' (spectral flux) or 'hfc' (high frequency content)
+    :returns: onset function value of each frame
+    """
+    if method not in ONSET_FUNCTIONS:
+        raise ValueError("Unknown onset function: %s (available: %s)" % (method, ', '.join(sorted(ONSET_FUNCTIONS))))
+    return ONSET_FUNCTIONS[method](mX)
+
+
+def pick_peaks(odf, delta=0.1, pre_max=3, post_max=3, pre_avg=10, post_avg=3, wait=3):
+    """
+    Picks the onsets from an onset function.
+
+    A frame n is an onset if its value is the maximum of the frames n - pre_max to n + post_max,
+    it exceeds the mean of the frames n - pre_avg to n + post_avg by at least delta, and it is
+    at least wait frames after the previous onset (the windows are truncated at the ends).
+
+    :param odf: onset function
+    :param delta: minimum excess over the local mean
+    :param pre_max: number of previous frames of the local maximum
+    :param post_max: number of next frames of the local maximum
+    :param pre_avg: number of previous frames of the local mean
+    :param post_avg: number of next frames of the local mean
+    :param wait: minimum distance of onsets in frames
+    :returns: array of onset frames
+    """
+    odf = np.asarray(odf, dtype=np.float64)
+    candidates = _peak_candidates(odf, 0, odf.size, delta, pre_max, post_max, pre_avg, post_avg)
+    return _apply_wait(candidates, wait, -np.inf)
+
+
+def detect_onsets(mX, method='flux', normalize=True, **peak_params):
+    """
+    Detects onsets in a spectrogram.
+
+    :param mX: magnitude spectrogram in dB
+    :param method: onset function ('flux' or 'hfc')
+    :param normalize: divide the onset function by its maximum, so that delta is relative to it
+    :param peak_params: parameters of pick_peaks()
+    :returns: array of onset frames
+    """
+    odf = onset_function(mX, method)
+    if normalize and odf.size > 0 and odf.max() > 0:
+        odf = odf / odf.max()
+    return pick_peaks(odf, **peak_params)
+
+
+def active_frames(mX, threshold_db=-80):
+    """
+    Indicates the non-silent frames of a spectrogram.
+
+    The analyses of spectrograms (eg. `sine.from_spectrogram()`) can skip the other frames.
+
+    :param mX: magnitude spectrogram in dB
+    :param threshold_db: minimum energy of an active frame in dB
+    :returns: boolean mask of the frames with energy above the threshold
+    """
+    return descriptors.spectral_energy(mX) > 10 ** (threshold_db / 10.0)
+
+
+class OnsetDetector(object):
+    """
+    Streaming onset detection over blocks of spectrogram frames.
+
+    It gives the same onsets as detect_onsets(mX, normalize=False) over all the frames.
+    An onset is reported when max(post_max, post_avg) more frames are known
+    (or by flush() at the end of the stream).
+
+    :param method: onset function ('flux' or 'hfc')
+
+    The other parameters are the same as of pick_peaks().
+    """
+
+    def __init__(self, method='flux', delta=0.1, pre_max=3, post_max=3, pre_avg=10, post_avg=3, wait=3):
+        if method not in ONSET_FUNCTIONS:
+            raise ValueError("Unknown onset function: %s" % method)
+        self.method = method
+        self.peak_params = (delta, pre_max, post_max, pre_avg, post_avg)
+        self.wait = wait
+        self.history = max(pre_max, pre_avg)  # number of decided frames kept for the windows
+        self.lookahead = max(post_max, post_avg)
+        self.reset()
+
+    def reset(self):
+        """Starts a new stream."""
+        self.odf = np.zeros(0)  # onset function of the kept frames
+        self.offset = 0  # frame index of odf[0]
+        self.decided = 0  # number of frames decided
+        self.last_mX = None  # last frame (for the spectral flux)
+        self.last_onset = -np.inf
+
+    def process(self, mX):
+        """
+        Adds a block of frames.
+
+        :param mX: magnitude spectra in dB of shape (frames, N / 2 + 1)
+        :returns: array of the new onset frames (indexes from the start of the stream)
+        """
+        mX = np.atleast_2d(mX)
+        if mX.shape[0] == 0:
+            return np.zeros(0, dtype=int)
+        if self.method == 'flux' and self.last_mX is not None:
+            odf = onset_function(np.vstack([self.last_mX, mX]), self.method)[1:]  # continue from the last frame
+        else:
+            odf = onset_function(mX, self.method)
+        self.last_mX = mX[-1]
+        self.odf = np.concatenate([self.odf, odf])
+        return self._decide(self.offset + self.odf.size - self.lookahead)
+
+    def flush(self):
+        """
+        Decides the remaining frames at the end of the stream.
+
+        :returns: array of the new onset frames
+        """
+        onsets = self._decide(self.offset + self.odf.size)
+        self.reset()
+        return onsets
+
+    def _decide(self, stop):
+        start = self.decided
+        if stop <= start:
+            return np.zeros(0, dtype=int)
+        # the kept history and lookahead contain the whole windows of the decided frames,
+        # they are truncated only at the start and end of the stream as in pick_peaks()
+        candidates = _peak_candidates(self.odf, start - self.offset, stop - self.offset, *self.peak_params)
+        onsets = _apply_wait(candidates + self.offset, self.wait, self.last_onset)
+        if onsets.size > 0:
+            self.last_onset = onsets[-1]
+        self.decided = stop
+        # forget the frames which are not needed for the windows of the next frames
+        drop = max(0, stop - self.history - self.offset)
+        self.odf = self.odf[drop:]
+        self.offset += drop
+        return onsets
+
+
+def _peak_candidates(odf, start, stop, delta, pre_max, post_max, pre_avg, post_avg):
+    """
+    Frames in [start, stop) of an onset function which are local maxima exceeding
+    the local mean by delta, the windows are truncated at the ends of odf.
+    """
+    frames = np.arange(start, stop)
+    if frames.size == 0:
+        return frames
+    # local maxima: the windows [n - pre_max, n + post_max] as a strided view of -inf padded values
+    padded = np.concatenate([-np.inf * np.ones(pre_max), odf, -np.inf * np.ones(post_max)])
+    size = pre_max + post_max + 1
+    windows = as_strided(padded[start:], shape=(frames.size, size), strides=(padded.strides[0],) * 2)
+    is_max = odf[start:stop] >= windows.max(axis=1)
+    # local means over truncated windows by cumulative sums
+    cumsum = np.concatenate([[0], np.cumsum(odf)])
+    lo = np.clip(frames - pre_avg, 0, odf.size)
+    hi = np.clip(frames + post_avg + 1, 0, odf.size)
+    means = (cumsum[hi] - cumsum[lo]) / (hi - lo)
+    return frames[is_max & (odf[start:stop] >= means + delta)]
+
+
+def _apply_wait(candidates, wait, last_onset):
+    """Keeps the candidates at least wait frames after the previous kept one."""
+    onsets = []
+    for frame in candidates:
+        if frame - last_onset >= wait:
+            onsets.append(frame)
+            last_onset = frame
+    return np.array(onsets, dtype=int)
@@ -1,23 +1,67 @@
 import numpy as np
+from scipy.ndimage import maximum_filter1d
 
-from .native.twm import twm as native_twm
+from . import native
 from .math import from_db_magnitudes
 
-def find_peaks(mX, t):
+
+def find_peaks(mX, t, max_peaks=None, min_distance=None):
     """
     Detects spectral peak locations.
 
-    :param mX: magnitude spectrum
+    A peak is a bin above the threshold and higher than both its neighbors.
+
+    :param mX: magnitude spectrum, or a batch of spectra of shape (..., bins)
     :param t: threshold
-    :returns: ploc: peak locations
+    :param max_peaks: keep only this number of peaks with the highest magnitude
+    :param min_distance: keep only peaks which are the highest within this distance (in bins)
+    :returns: ploc: peak locations, or a list of peak locations of each spectrum of a batch
+      (in the order of the flattened leading axes)
+    """
+
+    mask = peak_mask(mX, t, max_peaks, min_distance)
+    if mask.ndim == 1:
+        return mask.nonzero()[0]
+    return [row.nonzero()[0] for row in mask.reshape(-1, mask.shape[-1])]
+
+
+def peak_mask(mX, t, max_peaks=None, min_distance=None):
+    """
+    Detects spectral peaks in a spectrum or a batch of spectra at once.
+
+    See find_peaks() for the parameters.
+
+    :returns: boolean array of the shape of mX, True at the peak locations
     """
 
-    thresh = np.where(mX[1:-1] > t, mX[1:-1], 0)  # locations above threshold
-    next_minor = np.where(mX[1:-1] > mX[2:], mX[1:-1], 0)  # locations higher than the next one
-    prev_minor = np.where(mX[1:-1] > mX[:-2], mX[1:-1], 0)  # locations higher than the previous one
-    ploc = thresh * next_minor * prev_minor  # locations fulfilling the three criteria
-    ploc = ploc.nonzero()[0] + 1  # add 1 to compensate for previous steps
-    return ploc
+    mX = np.asarray(mX)
+    center = mX[..., 1:-1]
+    inner_mask = center > t  # locations above threshold
+    inner_mask &= center > mX[..., 2:]  # locations higher than the next one
+    inner_mask &= center > mX[..., :-2]  # locations higher than the previous one
+    mask = np.zeros(mX.shape, dtype=bool)
+    mask[..., 1:-1] = inner_mask
+
+    if min_distance is not None and min_distance > 1:
+        # suppress peaks lower than another peak closer than min_distance bins
+        peak_values = np.where(mask, mX, -np.inf)
+        local_max = maximum_filter1d(peak_values, 2 * min_distance - 1, axis=-1, mode='constant', cval=-np.inf)
+        mask &= peak_values >= local_max
+
+    if max_peaks is not None:
+        counts = mask.sum(axis=-1)
+        if np.any(counts > max_peaks):
+            peak_values = np.where(mask, mX, -np.inf)
+            if max_peaks <= 0:
+                mask[...] = False
+            else:
+                # indexes of the max_peaks highest values in each spectrum
+                highest = np.argpartition(-peak_values, max_peaks - 1, axis=-1)[..., :max_peaks]
+                top_mask = np.zeros(mask.shape, dtype=bool)
+                rows = top_mask.reshape(-1, mask.shape[-1])  # a view of the mask with flattened leading axes
+                rows[np.arange(rows.shape[0])[:, np.newaxis], highest.reshape(rows.shape[0], -1)] = True
+                mask &= top_mask
+    return mask
 
 
 def interpolate_peaks(mX, pX, ploc):
@@ -52,18 +96,87 @@ def find_fundamental_twm(pfreq, pmag, ef0max, minf0, maxf0, f0t=0):
     :param f0t: f0 of previous frame if stable
     :returns: f0: fundamental frequency in Hz
     """
-    if minf0 < 0:  # raise exception if minf0 is smaller than 0
-        raise ValueError("Minumum fundamental frequency (minf0) smaller than 0")
+    f0cf, _ = select_f0_candidates(pfreq, pmag, minf0, maxf0, f0t)
 
-    if maxf0 >= 10000:  # raise exception if maxf0 is bigger than 10000Hz
-        raise ValueError("Maximum fundamental frequency (maxf0) bigger than 10000Hz")
+    if (f0cf.size == 0):  # return 0 if no peak candidates
+        return 0
 
-    if (pfreq.size < 3) & (f0t == 0):  # return 0 if less than 3 peaks and not previous f0
+    # call the TWM function with peak candidates
+    f0, f0error = twm(pfreq, pmag, f0cf)
+
+    if (f0 > 0) and (f0error < ef0max):  # accept and return f0 if below max error allowed
+        return f0
+    else:
         return 0
 
+
+def find_fundamental_pruned(pfreq, pmag, ef0max, minf0, maxf0, f0t=0, coarse_candidates=5):
+    """
+    Faster variant of find_fundamental_twm() which evaluates fewer f0 candidates.
+
+    If the f0 of the previous frame is stable, the peak closest to it is
+    evaluated alone (without selecting the other candidates) and accepted
+    right away if its error is below ef0max. Only the previous f0 is reused,
+    not the harmonics of the previous frame (they follow from the f0 in
+    find_harmonics()). Otherwise the candidates are evaluated from coarse to
+    fine - first the strongest ones, then the rest only if none of them is
+    accepted.
+
+    An f0 is found whenever find_fundamental_twm() finds one, but it can be
+    another acceptable candidate than the one with the smallest error.
+
+    :param pfreq: peak frequencies
+    :param pmag: peak magnitudes
+    :param ef0max: maximum error allowed
+    :param minf0: minimum allowed f0
+    :param maxf0: maximum allowed f0
+    :param f0t: f0 of previous frame if stable
+    :param coarse_candidates: number of the strongest candidates evaluated first
+    :returns: f0: fundamental frequency in Hz
+    """
+    check_f0_range(minf0, maxf0)  # also when the previous f0 is accepted without selecting the candidates
+
+    if f0t > 0 and pfreq.size > 0:  # try the peak predicted by the previous frame
+        right = min(np.searchsorted(pfreq, f0t), pfreq.size - 1)
+        nearest = right - 1 if right > 0 and f0t - pfreq[right - 1] <= np.abs(pfreq[right] - f0t) else right
+        f0c = pfreq[nearest:nearest + 1]
+        if (minf0 < f0c[0] < maxf0) and np.abs(f0c[0] - f0t) < f0t / 2.0:
+            f0, f0error = twm(pfreq, pmag, f0c)
+            if (f0 > 0) and (f0error < ef0max):
+                return f0
+
+    f0cf, f0cm = select_f0_candidates(pfreq, pmag, minf0, maxf0, f0t)
+    order = np.argsort(-f0cm)  # strongest candidates first
+    for candidates in (order[:coarse_candidates], order[coarse_candidates:]):
+        if candidates.size == 0:
+            continue
+        f0, f0error = twm(pfreq, pmag, f0cf[candidates])
+        if (f0 > 0) and (f0error < ef0max):
+            return f0
+    return 0
+
+
+def select_f0_candidates(pfreq, pmag, minf0, maxf0, f0t=0):
+    """
+    Selects the peaks which are candidates of the fundamental frequency.
+
+    :param pfreq: peak frequencies
+    :param pmag: peak magnitudes
+    :param minf0: minimum allowed f0
+    :param maxf0: maximum allowed f0
+    :param f0t: f0 of previous frame if stable (only the peaks close to it are used then)
+    :returns: f0cf, f0cm: frequencies and magnitudes of the candidates (empty if there are none)
+    """
+    check_f0_range(minf0, maxf0)
+
+    none = np.zeros(0), np.zeros(0)
+
+    if (pfreq.size < 3) & (f0t == 0):  # no candidates if less than 3 peaks and not previous f0
+        return none
+
     f0c = np.argwhere((pfreq > minf0) & (pfreq < maxf0))[:, 0]  # use only peaks within given range
-    if f0c.size == 0:  # return 0 if no peaks within range
-        return 0
+    if f0c.size == 0:  # no candidates if no peaks within range
+        return none
     f0cf = pfreq[f0c]  # frequencies of peak candidates
     f0cm = pmag[f0c]  # magnitude of peak candidates
 
@@ -76,22 +189,39 @@ def find_fundamental_twm(pfreq, pmag, ef0max, minf0, maxf0, f0t=0):
         if (maxc not in shortlist) and (maxcfd > (f0t / 4)):  # or the maximum magnitude peak is not a harmonic
             shortlist = np.append(maxc, shortlist)
         f0cf = f0cf[shortlist]  # frequencies of candidates
+        f0cm = f0cm[shortlist]  # magnitudes of candidates
 
-    if (f0cf.size == 0):  # return 0 if no peak candidates
-        return 0
+    return f0cf, f0cm
 
-    f0, f0error = native_twm(pfreq, pmag, f0cf)  # call the TWM function with peak candidates
 
-    if (f0 > 0) and (f0error < ef0max):  # accept and return f0 if below max error allowed
-        return f0
-    else:
-        return 0
+def check_f0_range(minf0, maxf0):
+    """Raises ValueError if the allowed range of f0 is invalid."""
+    if minf0 < 0:  # raise exception if minf0 is smaller than 0
+        raise ValueError("Minumum fundamental frequency (minf0) smaller than 0")
+
+    if maxf0 >= 10000:  # raise exception if maxf0 is bigger than 10000Hz
+        raise ValueError("Maximum fundamental frequency (maxf0) bigger than 10000Hz")
+
+
+def twm(pfreq, pmag, f0c):
+    """
+    Two-way mismatch algorithm for f0 detection using the selected implementation
+    (see smst.utils.native.set_implementation()).
+
+    :param pfreq: peak frequencies in Hz
+    :param pmag: peak magnitudes
+    :param f0c: frequencies of f0 candidates
+    :returns: f0, f0Error: fundamental frequency detected and its error
+    """
+    if native.use_native():
+        return native.twm.twm(pfreq, pmag, f0c)
+    return find_fundamental_twm_py(pfreq, pmag, f0c)
 
 
 def find_fundamental_twm_py(pfreq, pmag, f0c):
     """
     Two-way mismatch algorithm for f0 detection (by Beauchamp&Maher).
-    Better to use the C version of this function: native_twm().
+    Better to use the C version of this function: smst.utils.native.twm.twm().
 
     :param pfreq: peak frequencies in Hz
     :param pmag: peak magnitudes
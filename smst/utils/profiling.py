@@ -0,0 +1,186 @@
+"""
+Opt-in timing instrumentation of the model pipelines.
+
+The models record the wall time, number of calls and number of processed
+frames of their stages (eg. `harmonic.spectrum`, `harmonic.f0`,
+`residual.subtract_sinusoids`, `stochastic.spectrum`, `stochastic.envelope`)
+while a profile is active. The times of nested stages are included in the enclosing ones
+(eg. `hps.from_audio` includes `harmonic.from_audio`).
+
+Example:
+
+>>> with profiling.profile() as prof:
+...     hfreq, hmag, hphase, stocEnv = hps.from_audio(x, fs, w, N, H, ...)
+>>> print(prof.format())
+>>> metrics = prof.to_dict()
+
+Without an active profile the instrumentation does almost nothing.
+"""
+
+from collections import OrderedDict
+from contextlib import contextmanager
+import functools
+import json
+import timeit
+
+timer = timeit.default_timer
+
+
+class StageStats(object):
+    """Statistics of one stage."""
+    __slots__ = ('calls', 'seconds', 'frames')
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.frames = 0
+
+    def to_dict(self):
+        return OrderedDict([('calls', self.calls), ('seconds', self.seconds), ('frames', self.frames)])
+
+
+class Profile(object):
+    """
+    Statistics of the stages recorded while the profile is active.
+
+    :param callback: optional function (stage name, seconds, frames) called for each recorded stage
+    """
+
+    def __init__(self, callback=None):
+        self.stages = OrderedDict()
+        self.callback = callback
+
+    def record(self, name, seconds, frames=0):
+        """Adds one call of a stage."""
+        stats = self.stages.get(name)
+        if stats is None:
+            stats = self.stages[name] = StageStats()
+        stats.calls += 1
+        stats.seconds += seconds
+        stats.frames += frames
+        if self.callback is not None:
+            self.callback(name, seconds, frames)
+
+    def reset(self):
+        self.stages.clear()
+
+    def to_dict(self):
+        """Returns the statistics as an ordered dict: stage name -> dict(calls, seconds, frames)."""
+        return OrderedDict((name, stats.to_dict()) for name, stats in self.stages.items())
+
+    def to_json(self, **kwargs):
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def format(self):
+        """Formats the statistics as a table sorted by the time."""
+        lines = ['%-36s %8s %10s %10s' % ('stage', 'calls', 'seconds', 'frames')]
+        for name, stats in sorted(self.stages.items(), key=lambda item: -item[1].seconds):
+            lines.append('%-36s %8d %10.4f %10d' % (name, stats.calls, stats.seconds, stats.frames))
+        return '\n'.join(lines)
+
+
+class _Stage(object):
+    __slots__ = ('profile', 'name', 'frames', 'start')
+
+    def __init__(self, profile, name, frames):
+        self.profile = profile
+        self.name = name
+        self.frames = frames
+
+    def __enter__(self):
+        self.start = timer()
+        return self
+
+    def __exit__(self, *args):
+        self.profile.record(self.name, timer() - self.start, self.frames)
+
+
+class _NullStage(object):
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+
+_null_stage = _NullStage()
+
+_profile = None
+
+
+@contextmanager
+def profile(callback=None):
+    """
+    Context manager activating a new profile.
+
+    :param callback: optional function (stage name, seconds, frames) called for each recorded stage
+    :returns: the Profile instance
+    """
+    global _profile
+    previous = _profile
+    _profile = Profile(callback)
+    try:
+        yield _profile
+    finally:
+        _profile = previous
+
+
+def get_profile():
+    """Returns the active profile or None."""
+    return _profile
+
+
+def stage(name, frames=0):
+    """
+    Context manager timing a stage if a profile is active.
+
+    :param name: stage name (eg. sine.tracking)
+    :param frames: number of frames processed in the stage
+    """
+    if _profile is None:
+        return _null_stage
+    return _Stage(_profile, name, frames)
+
+
+def iterate(name, iterable, frames=None):
+    """
+    Iterates over an iterable, timing the production of each item as a stage.
+
+    :param name: stage name
+    :param iterable: iterable (eg. a generator computing blocks of spectra)
+    :param frames: optional function computing the number of frames in an item
+    """
+    iterator = iter(iterable)
+    while True:
+        if _profile is None:
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+        else:
+            profile = _profile
+            start = timer()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            profile.record(name, timer() - start, frames(item) if frames is not None else 0)
+        yield item
+
+
+def profiled(name):
+    """Decorator timing each call of a function as a stage."""
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _profile is None:
+                return func(*args, **kwargs)
+            with stage(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
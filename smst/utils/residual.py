@@ -1,10 +1,12 @@
 import numpy as np
-from scipy.fftpack import fft, ifft, fftshift
-from scipy.signal import resample, blackmanharris, triang
+from scipy.signal import resample
 
-from .native import spec_synth
+from . import profiling, synth
+from .fft import fft, ifft, fftshift
 from .math import to_db_magnitudes
+from .window import blackman_harris_window, synthesis_window
 
+@profiling.profiled('residual.subtract_sinusoids')
 def subtract_sinusoids(x, N, H, sfreq, smag, sphase, fs):
     """
     Subtracts sinusoids from a sound.
@@ -18,20 +20,21 @@ def subtract_sinusoids(x, N, H, sfreq, smag, sphase, fs):
     :returns: xr: residual sound
     """
 
+    if np.ndim(x) != 1:  # the sinusoids are of a single channel
+        raise ValueError("Only the sinusoids of a mono sound can be subtracted")
+
     hN = N / 2  # half of fft size
     x = np.append(np.zeros(hN), x)  # add zeros at beginning to center first window at sample 0
     x = np.append(x, np.zeros(hN))  # add zeros at the end to analyze last sample
-    bh = blackmanharris(N)  # blackman harris window
-    w = bh / sum(bh)  # normalize window
-    sw = np.zeros(N)  # initialize synthesis window
-    sw[hN - H:hN + H] = triang(2 * H) / w[hN - H:hN + H]  # synthesis window
+    w = blackman_harris_window(N)  # normalized blackman harris window
+    sw = synthesis_window(N, H)  # synthesis window
     L = sfreq.shape[0]  # number of frames, this works if no sines
     xr = np.zeros(x.size)  # initialize output array
     pin = 0
     for l in range(L):
         xw = x[pin:pin + N] * w  # window the input sound
         X = fft(fftshift(xw))  # compute FFT
-        Yh = spec_synth.genSpecSines(N * sfreq[l, :] / fs, smag[l, :], sphase[l, :], N)  # generate spec sines
+        Yh = synth.spectrum_for_sinusoids(sfreq[l, :], smag[l, :], sphase[l, :], N, fs)  # generate spec sines
         Xr = X - Yh  # subtract sines from original spectrum
         xrw = np.real(fftshift(ifft(Xr)))  # inverse FFT
         xr[pin:pin + N] += xrw * sw  # overlap-add
@@ -42,6 +45,7 @@ def subtract_sinusoids(x, N, H, sfreq, smag, sphase, fs):
 
 
 # TODO: unused code
+@profiling.profiled('residual.subtract_sinusoids_with_stochastic_residual')
 def subtract_sinusoids_with_stochastic_residual(x, N, H, sfreq, smag, sphase, fs, stocf):
     """
     Subtracts sinusoids from a sound and approximate the residual with an envelope.
@@ -57,17 +61,19 @@ def subtract_sinusoids_with_stochastic_residual(x, N, H, sfreq, smag, sphase, fs
     :returns: stocEnv: stochastic approximation of residual
     """
 
+    if np.ndim(x) != 1:  # the sinusoids are of a single channel
+        raise ValueError("Only the sinusoids of a mono sound can be subtracted")
+
     hN = N / 2  # half of fft size
     x = np.append(np.zeros(hN), x)  # add zeros at beginning to center first window at sample 0
     x = np.append(x, np.zeros(hN))  # add zeros at the end to analyze last sample
-    bh = blackmanharris(N)  # synthesis window
-    w = bh / sum(bh)  # normalize synthesis window
+    w = blackman_harris_window(N)  # normalized synthesis window
     L = sfreq.shape[0]  # number of frames, this works if no sines
     pin = 0
     for l in range(L):
         xw = x[pin:pin + N] * w  # window the input sound
         X = fft(fftshift(xw))  # compute FFT
-        Yh = spec_synth.genSpecSines(N * sfreq[l, :] / fs, smag[l, :], sphase[l, :], N)  # generate spec sines
+        Yh = synth.spectrum_for_sinusoids(sfreq[l, :], smag[l, :], sphase[l, :], N, fs)  # generate spec sines
         Xr = X - Yh  # subtract sines from original spectrum
         mXr = to_db_magnitudes(Xr[:hN])  # magnitude spectrum of residual
         mXrenv = resample(np.maximum(-200, mXr), mXr.size * stocf)  # decimate the mag spectrum
@@ -1,22 +1,29 @@
 import numpy as np
 
 from .window import blackman_harris_lobe
-from .native import spec_synth
+from . import native
 from .math import from_db_magnitudes
 
+
 def spectrum_for_sinusoids(ipfreq, ipmag, ipphase, N, fs):
     """
-    Generates a spectrum from a series of sine values, calling a C function.
+    Generates a spectrum from a series of sine values, calling a C function
+    or the Python implementation if selected via `smst.utils.native`.
 
     :param ipfreq: sine peaks frequencies
     :param ipmag: sine peaks magnitudes
     :param ipphase: sine peaks phases
-    :param N: size of the complex spectrum to generate
+    :param N: size of the complex spectrum to generate (even, eg. a fast FFT size)
     :param fs: sampling frequency
     :returns: Y: generated complex spectrum of sines
     """
 
-    Y = spec_synth.genSpecSines(N * ipfreq / float(fs), ipmag, ipphase, N)
+    if N % 2 != 0:  # the lobes are mirrored around the Nyquist bin N / 2
+        raise ValueError("Spectrum size (N) must be even")
+
+    if not native.use_native():
+        return spectrum_for_sinusoids_py(ipfreq, ipmag, ipphase, N, fs)
+    Y = native.spec_synth.genSpecSines(N * ipfreq / float(fs), ipmag, ipphase, N)
     return Y
 
 
@@ -45,8 +52,8 @@ def spectrum_for_sinusoids_py(ipfreq, ipmag, ipphase, N, fs):
         for m in range(0, 9):
             if b[m] < 0:  # peak lobe crosses DC bin
                 Y[-b[m]] += lmag[m] * np.exp(-1j * ipphase[i])
-            elif b[m] > hN:  # peak lobe croses Nyquist bin
-                Y[b[m]] += lmag[m] * np.exp(-1j * ipphase[i])
+            elif b[m] > hN:  # peak lobe crosses Nyquist bin, fold it back as DC does
+                Y[N - b[m]] += lmag[m] * np.exp(-1j * ipphase[i])
             elif b[m] == 0 or b[m] == hN:  # peak lobe in the limits of the spectrum
                 Y[b[m]] += lmag[m] * np.exp(1j * ipphase[i]) + lmag[m] * np.exp(-1j * ipphase[i])
             else:  # peak lobe in positive freq. range
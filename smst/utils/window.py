@@ -1,4 +1,94 @@
 import numpy as np
+from scipy.signal import blackmanharris, get_window as scipy_get_window, hanning, triang
+
+from .cache import LRUCache, memoize, read_only
+
+# windows passed to and returned by normalize_window(), keyed by their id(),
+# values are pairs (window, normalized window)
+_normalized_windows = LRUCache(maxsize=16)
+
+
+def get_window(window, size):
+    """
+    Returns an analysis window by its type, caching the result.
+
+    :param window: window type (rectangular, hanning, hamming, blackman, blackmanharris, ...)
+    :param size: window size
+    :returns: w: read-only window samples
+    """
+    if isinstance(window, list):  # scipy allows windows with parameters
+        window = tuple(window)
+    return _get_window(window, size)
+
+
+@memoize(maxsize=32)
+def _get_window(window, size):
+    return read_only(scipy_get_window(window, size))
+
+
+def normalize_window(w):
+    """
+    Normalizes an analysis window so that its samples sum to one.
+
+    The result is read-only and remembered, so that normalizing it again
+    (eg. in every frame of the STFT) returns the same instance without
+    any computation. Read-only input windows (eg. from get_window()) are
+    remembered as well.
+
+    :param w: analysis window
+    :returns: normalized read-only window
+    """
+    entry = _normalized_windows.get(id(w))
+    if entry is not None and entry[0] is w:
+        return entry[1]
+    w_norm = read_only(w / sum(w))
+    _normalized_windows.put(id(w_norm), (w_norm, w_norm))
+    if not w.flags.writeable:  # immutable windows can be safely remembered
+        _normalized_windows.put(id(w), (w, w_norm))
+    return w_norm
+
+
+@memoize(maxsize=32)
+def blackman_harris_window(N):
+    """
+    Blackman-Harris window normalized to unit sum, as used for sinusoidal
+    subtraction and synthesis.
+
+    :param N: window size
+    :returns: read-only normalized window
+    """
+    bh = blackmanharris(N)
+    return read_only(bh / sum(bh))
+
+
+@memoize(maxsize=32)
+def synthesis_window(N, H):
+    """
+    Synthesis window for the overlap-add of sinusoids generated in the spectral
+    domain: a triangular window divided by the normalized Blackman-Harris
+    window the sinusoidal lobes were generated with.
+
+    :param N: synthesis FFT size
+    :param H: hop size
+    :returns: sw: read-only synthesis window
+    """
+    hN = N / 2
+    bh = blackman_harris_window(N)
+    sw = np.zeros(N)  # initialize synthesis window
+    sw[hN - H:hN + H] = triang(2 * H) / bh[hN - H:hN + H]  # normalized synthesis window
+    return read_only(sw)
+
+
+@memoize(maxsize=32)
+def hanning_window(N, gain=1):
+    """
+    Hanning window used for the stochastic analysis and synthesis.
+
+    :param N: window size
+    :param gain: factor the window is multiplied with
+    :returns: read-only window
+    """
+    return read_only(gain * hanning(N))
 
 
 def blackman_harris_lobe(x):
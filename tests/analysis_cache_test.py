@@ -0,0 +1,82 @@
+import os
+import shutil
+import tempfile
+
+import numpy as np
+from scipy.signal import get_window
+
+from smst.models import analysis_cache, hps, sine, stochastic
+from smst.utils import audio, fft, native
+from .common import sound_path
+
+
+def test_repeated_analysis_is_loaded_from_cache():
+    fs, x = audio.read_wav(sound_path("sax-phrase-short.wav"))
+    x = x[:20000]
+    w = get_window('hamming', 1001)
+    directory = tempfile.mkdtemp()
+    try:
+        with analysis_cache.use_cache(directory) as cache:
+            expected = sine.from_audio(x, fs, w, 1024, 256, -80)
+            # the same arguments, passed differently
+            actual = sine.from_audio(x, fs, w, 1024, 256, t=-80, maxnSines=100)
+            assert 1 == cache.hits
+
+            for expected_values, actual_values in zip(expected, actual):
+                assert np.array_equal(expected_values, actual_values)
+
+            stochastic.from_audio(x, 128, 256, 0.1)
+            stochastic.from_audio(x, 128, 256, 0.2)
+            stocEnv = stochastic.from_audio(x, 128, 256, 0.1)
+            assert isinstance(stocEnv, np.ndarray)
+            assert 2 == cache.hits
+        assert analysis_cache.get_cache() is None
+    finally:
+        shutil.rmtree(directory)
+
+
+def test_least_recently_used_entries_are_evicted():
+    x = np.random.RandomState(0).randn(8192)
+    directory = tempfile.mkdtemp()
+    try:
+        with analysis_cache.use_cache(directory, max_bytes=60000) as cache:
+            for stocf in (0.1, 0.2, 0.3, 0.4, 0.5):
+                stochastic.from_audio(x, 128, 256, stocf)
+            stochastic.from_audio(x, 128, 256, 0.5)
+            assert 1 == cache.hits
+            stochastic.from_audio(x, 128, 256, 0.1)
+            assert 1 == cache.hits
+    finally:
+        shutil.rmtree(directory)
+
+
+def test_implementations_have_separate_entries():
+    x = np.random.RandomState(0).randn(8192)
+    directory = tempfile.mkdtemp()
+    try:
+        with analysis_cache.use_cache(directory) as cache:
+            stochastic.from_audio(x, 128, 256, 0.1)
+            with native.use_implementation('python'):
+                stochastic.from_audio(x, 128, 256, 0.1)
+            with fft.use_backend('numpy'):
+                stochastic.from_audio(x, 128, 256, 0.1)
+            assert 0 == cache.hits
+            stochastic.from_audio(x, 128, 256, 0.1)
+            assert 1 == cache.hits
+    finally:
+        shutil.rmtree(directory)
+
+
+def test_nested_analysis_is_not_stored():
+    fs, x = audio.read_wav(sound_path("sax-phrase-short.wav"))
+    x = x[:20000]
+    w = get_window('blackman', 1201)
+    directory = tempfile.mkdtemp()
+    try:
+        with analysis_cache.use_cache(directory) as cache:
+            hps.from_audio(x, fs, w, 2048, 256, -90, 30, 130, 300, 7, 0.01, 0.1, 512, 0.1)
+            assert 1 == len(os.listdir(directory))
+            hps.from_audio(x, fs, w, 2048, 256, -90, 30, 130, 300, 7, 0.01, 0.1, 512, 0.1)
+            assert 1 == cache.hits
+    finally:
+        shutil.rmtree(directory)
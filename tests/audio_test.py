@@ -0,0 +1,100 @@
+import os
+import wave
+
+import numpy as np
+import pytest
+
+from smst.models import dft, stft
+from smst.utils import audio
+from .common import sound_path
+
+
+def test_reader_matches_read_wav():
+    fs, x = audio.read_wav(sound_path("sax-phrase-short.wav"))
+
+    with audio.WavReader(sound_path("sax-phrase-short.wav")) as reader:
+        assert fs == reader.fs
+        assert len(x) == len(reader)
+        assert 1 == reader.channels
+
+        blocks = list(reader.blocks(10000))
+        assert np.array_equal(x, np.concatenate(blocks))
+        assert np.array_equal(x[-100:], reader.read(len(x) - 100))
+
+        # analysis frames padded with zeros at the boundaries
+        hM1, hM2 = dft.half_window_sizes(1001)
+        frames = list(stft.iterate_analysis_frames(stft.pad_signal(x, hM2), 256, hM1, hM2))
+        for l in (0, 1, len(frames) // 2, len(frames) - 1):
+            assert np.array_equal(frames[l], reader.read_frame(l * 256, hM1, hM2))
+
+
+def test_overlapping_blocks():
+    with audio.WavReader(sound_path("sax-phrase-short.wav")) as reader:
+        blocks = list(reader.blocks(1000, overlap=100))
+        assert np.array_equal(blocks[0][-100:], blocks[1][:100])
+        assert len(reader) == sum(len(b) for b in blocks) - 100 * (len(blocks) - 1)
+
+
+def test_writer_appends_blocks(tmpdir):
+    fs, x = audio.read_wav(sound_path("sax-phrase-short.wav"))
+    filename = os.path.join(str(tmpdir), 'float.wav')
+    with audio.WavWriter(filename, fs, sample_format='float32') as writer:
+        for start in range(0, len(x), 10000):
+            writer.write(x[start:start + 10000])
+
+    fs_written, y = audio.read_wav(filename)
+    assert fs == fs_written
+    assert np.array_equal(x, y)
+
+
+def test_writer_int24_with_clipping(tmpdir):
+    filename = os.path.join(str(tmpdir), 'int24.wav')
+    x = np.array([[0.0, 0.5, -0.5, 2.0, -2.0], [1.0, -1.0, 0.25, 0.0, 0.0]])
+    with audio.WavWriter(filename, 48000, channels=2, sample_format='int24') as writer:
+        writer.write(x)
+
+    wav = wave.open(filename)
+    assert (2, 3, 48000, 5) == (wav.getnchannels(), wav.getsampwidth(), wav.getframerate(), wav.getnframes())
+    data = np.frombuffer(wav.readframes(5), dtype=np.uint8).reshape(-1, 3)
+    wav.close()
+    samples = (data[:, 0].astype(np.int32) | (data[:, 1].astype(np.int32) << 8) |
+               (data[:, 2].astype(np.int8).astype(np.int32) << 16))
+    expected = (np.clip(x, -1, 1).T.ravel() * audio.INT24_FAC).astype(np.int32)
+    assert np.array_equal(expected, samples)
+
+
+def test_dither_is_unbiased(tmpdir):
+    filename = os.path.join(str(tmpdir), 'dither.wav')
+    lsb = 1.0 / audio.INT16_FAC
+    with audio.WavWriter(filename, 44100, dither=True, seed=1) as writer:
+        writer.write(np.zeros(10000))
+        writer.write(np.ones(10000) * 0.25 * lsb)
+
+    y = audio.read_wav(filename)[1] / lsb
+    assert set(np.round(y[:10000])) == {-1, 0, 1}
+    assert abs(np.mean(y[:10000])) < 0.02
+    assert abs(np.mean(y[10000:]) - 0.25) < 0.02
+
+
+def test_writer_wrong_channels(tmpdir):
+    with audio.WavWriter(os.path.join(str(tmpdir), 'mono.wav'), 44100) as writer:
+        with pytest.raises(ValueError):
+            writer.write(np.zeros((2, 100)))
+
+
+def test_int24_round_trip(tmpdir):
+    filename = os.path.join(str(tmpdir), 'int24.wav')
+    x = np.array([[0.0, 0.5, -0.5, 1.0, -1.0, 1e-6], [0.25, -0.25, 0.125, 0.0, 0.75, -1e-6]])
+    audio.write_wav(x, 48000, filename, sample_format='int24')
+    expected = (x * audio.INT24_FAC).astype(np.int32) / float(audio.INT24_FAC)
+
+    fs, y = audio.read_wav(filename)
+    assert 48000 == fs
+    assert np.allclose(expected, y, rtol=0, atol=1e-7)
+    with audio.WavReader(filename) as reader:
+        assert (2, 6) == (reader.channels, len(reader))
+        assert np.array_equal(y, reader.read())
+        assert np.array_equal(y[:, 2:4], reader.read(2, 2))
+
+    audio.write_wav(x[0], 48000, filename, sample_format='int24')
+    assert np.array_equal(y[0], audio.read_wav(filename)[1])
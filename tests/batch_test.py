@@ -0,0 +1,32 @@
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pytest
+
+from smst.models import storage
+from smst.ui import batch
+from .common import sound_path
+
+
+def test_batch_analysis_writes_outputs():
+    output_dir = tempfile.mkdtemp()
+    try:
+        stats = batch.run('stochastic', [sound_path('ocean.wav')], output_dir, params={'stocf': 0.2}, workers=1)
+
+        assert 1 == stats['files']
+        assert 0 == stats['failed']
+        assert stats['audio_seconds'] > 0
+
+        outputs, metadata = storage.load(os.path.join(output_dir, 'ocean_stochastic'))
+        assert outputs['stocEnv'].ndim == 2
+        assert np.float32 == outputs['stocEnv'].dtype
+        assert 0.2 == metadata['params']['stocf']
+    finally:
+        shutil.rmtree(output_dir)
+
+
+def test_unknown_model_parameter():
+    with pytest.raises(ValueError):
+        batch.model_params('sine', {'nH': 10})
@@ -0,0 +1,25 @@
+import inspect
+import itertools
+
+import pytest
+
+from benchmarks import bench_models, bench_transformations
+
+
+def benchmark_classes():
+    for module in (bench_models, bench_transformations):
+        for name, cls in inspect.getmembers(module, inspect.isclass):
+            if cls.__module__ == module.__name__ and not name.startswith('_') and hasattr(cls, 'params'):
+                yield cls
+
+
+@pytest.mark.parametrize('cls', list(benchmark_classes()), ids=lambda cls: cls.__name__)
+def test_benchmarks_run(cls):
+    # run each benchmark once with the first combination of parameters to keep the suite working
+    args = next(itertools.product(*cls.params))
+    benchmark = cls()
+    benchmark.setup(*args)
+    methods = [name for name in dir(benchmark) if name.startswith(('time_', 'peakmem_'))]
+    assert methods
+    for name in methods:
+        getattr(benchmark, name)(*args)
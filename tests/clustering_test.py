@@ -0,0 +1,57 @@
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pytest
+
+from smst.corpus import clustering
+
+TRUE_CENTERS = np.array([[0., 0, 0], [10, 0, 5], [0, 10, -5], [10, 10, 10]])
+
+
+def blobs(n, seed=0):
+    random = np.random.RandomState(seed)
+    return TRUE_CENTERS[random.randint(len(TRUE_CENTERS), size=n)] + random.randn(n, 3)
+
+
+def assert_found_centers(centers):
+    for center in TRUE_CENTERS:
+        assert np.min(np.sum((centers - center) ** 2, axis=1)) < 0.1
+
+
+def test_fit_memory_mapped_points():
+    directory = tempfile.mkdtemp()
+    try:
+        path = os.path.join(directory, 'points.npy')
+        np.save(path, blobs(50000))
+        X = np.load(path, mmap_mode='r')
+        kmeans = clustering.MiniBatchKMeans(4, batch_size=500, max_iter=50, seed=1).fit(X)
+        assert_found_centers(kmeans.centers)
+        assert 50 == kmeans.n_iter == len(kmeans.inertia_history)
+        assert kmeans.inertia_history[-1] < kmeans.inertia_history[0]
+        # the mean squared distance is about the variance of the blobs (3 unit dimensions)
+        assert abs(kmeans.inertia(X) / len(X) - 3) < 0.2
+
+        labels = kmeans.predict(X, block_size=7000)
+        assert (50000,) == labels.shape
+        assert np.array_equal(clustering.assign(np.asarray(X), kmeans.centers)[0], labels)
+    finally:
+        shutil.rmtree(directory)
+
+
+def test_fit_chunks_with_warm_start():
+    X = blobs(20000, seed=2)
+    kmeans = clustering.MiniBatchKMeans(4, batch_size=1000, warm_start=True, seed=3)
+    kmeans.fit_chunks(clustering.iterate_chunks(X[:10000], 5000))
+    assert 10 == kmeans.n_iter
+    counts = kmeans.counts.copy()
+    # the second call continues from the current centers
+    kmeans.fit_chunks(clustering.iterate_chunks(X[10000:], 5000))
+    assert 20 == kmeans.n_iter
+    assert np.all(kmeans.counts >= counts)
+    assert 20000 == kmeans.counts.sum()
+    assert_found_centers(kmeans.centers)
+
+    with pytest.raises(ValueError):
+        clustering.MiniBatchKMeans(4, init=np.zeros((3, 3))).fit(X)
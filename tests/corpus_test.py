@@ -0,0 +1,41 @@
+import shutil
+import tempfile
+
+import numpy as np
+import pytest
+
+from smst.corpus import extraction, table as corpus_table
+from smst.utils import audio
+from .common import sound_path
+
+
+def test_extract_writes_table():
+    table_dir = tempfile.mkdtemp()
+    try:
+        files = [sound_path(name) for name in ['flute-A4.wav', 'sine-440.wav', 'ocean.wav']]
+        failed = extraction.extract(files, table_dir, workers=2)
+        assert [] == failed
+
+        table = corpus_table.load(table_dir)
+        assert ['flute-A4.wav', 'sine-440.wav', 'ocean.wav'] == table.names
+        assert isinstance(table['centroid.mean'], np.memmap)
+        assert (3, 13) == table['mfcc.mean'].shape
+        # the flute is pitched at A4, the noise is brighter than the sine
+        assert abs(table['pitch.mean'][0] - 440) < 10
+        assert table['pitch.ratio'][0] > 0.9
+        assert table['centroid.mean'][2] > table['centroid.mean'][1]
+
+        fs, x = audio.read_wav(files[0])
+        expected = extraction.sound_descriptors(x, fs)
+        assert np.allclose(expected['mfcc.mean'], table['mfcc.mean'][0], rtol=1e-5, atol=1e-4)
+
+        features, labels = table.features(['centroid.mean', 'mfcc.mean'])
+        assert (3, 14) == features.shape
+        assert ['centroid.mean', 'mfcc.mean.0'] == labels[:2]
+    finally:
+        shutil.rmtree(table_dir)
+
+
+def test_unknown_extraction_parameter():
+    with pytest.raises(ValueError):
+        extraction.extraction_params({'maxnSines': 10})
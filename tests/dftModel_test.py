@@ -1,7 +1,9 @@
 import numpy as np
+import pytest
 from scipy.signal import get_window
 
 from smst.models import dft
+from smst.utils.math import is_fast_fft_size, next_fast_size
 
 def test_simple_sinusoid():
     window_size = 1024
@@ -16,3 +18,29 @@ def test_simple_sinusoid():
     assert round(mag_spectrum.max()) == -6
     assert round(mag_spectrum.mean()) == -147
     assert np.allclose(x_reconstructed, x * window)
+
+
+def test_fast_fft_sizes():
+    assert is_fast_fft_size(1280)
+    assert is_fast_fft_size(2048)
+    assert not is_fast_fft_size(1201)
+    assert not is_fast_fft_size(1215)  # odd
+    assert not is_fast_fft_size(1274)  # 2 * 7^2 * 13
+    assert 1250 == next_fast_size(1201)
+    assert 2048 == next_fast_size(2048)
+    assert 6 == next_fast_size(5)
+
+
+def test_non_power_of_two_size():
+    window_size, fft_size = 1201, 1280
+    x = np.cos(2 * np.pi * 0.1 * np.arange(window_size))
+    window = get_window('hamming', window_size)
+    mag_spectrum, phase_spectrum = dft.from_audio(x, window, fft_size)
+    x_reconstructed = dft.to_audio(mag_spectrum, phase_spectrum, window_size)
+
+    assert fft_size / 2 + 1 == mag_spectrum.size
+    assert mag_spectrum.argmax() == 128
+    assert np.allclose(x_reconstructed, x * window / sum(window))
+
+    with pytest.raises(ValueError):
+        dft.from_audio(x, window, 1274)
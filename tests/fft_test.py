@@ -0,0 +1,43 @@
+import warnings
+
+import numpy as np
+import pytest
+from scipy.signal import get_window
+
+from smst.models import stft
+from smst.utils import fft
+
+
+def test_backends_give_same_spectrogram():
+    x = np.random.RandomState(0).randn(4096)
+    w = get_window('hamming', 511)
+    mX_default, pX_default = stft.from_audio(x, w, 512, 128)
+
+    with fft.use_backend('numpy'):
+        assert 'numpy' == fft.get_backend().name
+        mX, pX = stft.from_audio(x, w, 512, 128)
+
+    assert 'scipy.fftpack' == fft.get_backend().name
+    assert np.allclose(mX_default, mX)
+    assert np.allclose(pX_default, pX)
+
+
+def test_batched_transform_along_axis():
+    x = np.random.RandomState(0).randn(3, 64)
+    X = fft.fft(x, axis=-1)
+    assert np.allclose(np.fft.fft(x[1]), X[1])
+    assert np.allclose(x, np.real(fft.ifft(X, axis=-1)))
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        fft.set_backend('no-such-fft')
+
+
+def test_unknown_backend_in_environment_falls_back(monkeypatch):
+    monkeypatch.setenv('SMST_FFT_BACKEND', 'no-such-fft')
+    with fft.use_backend('numpy'), warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always')
+        fft._set_default_backend()
+        assert 'scipy.fftpack' == fft.get_backend().name
+    assert 1 == len(caught)
@@ -39,4 +39,17 @@ def test_reconstruct_sound():
     # TODO: this is completely off, it should be equal to len(x)!
     assert 69 * 2048 == len(x_reconstructed)
 
-    assert np.allclose(0.036941947007791701, rmse(x, x_reconstructed[:len(x)]))
+    assert np.allclose(0.03543321844744073, rmse(x, x_reconstructed[:len(x)]))
+
+
+def test_find_harmonics_closest_peaks():
+    pfreq = np.array([95., 205., 290., 420.])
+    pmag = np.array([-10., -20., -30., -40.])
+    pphase = np.array([0.1, 0.2, 0.3, 0.4])
+
+    hfreq, hmag, hphase = harmonic.find_harmonics(pfreq, pmag, pphase, 100., 6, [], 1200)
+
+    # the 5th harmonic is too far from any peak, the 6th one is above the Nyquist frequency
+    assert np.array_equal([95., 205., 290., 420., 0., 0.], hfreq)
+    assert np.array_equal([-10., -20., -30., -40., -100., -100.], hmag)
+    assert np.array_equal([0.1, 0.2, 0.3, 0.4, 0., 0.], hphase)
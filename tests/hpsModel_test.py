@@ -45,7 +45,7 @@ def test_reconstruct_sound():
     # TODO: this is insane
     assert 1085 * 128 == len(x_stochastic)
 
-    assert np.allclose(0.038065851967889502, rmse(x[:len(x_reconstructed)], x_reconstructed))
-    assert np.allclose(0.025543282494159769, rmse(x[:len(x_reconstructed)], x_sine))
-    assert np.allclose(0.097999320671614418, rmse(x[:len(x_reconstructed)], x_stochastic[:len(x_reconstructed)]))
+    assert np.allclose(0.037807255233962646, rmse(x[:len(x_reconstructed)], x_reconstructed))
+    assert np.allclose(0.025469877706330735, rmse(x[:len(x_reconstructed)], x_sine))
+    assert np.allclose(0.0979177403261334, rmse(x[:len(x_reconstructed)], x_stochastic[:len(x_reconstructed)]))
     assert np.allclose(0.0, rmse(x_sine + x_stochastic[:len(x_reconstructed)], x_reconstructed))
@@ -0,0 +1,73 @@
+import os
+
+import numpy as np
+import pytest
+from scipy.signal import get_window
+
+from smst.models import harmonic, hps, sine, sps, stft, stochastic
+from smst.utils import audio
+from .common import sound_path
+
+
+def stereo_sound():
+    fs, x = audio.read_wav(sound_path("sax-phrase-short.wav"))
+    x = x[:20000]
+    return fs, np.vstack([x, 0.5 * x[::-1]])
+
+
+def test_read_write_stereo_48k(tmpdir):
+    _, x = stereo_sound()
+    filename = os.path.join(str(tmpdir), 'stereo.wav')
+    audio.write_wav(x, 48000, filename)
+
+    fs, y = audio.read_wav(filename)
+    assert 48000 == fs
+    assert x.shape == y.shape
+    assert np.allclose(x, y, atol=1e-4)
+
+
+def test_stft_channels_match_mono():
+    _, x = stereo_sound()
+    w = get_window('hamming', 1001)
+    mX, pX = stft.from_audio(x, w, 1024, 256)
+    assert 3 == mX.ndim
+    for channel in range(2):
+        mX_mono, pX_mono = stft.from_audio(x[channel], w, 1024, 256)
+        assert np.allclose(mX_mono, mX[channel])
+        assert np.allclose(pX_mono, pX[channel])
+
+    y = stft.to_audio(mX, pX, 1001, 256)
+    assert (2, x.shape[1]) == y[:, :x.shape[1]].shape
+
+
+def test_models_channels_match_mono():
+    fs, x = stereo_sound()
+    w = get_window('blackman', 1201)
+    outputs = [
+        (sine.from_audio, lambda x: sine.from_audio(x, fs, w, 2048, 256, -80, 50)),
+        (harmonic.from_audio, lambda x: harmonic.from_audio(x, fs, w, 2048, 256, -90, 30, 130, 300, 7)),
+        (stochastic.from_audio, lambda x: (stochastic.from_audio(x, 128, 256, 0.1),)),
+    ]
+    for _, analyze in outputs:
+        stereo = analyze(x)
+        for channel in range(2):
+            mono = analyze(x[channel])
+            for stereo_output, mono_output in zip(stereo, mono):
+                assert np.allclose(mono_output, stereo_output[channel])
+
+
+def test_residual_models_reject_multichannel():
+    fs, x = stereo_sound()
+    w = get_window('blackman', 1201)
+    with pytest.raises(ValueError):
+        hps.from_audio(x, fs, w, 2048, 256, -90, 30, 130, 300, 7, 0.01, 0.1, 512, 0.1)
+    with pytest.raises(ValueError):
+        sps.from_audio(x, fs, w, 2048, 256, -80, 0.02, 50, 20, 0.01, 0.1)
+
+
+def test_read_wav_mixes_down(tmpdir):
+    _, x = stereo_sound()
+    filename = os.path.join(str(tmpdir), 'stereo.wav')
+    audio.write_wav(x, 44100, filename)
+    fs, x_mono = audio.read_wav(filename, mono=True)
+    assert np.allclose(np.mean(audio.read_wav(filename)[1], axis=0), x_mono)
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from smst.utils import native, synth
+from smst.utils.native import parity
+
+
+def test_twm_parity():
+    stats = parity.compare_twm(trials=50)
+    assert 50 == stats['trials']
+    assert stats['max_rel_difference'] < 1e-9
+
+
+def test_spec_synth_parity():
+    stats = parity.compare_spec_synth(trials=20)
+    # the native lobe is the nearest sample of a table at 0.01 bin
+    assert stats['max_rel_difference'] < 0.01
+    assert stats['native_seconds_per_call'] > 0
+
+
+def test_spec_synth_fast_size_matches_power_of_two():
+    # the same sinusoids (in bins) have exactly the same lobes with a non-power of two fast FFT size
+    random = np.random.RandomState(2)
+    for _ in range(20):
+        count = random.randint(1, 101)
+        iploc = random.uniform(0, 1280 / 2 - 5, count)  # lobes below the Nyquist bin of the smaller size
+        ipmag = random.uniform(-100, 0, count)
+        ipphase = random.uniform(-np.pi, np.pi, count)
+        Y_fast = native.spec_synth.genSpecSines(iploc, ipmag, ipphase, 1280)
+        Y = native.spec_synth.genSpecSines(iploc, ipmag, ipphase, 2048)
+        assert np.array_equal(Y[:641], Y_fast[:641])  # positive frequencies
+        assert np.array_equal(Y[-639:], Y_fast[641:])  # negative frequencies
+        assert not np.any(Y[641:-639])
+
+    with pytest.raises(ValueError):
+        synth.spectrum_for_sinusoids(np.array([440.]), np.array([-20.]), np.array([0.]), 1215, 44100)
+
+
+def test_switch_implementation():
+    ipfreq, ipmag, ipphase, N, fs = parity.random_sinusoids(np.random.RandomState(1))
+    assert 'native' == native.get_implementation()
+    with native.use_implementation('python'):
+        assert not native.use_native()
+        Y = synth.spectrum_for_sinusoids(ipfreq, ipmag, ipphase, N, fs)
+    assert native.use_native()
+    assert np.array_equal(synth.spectrum_for_sinusoids_py(ipfreq, ipmag, ipphase, N, fs), Y)
+
+    with pytest.raises(ValueError):
+        native.set_implementation('fortran')
@@ -0,0 +1,50 @@
+import numpy as np
+from scipy.signal import get_window
+
+from smst.models import sine, stft
+from smst.utils import onsets
+
+fs = 44100
+H = 256
+
+
+def drum_loop():
+    # decaying noise bursts in silence at known frames
+    random = np.random.RandomState(0)
+    x = np.zeros(fs * 2)
+    onset_frames = np.array([20, 70, 95, 180, 300])
+    for frame in onset_frames:
+        burst = random.randn(4000) * np.exp(-np.arange(4000) / 800.0)
+        x[frame * H:frame * H + burst.size] += 0.5 * burst
+    return x, onset_frames
+
+
+def test_detects_onsets_in_batch_and_stream():
+    x, expected = drum_loop()
+    w = get_window('hann', 1024)
+    mX, pX = stft.from_audio(x, w, 1024, H)
+    for method in ['flux', 'hfc']:
+        detected = onsets.detect_onsets(mX, method)
+        assert len(expected) == len(detected)
+        assert np.all(np.abs(detected - expected) <= 2)
+
+        odf = onsets.onset_function(mX, method)
+        delta = 0.1 * odf.max()
+        batch = onsets.pick_peaks(odf, delta)
+        detector = onsets.OnsetDetector(method, delta)
+        streamed = [detector.process(mX_block)
+                    for mX_block, _ in stft.iterate_spectrogram_blocks(x, w, 1024, H, block_frames=37)]
+        streamed.append(detector.flush())
+        assert np.array_equal(batch, np.concatenate(streamed))
+
+
+def test_skipping_silent_frames():
+    x, _ = drum_loop()
+    w = get_window('blackman', 1001)
+    mX, pX = stft.from_audio(x, w, 2048, H)
+    active = onsets.active_frames(mX, -100)
+    assert 0 < active.sum() < active.size
+    expected = sine.from_spectrogram(mX, pX, fs, 2048, H, -80, 50)
+    outputs = sine.from_spectrogram(mX, pX, fs, 2048, H, -80, 50, activeFrames=active)
+    for expected_output, output in zip(expected, outputs):
+        assert np.array_equal(expected_output, output)
@@ -0,0 +1,31 @@
+import numpy as np
+from scipy.signal import get_window
+
+from smst.models import harmonic, parallel, sine
+from smst.utils import audio
+from .common import sound_path
+
+
+def sound():
+    fs, x = audio.read_wav(sound_path("sax-phrase-short.wav"))
+    return fs, x[:50000]
+
+
+def test_sine_matches_sequential():
+    fs, x = sound()
+    w = get_window('hamming', 1001)
+    expected = sine.from_audio(x, fs, w, 2048, 256, -80, 50, 0.02)
+    # the segments of 30 frames split the 196 frames into 7 parts
+    for workers in [1, 2]:
+        outputs = parallel.sine_from_audio(x, fs, w, 2048, 256, -80, 50, 0.02, workers=workers, segment_frames=30)
+        for expected_output, output in zip(expected, outputs):
+            assert np.array_equal(expected_output, output)
+
+
+def test_harmonic_matches_sequential():
+    fs, x = sound()
+    w = get_window('blackman', 1201)
+    expected = harmonic.from_audio(x, fs, w, 2048, 256, -90, 30, 130, 300, 7)
+    outputs = parallel.harmonic_from_audio(x, fs, w, 2048, 256, -90, 30, 130, 300, 7, workers=2, segment_frames=30)
+    for expected_output, output in zip(expected, outputs):
+        assert np.array_equal(expected_output, output)
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from smst.utils import peaks
+
+
+def test_peaks_at_zero_and_positive_db():
+    mX = np.array([-10, 0, -10, -20, 5, -20, -30, -25, -30])
+    assert [1, 4, 7] == list(peaks.find_peaks(mX, -50))
+    assert [1, 4] == list(peaks.find_peaks(mX, -20))
+
+
+def test_max_peaks_and_min_distance():
+    mX = np.array([-90, -10, -90, -20, -90, -90, -90, -30, -90, -5, -90])
+    assert [1, 9] == list(peaks.find_peaks(mX, -100, max_peaks=2))
+    assert [1, 9] == list(peaks.find_peaks(mX, -100, min_distance=3))
+    assert [9] == list(peaks.find_peaks(mX, -100, max_peaks=1, min_distance=3))
+
+
+def test_batch_matches_single_frames():
+    mX = np.random.RandomState(0).uniform(-100, 0, (5, 257))
+    batch = peaks.find_peaks(mX, -60, max_peaks=10, min_distance=2)
+    assert 5 == len(batch)
+    for frame, ploc in zip(mX, batch):
+        assert np.array_equal(peaks.find_peaks(frame, -60, max_peaks=10, min_distance=2), ploc)
+        assert len(ploc) <= 10
+
+
+def test_pruned_f0_search_finds_f0():
+    random = np.random.RandomState(0)
+    pfreq = np.sort(np.concatenate([220 * np.arange(1, 20), random.uniform(3000, 8000, 10)]))
+    pmag = random.uniform(-60, -20, pfreq.size)
+    for f0t in [0, 218.]:
+        assert 220 == peaks.find_fundamental_twm(pfreq, pmag, 5, 100, 1000, f0t)
+        assert 220 == peaks.find_fundamental_pruned(pfreq, pmag, 5, 100, 1000, f0t)
+    # no acceptable candidate
+    assert 0 == peaks.find_fundamental_pruned(pfreq, pmag, -100, 100, 1000, 218.)
+
+
+def test_pruned_f0_search_validates_f0_range():
+    pfreq = 220 * np.arange(1, 10.)
+    pmag = -20 * np.ones(pfreq.size)
+    # the previous f0 would be accepted before selecting the candidates
+    with pytest.raises(ValueError):
+        peaks.find_fundamental_pruned(pfreq, pmag, 5, -1, 1000, 220.)
+    with pytest.raises(ValueError):
+        peaks.find_fundamental_pruned(pfreq, pmag, 5, 100, 10000, 220.)
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+from scipy.signal import get_window
+
+from smst import pipeline
+from smst.models import sine
+from smst.utils import audio
+from .common import sound_path
+
+
+def test_sps_pipeline_recomputes_only_downstream():
+    p = pipeline.sps_pipeline(sound_path("sine-440-490.wav"), M=1001, N=1024, H=256, maxnSines=20)
+    y = p['output']
+    assert y.ndim == 1
+    fs, x = p['sound']
+    expected = sine.from_audio(x, fs, get_window('hamming', 1001), 1024, 256, -80, 20, 0.02, 10, 0.001)
+    for expected_output, output in zip(expected, p['tracks']):
+        assert np.array_equal(expected_output, output)
+
+    p.set('transformed', freqScaling=np.array([0, 1.5, 1, 1.5]))
+    p['output']
+    evaluations = dict((name, node.evaluations) for name, node in p.nodes.items())
+    assert 2 == evaluations['output']
+    assert 2 == evaluations['transformed']
+    assert 1 == evaluations['stochastic']
+    assert 1 == evaluations['spectrogram']
+
+    p.set('peaks', t=-60)
+    p['output']
+    assert 1 == p.nodes['spectrogram'].evaluations
+    assert 2 == p.nodes['tracks'].evaluations
+    assert 3 == p.nodes['output'].evaluations
+
+
+def test_custom_pipeline():
+    p = pipeline.Pipeline()
+    p.add('sound', audio.read_wav, filename=sound_path("sine-440.wav"))
+    p.add('double', lambda x: 2 * x, inputs=dict(x=('sound', 1)))
+    assert np.array_equal(2 * p['sound'][1], p['double'])
+    assert ['double'] == p.dependents('sound')
+
+    with pytest.raises(ValueError):
+        p.add('other', lambda x: x, inputs=dict(x='missing'))
+    with pytest.raises(ValueError):
+        p.set('double', y=1)
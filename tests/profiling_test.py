@@ -0,0 +1,40 @@
+import json
+
+import numpy as np
+from scipy.signal import get_window
+
+from smst.models import hps
+from smst.utils import audio, profiling, residual
+from .common import sound_path
+
+
+def test_profile_hps_stages():
+    fs, x = audio.read_wav(sound_path("sax-phrase-short.wav"))
+    x = x[:20000]
+    w = get_window('blackman', 1201)
+    recorded = []
+    with profiling.profile(callback=lambda name, seconds, frames: recorded.append(name)) as prof:
+        hfreq, hmag, hphase, stocEnv = hps.from_audio(x, fs, w, 2048, 128, -90, 30, 130, 300, 7, 0.01, 0.1, 512, 0.1)
+    assert profiling.get_profile() is None
+
+    stats = prof.to_dict()
+    for name in ['hps.from_audio', 'harmonic.from_audio', 'harmonic.spectrum', 'harmonic.peaks', 'harmonic.f0',
+                 'harmonic.harmonics', 'residual.subtract_sinusoids', 'stochastic.from_audio',
+                 'stochastic.spectrum', 'stochastic.envelope']:
+        assert name in stats
+    assert 1 == stats['hps.from_audio']['calls']
+    assert len(hfreq) == stats['harmonic.spectrum']['frames']
+    assert len(hfreq) == stats['harmonic.f0']['calls']
+    assert stats['hps.from_audio']['seconds'] >= stats['harmonic.from_audio']['seconds']
+    assert set(recorded) == set(stats)
+    assert stats == json.loads(prof.to_json())
+
+    with profiling.profile() as prof:
+        residual.subtract_sinusoids_with_stochastic_residual(x, 512, 128, hfreq, hmag, hphase, fs, 0.1)
+    assert 1 == prof.to_dict()['residual.subtract_sinusoids_with_stochastic_residual']['calls']
+
+
+def test_inactive_profile():
+    with profiling.stage('nothing'):
+        pass
+    assert [1, 2] == list(profiling.iterate('nothing', iter([1, 2])))
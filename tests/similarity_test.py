@@ -0,0 +1,31 @@
+import numpy as np
+
+from smst.corpus import similarity
+
+
+def test_backends_find_nearest_neighbours():
+    np.random.seed(1)
+    features = np.random.randn(500, 5) * [1, 10, 100, 1, 0.1]
+    queries = np.random.randn(20, 5) * [1, 10, 100, 1, 0.1]
+    expected_index = similarity.SimilarityIndex(features, backend='brute', block_size=7)
+    expected_distances, expected_rows = expected_index.query(queries, k=4)
+    points = expected_index.transform(features)
+    for q, rows in zip(expected_index.transform(queries), expected_rows):
+        assert np.array_equal(np.argsort(np.sum((points - q) ** 2, axis=1))[:4], rows)
+
+    distances, rows = similarity.SimilarityIndex(features, backend='kdtree').query(queries, k=4)
+    assert np.array_equal(expected_rows, rows)
+    assert np.allclose(expected_distances, distances)
+
+    distances, rows = expected_index.query(queries[0], k=600)
+    assert (600,) == rows.shape
+    assert np.all(rows[500:] == -1) and np.all(np.isinf(distances[500:]))
+
+
+def test_similar_leaves_out_the_point_and_missing_features():
+    features = np.array([[0., 0], [1, 0], [0, 3], [np.nan, 0], [5, 5]])
+    for backend in ['brute', 'kdtree']:
+        index = similarity.SimilarityIndex(features, names=list('abcde'), backend=backend, normalize=False)
+        similar = index.similar('a', k=3)
+        assert ['b', 'c', 'e'] == [name for name, _ in similar]
+        assert np.allclose([1, 3, np.sqrt(50)], [distance for _, distance in similar])
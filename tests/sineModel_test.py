@@ -39,4 +39,14 @@ def test_reconstruct_sound():
     # TODO: this is completely off, it should be equal to len(x)!
     assert 69 * 2048 == len(x_reconstructed)
 
-    assert np.allclose(0.010812475879315771, rmse(x, x_reconstructed[:len(x)]))
+    assert np.allclose(0.008644059973213476, rmse(x, x_reconstructed[:len(x)]))
+
+
+def test_preselected_peaks_give_same_tracks():
+    fs, x = audio.read_wav(sound_path("sax-phrase-short.wav"))
+    x = x[:20000] + 0.05 * np.random.RandomState(0).randn(20000)
+    w = get_window('hamming', 1001)
+    tracks = sine.from_audio(x, fs, w, 1024, 256, -100, 20, 0.02)
+    preselected = sine.from_audio(x, fs, w, 1024, 256, -100, 20, 0.02, preselectPeaks=True)
+    for output, preselected_output in zip(tracks, preselected):
+        assert np.array_equal(output, preselected_output)
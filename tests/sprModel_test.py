@@ -45,4 +45,4 @@ def test_reconstruct_sound():
     assert 1083 * 128 == len(x_sine)
 
     assert np.allclose(2.1079553110776107e-17, rmse(x[:len(x_reconstructed)], x_reconstructed))
-    assert np.allclose(0.0043912712540510645, rmse(x[:len(x_reconstructed)], x_sine))
+    assert np.allclose(0.0045198572813598525, rmse(x[:len(x_reconstructed)], x_sine))
@@ -44,7 +44,7 @@ def test_reconstruct_sound():
     # TODO: this is insane
     assert 1085 * 128 == len(x_stochastic)
 
-    assert np.allclose(0.0061891379818097133, rmse(x[:len(x_reconstructed)], x_reconstructed))
-    assert np.allclose(0.0043912712540510645, rmse(x[:len(x_reconstructed)], x_sine))
-    assert np.allclose(0.093780097561056638, rmse(x[:len(x_reconstructed)], x_stochastic[:len(x_reconstructed)]))
+    assert np.allclose(0.00633377477318931, rmse(x[:len(x_reconstructed)], x_reconstructed))
+    assert np.allclose(0.0045198572813598525, rmse(x[:len(x_reconstructed)], x_sine))
+    assert np.allclose(0.09378306803966792, rmse(x[:len(x_reconstructed)], x_stochastic[:len(x_reconstructed)]))
     assert np.allclose(0.0, rmse(x_sine + x_stochastic[:len(x_reconstructed)], x_reconstructed))
@@ -0,0 +1,62 @@
+import shutil
+import tempfile
+
+import numpy as np
+from scipy.signal import get_window
+
+from smst.models import harmonic, storage
+from smst.utils import audio
+from .common import sound_path
+
+
+def analyze():
+    fs, x = audio.read_wav(sound_path("sax-phrase-short.wav"))
+    w = get_window('blackman', 601)
+    hfreq, hmag, hphase = harmonic.from_audio(x[:20000], fs, w, 1024, 256, -100, 50, 350, 700, 5)
+    return dict(hfreq=hfreq, hmag=hmag, hphase=hphase, stocEnv=np.random.RandomState(0).randn(hfreq.shape[0], 13))
+
+
+def test_lossless_sparse_round_trip():
+    outputs = analyze()
+    path = tempfile.mkdtemp()
+    try:
+        storage.save(path, 'harmonic', outputs, params=dict(N=1024, H=256, t=-100.0), dtype=np.float64)
+        loaded, metadata = storage.load(path, mmap=True)
+
+        assert 'harmonic' == metadata['model']
+        assert 256 == metadata['params']['H']
+        assert 'sparse' == metadata['arrays']['hfreq']['layout']
+        assert 'dense' == metadata['arrays']['stocEnv']['layout']
+        for name, values in outputs.items():
+            assert np.array_equal(values, loaded[name])
+    finally:
+        shutil.rmtree(path)
+
+
+def test_compressed_quantized_frame_range():
+    outputs = analyze()
+    path = tempfile.mkdtemp()
+    try:
+        storage.save(path, 'harmonic', outputs, dtype=np.float16, compress=True, chunk_bytes=64)
+        loaded, _ = storage.load(path, frames=(10, 30))
+
+        for name, values in outputs.items():
+            assert np.float16 == loaded[name].dtype
+            assert values[10:30].shape == loaded[name].shape
+            assert np.allclose(values[10:30], loaded[name], rtol=1e-3, atol=1e-2)
+    finally:
+        shutil.rmtree(path)
+
+
+def test_drop_empty_track_slots():
+    outputs = analyze()
+    path = tempfile.mkdtemp()
+    try:
+        storage.save(path, 'harmonic', outputs, keep_empty_slots=False)
+        loaded, metadata = storage.load(path)
+
+        assert 'sparse' == metadata['arrays']['hmag']['layout']
+        support = outputs['hfreq'] != 0
+        assert np.allclose(outputs['hmag'][support], loaded['hmag'][support])
+    finally:
+        shutil.rmtree(path)
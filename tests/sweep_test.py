@@ -0,0 +1,39 @@
+import numpy as np
+from scipy.signal import get_window
+
+from smst.models import harmonic, sine, sweep
+from smst.utils import audio
+from .common import sound_path
+
+
+def sound():
+    fs, x = audio.read_wav(sound_path("sax-phrase-short.wav"))
+    return fs, x[:30000]
+
+
+def test_sine_sweep_matches_analysis():
+    fs, x = sound()
+    w = get_window('hamming', 1001)
+    grid = dict(t=[-80, -60], maxnSines=[20, 50], minSineDur=0.02)
+    for workers in [1, 2]:
+        results = sweep.sine_sweep(x, fs, w, 2048, 256, grid, workers=workers)
+        assert [result['params'] for result in results] == sweep.parameter_grid(grid)
+        for result in results:
+            expected = sine.from_audio(x, fs, w, 2048, 256, **result['params'])
+            for expected_output, output in zip(expected, result['outputs']):
+                assert np.array_equal(expected_output, output)
+    errors = dict((result['params']['t'], result['error']) for result in results if result['params']['maxnSines'] == 50)
+    # a lower threshold keeps more peaks and reconstructs the sound better
+    assert errors[-80] < errors[-60]
+
+
+def test_harmonic_sweep_matches_analysis():
+    fs, x = sound()
+    w = get_window('blackman', 1201)
+    grid = dict(t=-90, nH=30, minf0=130, maxf0=[300, 400], f0et=[5, 7])
+    results = sweep.harmonic_sweep(x, fs, w, 2048, 256, grid, workers=1, keep_outputs=True)
+    assert len(results) == 4
+    for result in results:
+        expected = harmonic.from_audio(x, fs, w, 2048, 256, **result['params'])
+        for expected_output, output in zip(expected, result['outputs']):
+            assert np.array_equal(expected_output, output)
@@ -0,0 +1,48 @@
+import numpy as np
+from scipy.signal import get_window
+
+from smst.models import sine
+from smst.models.synthesis_cache import SynthesisCache
+from smst.utils import audio
+from .common import sound_path
+
+
+def analyze():
+    fs, x = audio.read_wav(sound_path("sax-phrase-short.wav"))
+    w = get_window('hamming', 1001)
+    return (fs,) + sine.from_audio(x[:30000], fs, w, 2048, 256, -80, 50, 0.02)
+
+
+def test_rerender_changed_frames():
+    fs, tfreq, tmag, tphase = analyze()
+    cache = SynthesisCache(512, 128, fs)
+    y = cache.render(tfreq, tmag, tphase)
+    assert len(tfreq) == cache.rendered_frames
+    # (sine.to_audio() wraps the given phases in place)
+    assert np.array_equal(sine.to_audio(tfreq, tmag, tphase.copy(), 512, 128, fs), y)
+
+    assert np.array_equal(y, cache.render(tfreq, tmag, tphase))
+    assert 0 == cache.rendered_frames
+
+    edited = tfreq.copy()
+    edited[50:60] *= 1.5
+    y_edited = cache.render(edited, tmag, tphase)
+    # the changed frames and their overlap-add neighbours
+    assert cache.rendered_frames == 10 + 2 * (512 / 128 - 1)
+    assert np.array_equal(sine.to_audio(edited, tmag, tphase.copy(), 512, 128, fs), y_edited)
+
+
+def test_rerender_with_propagated_phases():
+    fs, tfreq, tmag, _ = analyze()
+    no_phases = np.array([])
+    np.random.seed(1)
+    cache = SynthesisCache(512, 128, fs)
+    cache.render(tfreq, tmag, no_phases)
+
+    edited = tfreq.copy()
+    edited[50:60] *= 1.5
+    y_edited = cache.render(edited, tmag, no_phases)
+    assert cache.rendered_frames == len(tfreq) - 50 + 512 / 128 - 1
+
+    np.random.seed(1)
+    assert np.array_equal(SynthesisCache(512, 128, fs).render(edited, tmag, no_phases), y_edited)
@@ -0,0 +1,67 @@
+import numpy as np
+from scipy.signal import get_window
+
+from smst.models import harmonic, sine
+from smst.models.tracks import SparseTracks
+from smst.utils import audio
+from .common import sound_path
+
+
+def analyze(sparse=False):
+    fs, x = audio.read_wav(sound_path("sax-phrase-short.wav"))
+    w = get_window('hamming', 1001)
+    return fs, sine.from_audio(x[:30000], fs, w, 2048, 256, -80, 100, 0.02, sparse=sparse)
+
+
+def test_dense_round_trip():
+    fs, (tfreq, tmag, tphase) = analyze()
+    tracks = SparseTracks.from_dense(tfreq, tmag, tphase)
+    assert tracks.freq.size == np.count_nonzero(tfreq)
+    assert tracks.nbytes < (tfreq.nbytes + tmag.nbytes + tphase.nbytes) / 2
+
+    start, slot, freq, _, _ = tracks.track(0)
+    assert np.array_equal(tfreq[start:start + freq.size, slot], freq)
+
+    yfreq, ymag, yphase = tracks.to_dense()
+    support = tfreq != 0
+    assert np.array_equal(tfreq, yfreq)
+    assert np.array_equal(tmag[support], ymag[support])
+    assert np.array_equal(tphase[support], yphase[support])
+
+
+def test_sparse_analysis_synthesis_and_transformations():
+    fs, tracks = analyze(sparse=True)
+    _, (tfreq, tmag, tphase) = analyze()
+    assert isinstance(tracks, SparseTracks)
+    assert np.array_equal(tfreq, tracks.to_dense()[0])
+
+    y = sine.to_audio(tracks, None, None, 512, 128, fs)
+    assert np.allclose(sine.to_audio(tfreq, tmag, tphase, 512, 128, fs), y)
+
+    scaling = np.array([0, 1.0, 1, 1.5])
+    assert np.array_equal(sine.scale_frequencies(tfreq, scaling), sine.scale_frequencies(tracks, scaling).to_dense()[0])
+    time_scaling = np.array([0, 0, 1, 1.5])
+    ysfreq, _ = sine.scale_time(tfreq, tmag, time_scaling)
+    assert np.array_equal(ysfreq, sine.scale_time(tracks, None, time_scaling).to_dense()[0])
+    yhfreq, _ = harmonic.scale_frequencies(tfreq, tmag, scaling, np.array([0, 1, 1, 1]), 0, fs)
+    sparse_yhfreq = harmonic.scale_frequencies(tracks, None, scaling, np.array([0, 1, 1, 1]), 0, fs).to_dense()[0]
+    assert np.array_equal(yhfreq, sparse_yhfreq)
+
+    # propagated phases
+    assert np.isfinite(sine.to_audio(SparseTracks.from_dense(tfreq, tmag), None, None, 512, 128, fs)).all()
+
+
+def test_sparse_harmonic_timbre_preservation_matches_dense():
+    fs, x = audio.read_wav(sound_path("vignesh.wav"))
+    w = get_window('blackman', 1201)
+    hfreq, hmag, hphase = harmonic.from_audio(x, fs, w, 2048, 256, -90, 30, 130, 300, 7)
+    # the slots without harmonics at -100 dB as from find_harmonics(), the sparse tracks do not keep
+    # the magnitudes left in the slots of the deleted short tracks
+    hmag[hfreq == 0] = -100
+    tracks = SparseTracks.from_dense(hfreq, hmag, hphase)
+    scaling, stretching = np.array([0, 1.0, 1, 1.5]), np.array([0, 1, 1, 1.1])
+    yhfreq, yhmag = harmonic.scale_frequencies(hfreq, hmag, scaling, stretching, 1, fs)
+    sparse_yhfreq, sparse_yhmag, _ = harmonic.scale_frequencies(tracks, None, scaling, stretching, 1, fs).to_dense()
+    support = yhfreq != 0
+    assert np.array_equal(yhfreq, sparse_yhfreq)
+    assert np.allclose(yhmag[support], sparse_yhmag[support])
@@ -0,0 +1,41 @@
+import numpy as np
+from scipy.signal import blackmanharris, triang
+
+from smst.utils import window
+from smst.utils.cache import LRUCache
+
+
+def test_synthesis_window_is_cached():
+    N, H = 512, 128
+    sw = window.synthesis_window(N, H)
+
+    bh = blackmanharris(N)
+    bh = bh / sum(bh)
+    expected = np.zeros(N)
+    expected[N / 2 - H:N / 2 + H] = triang(2 * H) / bh[N / 2 - H:N / 2 + H]
+
+    assert np.allclose(expected, sw)
+    assert window.synthesis_window(N, H) is sw
+    assert not sw.flags.writeable
+
+
+def test_normalize_window_only_once():
+    w = np.hamming(101)
+    w_norm = window.normalize_window(w)
+
+    assert np.allclose(1, sum(w_norm))
+    assert window.normalize_window(w_norm) is w_norm
+    # a writable window may be modified in place, so it is normalized again
+    assert window.normalize_window(w) is not w_norm
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.get('a')
+    cache.put('c', 3)
+
+    assert 'a' in cache
+    assert 'b' not in cache
+    assert 'c' in cache